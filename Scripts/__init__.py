@@ -0,0 +1,51 @@
+"""
+Exploratory data analysis reports for the tables in ./data/raw.
+
+Importing the package is cheap and has no side effects: the report modules,
+and pandas with them, are only imported when first used, e.g.
+
+    import Scripts
+    Scripts.run_reports(Scripts.ProfileSession("./data/raw"))
+    Scripts.outliers.main()
+
+Run `python -m Scripts` to produce the reports from the command line.
+"""
+
+import importlib
+
+_SUBMODULES = {
+    "cache",
+    "column_row_count",
+    "console",
+    "csv_scan",
+    "dtypes",
+    "instrumentation",
+    "moments",
+    "outlier_streaming",
+    "outliers",
+    "outliers_STD",
+    "parallel",
+    "profiling",
+    "readers",
+    "row_hashing",
+    "sketches",
+    "summary_statistics",
+}
+# Names re-exported from the package, and the module that defines each
+_EXPORTS = {
+    "ProfileCache": "cache",
+    "ProfileSession": "profiling",
+    "run_reports": "profiling",
+}
+
+
+def __getattr__(name):
+    if name in _SUBMODULES:
+        return importlib.import_module(f"{__name__}.{name}")
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(f"{__name__}.{_EXPORTS[name]}"), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | _SUBMODULES | set(_EXPORTS))
@@ -0,0 +1,97 @@
+"""
+Command-line entry point for the EDA reports: `python -m Scripts`.
+
+    python -m Scripts                                  # every report
+    python -m Scripts run --reports outliers summary_statistics
+    python -m Scripts outliers_std --workers 4         # one report
+    python -m Scripts list                             # the tables found
+
+The selected reports run in one process and share one ProfileSession, so
+./data/raw is listed once and every table is parsed once. Nothing heavy is
+imported until the arguments have been parsed, so --help and argument
+errors return immediately.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from typing import List, Optional
+
+# Kept in sync with Scripts.profiling.REPORTS (not imported here: it pulls in pandas)
+REPORTS = ("column_row_count", "outliers", "outliers_std", "summary_statistics")
+
+
+def _common_options(suppress_defaults: bool) -> argparse.ArgumentParser:
+    """
+    Options accepted both before and after the command. After it, their
+    defaults are suppressed so they do not overwrite values given before it.
+    """
+    def default(value):
+        return argparse.SUPPRESS if suppress_defaults else value
+
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--raw", default=default("./data/raw"), help="directory of the raw tables (default: ./data/raw)")
+    common.add_argument(
+        "--processed", default=default("./data/processed"), help="directory for the reports (default: ./data/processed)"
+    )
+    common.add_argument("--workers", type=int, default=default(None), help="worker processes (default: one)")
+    common.add_argument("--cache-dir", default=default(None), help="reuse results of unchanged files from this cache")
+    common.add_argument(
+        "--narrow-dtypes",
+        action="store_true",
+        default=default(False),
+        help="load tables with the narrowest exact dtypes (less memory)",
+    )
+    common.add_argument(
+        "--timings",
+        action="store_true",
+        default=default(False),
+        help="also write the time spent in each stage to Stage_Timings.csv",
+    )
+    return common
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m Scripts",
+        description="Produce the EDA reports for the tables in a raw directory.",
+        parents=[_common_options(suppress_defaults=False)],
+    )
+    common = _common_options(suppress_defaults=True)
+    commands = parser.add_subparsers(dest="command", metavar="command")
+    run = commands.add_parser("run", parents=[common], help="run the selected reports (default: all)")
+    run.add_argument("--reports", nargs="+", choices=REPORTS, default=None, metavar="REPORT", help=", ".join(REPORTS))
+    for name in REPORTS:
+        commands.add_parser(name, parents=[common], help=f"run the {name} report only")
+    commands.add_parser("list", parents=[common], help="list the raw tables that would be profiled")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = _parser().parse_args(argv)
+
+    from Scripts.cache import ProfileCache
+    from Scripts.console import start
+    from Scripts.profiling import ProfileSession, run_reports
+
+    cache = ProfileCache(args.cache_dir) if args.cache_dir else None
+    session = ProfileSession(args.raw, narrow_dtypes=args.narrow_dtypes, cache=cache)
+
+    if args.command == "list":
+        for path in session.table_files():
+            print(path)
+        return 0
+
+    if args.command in REPORTS:
+        reports = [args.command]
+    else:
+        reports = getattr(args, "reports", None)
+
+    start()
+    run_reports(session, args.processed, reports=reports, workers=args.workers, cache=cache, timings=args.timings)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,255 @@
+"""
+cache.py
+
+Persistent per-file cache of profiling results.
+
+Entries are keyed by the raw file's resolved path, size and modification time
+(plus, optionally, a SHA-256 of its content) and by the report and the
+settings that influence its output. A report that finds an entry for an
+unchanged file reuses it without opening the file. The cache directory is
+kept under a size budget by evicting the least recently used entries.
+
+    cache = ProfileCache("./data/cache")
+    analyze_tables(cache=cache)          # first run profiles and stores
+    analyze_tables(cache=cache)          # unchanged files are skipped
+    cache.invalidate("./data/raw/x.csv") # force one file to be re-profiled
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import pickle
+import shutil
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from Scripts.parallel import map_ordered
+from Scripts.profiling import PathLike
+
+DEFAULT_CACHE_DIR = Path("./data/cache")
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+# Bump when the shape of cached results or states changes so old entries are ignored
+CACHE_FORMAT = 2
+_HASH_BLOCK = 1024 * 1024
+
+
+@dataclass(frozen=True)
+class CacheKey:
+    """Identity of one version of a raw file."""
+
+    path: str
+    size: int
+    mtime_ns: int
+    content_hash: Optional[str] = None
+
+    @property
+    def mtime(self) -> float:
+        """Modification time in seconds since the epoch (as os.path.getmtime)."""
+        return self.mtime_ns / 1e9
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def file_content_hash(path: PathLike) -> str:
+    """SHA-256 of the file's bytes, read in blocks."""
+    h = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(_HASH_BLOCK), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+class ProfileCache:
+    """
+    On-disk store of pickled per-file results, one directory per raw file.
+
+    Older entries for the same file and report are dropped when a new one is
+    written, and the whole cache is trimmed to max_bytes, least recently used
+    first (reads refresh an entry's timestamp).
+
+    The entries' sizes and recency order are kept in memory, so writes do not
+    rescan the directory: it is listed once, on first use (and again after
+    invalidate or when the cache is sent to a worker process).
+    """
+
+    def __init__(
+        self,
+        cache_dir: PathLike = DEFAULT_CACHE_DIR,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        hash_content: bool = False,
+    ) -> None:
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.hash_content = hash_content
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        # Entry path -> size in bytes, least recently used first; None until listed
+        self._index: Optional[OrderedDict[Path, int]] = None
+        self._total = 0
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Another process lists the directory itself
+        return {**self.__dict__, "_index": None, "_total": 0}
+
+    def _entries(self) -> OrderedDict[Path, int]:
+        if self._index is None:
+            entries = []
+            for entry in self.cache_dir.glob("*/*.pkl"):
+                try:
+                    entries.append((entry.stat(), entry))
+                except FileNotFoundError:
+                    continue
+            entries.sort(key=lambda item: item[0].st_mtime_ns)
+            self._index = OrderedDict((entry, st.st_size) for st, entry in entries)
+            self._total = sum(self._index.values())
+        return self._index
+
+    def _record(self, entry: Path, size: int) -> None:
+        index = self._entries()
+        self._total += size - index.get(entry, 0)
+        index[entry] = size
+        index.move_to_end(entry)
+
+    def _forget(self, entry: Path) -> None:
+        if self._index is not None:
+            self._total -= self._index.pop(entry, 0)
+
+    def key_for(self, path: PathLike) -> CacheKey:
+        """Build the cache key for the current version of path."""
+        path = Path(path)
+        st = path.stat()
+        return CacheKey(
+            path=str(path.resolve()),
+            size=st.st_size,
+            mtime_ns=st.st_mtime_ns,
+            content_hash=file_content_hash(path) if self.hash_content else None,
+        )
+
+    def _file_dir(self, path: str) -> Path:
+        return self.cache_dir / _digest(path)
+
+    def _entry_path(self, report: str, key: CacheKey, params: Optional[Dict[str, Any]]) -> Path:
+        identity = json.dumps(
+            {"format": CACHE_FORMAT, "key": asdict(key), "params": params or {}}, sort_keys=True, default=str
+        )
+        return self._file_dir(key.path) / f"{report}-{_digest(identity)}.pkl"
+
+    def _load(self, entry: Path) -> Optional[Any]:
+        try:
+            with open(entry, "rb") as fh:
+                value = pickle.load(fh)
+        except FileNotFoundError:
+            self._forget(entry)
+            return None
+        except (pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            # Corrupt or written by an incompatible version: treat as a miss
+            entry.unlink(missing_ok=True)
+            self._forget(entry)
+            return None
+        os.utime(entry)
+        if self._index is not None and entry in self._index:
+            self._index.move_to_end(entry)
+        return value
+
+    def _dump(self, entry: Path, value: Any) -> None:
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        tmp = entry.with_suffix(".tmp")
+        with open(tmp, "wb") as fh:
+            pickle.dump(value, fh, protocol=pickle.HIGHEST_PROTOCOL)
+        size = tmp.stat().st_size
+        os.replace(tmp, entry)
+        self._record(entry, size)
+        self._evict()
+
+    def get(self, report: str, key: CacheKey, params: Optional[Dict[str, Any]] = None) -> Optional[Any]:
+        """Return the cached result, or None on a miss."""
+        return self._load(self._entry_path(report, key, params))
+
+    def put(self, report: str, key: CacheKey, value: Any, params: Optional[Dict[str, Any]] = None) -> None:
+        """Store value, replacing stale entries of the same report for this file."""
+        entry = self._entry_path(report, key, params)
+        if entry.parent.is_dir():
+            for stale in entry.parent.glob(f"{report}-*.pkl"):
+                if stale != entry:
+                    stale.unlink(missing_ok=True)
+                    self._forget(stale)
+        self._dump(entry, value)
+
+    def _state_path(self, report: str, path: PathLike) -> Path:
+        return self._file_dir(str(Path(path).resolve())) / f"{report}.v{CACHE_FORMAT}.state.pkl"
+
+    def load_state(self, report: str, path: PathLike) -> Optional[Any]:
+        """
+        Return the resumable state saved for path by report, whatever version
+        of the file it was computed from (the caller validates it), or None.
+        """
+        return self._load(self._state_path(report, path))
+
+    def save_state(self, report: str, path: PathLike, state: Any) -> None:
+        """Persist report's resumable state for path, replacing the previous one."""
+        self._dump(self._state_path(report, path), state)
+
+    def invalidate(self, path: Optional[PathLike] = None) -> None:
+        """Drop the entries of one raw file, or of every file when path is None."""
+        if path is None:
+            targets = [p for p in self.cache_dir.iterdir() if p.is_dir()]
+        else:
+            targets = [self._file_dir(str(Path(path).resolve()))]
+        for target in targets:
+            shutil.rmtree(target, ignore_errors=True)
+        self._index = None
+
+    def size_bytes(self) -> int:
+        self._entries()
+        return self._total
+
+    def _evict(self) -> None:
+        index = self._entries()
+        while self._total > self.max_bytes and index:
+            entry, size = index.popitem(last=False)
+            entry.unlink(missing_ok=True)
+            self._total -= size
+            if not any(entry.parent.iterdir()):
+                entry.parent.rmdir()
+
+
+def _call_with_mtime(compute: Callable[..., Any], item: Tuple[PathLike, Optional[float]]) -> Any:
+    path, mtime = item
+    return compute(path, mtime=mtime)
+
+
+def cached_map(
+    compute: Callable[..., Any],
+    paths: Sequence[PathLike],
+    cache: Optional[ProfileCache] = None,
+    report: str = "",
+    params: Optional[Dict[str, Any]] = None,
+    workers: Optional[int] = None,
+) -> List[Any]:
+    """
+    Return [compute(path, mtime=...) for path in paths] in order, reusing the
+    cached results of unchanged files and storing the fresh ones.
+
+    mtime is taken from the cache key (None without a cache) so the reported
+    "date updated" always matches the file version the result belongs to.
+    Misses go through map_ordered, so workers > 1 computes them in a process
+    pool (compute must then be picklable).
+    """
+    keys = [cache.key_for(p) for p in paths] if cache is not None else [None] * len(paths)
+    results = [cache.get(report, key, params) for key in keys] if cache is not None else [None] * len(paths)
+
+    missing = [i for i, value in enumerate(results) if value is None]
+    items = [(paths[i], keys[i].mtime if keys[i] is not None else None) for i in missing]
+    computed = map_ordered(partial(_call_with_mtime, compute), items, workers)
+
+    for i, value in zip(missing, computed):
+        results[i] = value
+        if cache is not None:
+            cache.put(report, keys[i], value, params)
+    return results
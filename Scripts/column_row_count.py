@@ -1,22 +1,45 @@
+import hashlib
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import partial
+from itertools import combinations
+from math import prod
 from datetime import datetime, timezone
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
-import platform
 
-# Ensure the screen is cleared before running the script
-if platform.system() == "Windows":
-    os.system("cls")
-else:
-    os.system("clear")
-
-print("The script is currently running, please wait...")  
+from Scripts.cache import ProfileCache, cached_map
+from Scripts.console import start
+from Scripts.csv_scan import split_ranges
+from Scripts.instrumentation import stage
+from Scripts.parallel import map_ordered, resolve_workers
+from Scripts.profiling import ProfileSession, iter_csv_chunks, plan_chunksize
+from Scripts.readers import iter_csv_range_chunks, read_table, table_metadata
+from Scripts.row_hashing import (
+    FingerprintSet,
+    combine_fingerprints,
+    duplicate_mask,
+    has_duplicate_values,
+    value_fingerprints,
+)
+from Scripts.sketches import HLL_MARGIN_SIGMAS, HyperLogLog
 
 RAW_PATH = "./data/raw"
 PROCESSED_PATH = "./data/processed"
 OUTPUT_FILE = "Column-RowCount-duplicate.csv"
+CACHE_REPORT = "column_row_count"
+STATE_REPORT = "column_row_count_state"
+# Rows per chunk for the incremental mode when no chunksize/memory_budget is given
+DEFAULT_CHUNKSIZE = 100_000
+# Bytes hashed at the start and end of the consumed prefix to detect rewrites
+SIGNATURE_BYTES = 4096
+# Upper limit on the column combinations tested per table by composite-key discovery
+MAX_KEY_CHECKS = 10_000
+# Spellings pandas parses as booleans (its default true_values / false_values)
+_TRUE_STRINGS = ("True", "TRUE", "true")
+_BOOL_STRINGS = _TRUE_STRINGS + ("False", "FALSE", "false")
 
 
 @dataclass
@@ -24,69 +47,541 @@ class TableStats:
     table_name: str
     unique_columns: str
     column_count: int
-    row_count: int
-    unique_rows_count: int
-    duplicate_rows_count: int
-    null_count: int
+    # None when not computed (inventory mode) and not recorded by the file itself
+    row_count: Optional[int]
+    unique_rows_count: Optional[int]
+    duplicate_rows_count: Optional[int]
+    null_count: Optional[int]
     date_updated: str
 
 
-def _last_modified_iso(file_path: str) -> str:
+def _last_modified_iso(file_path: str, mtime: Optional[float] = None) -> str:
     """
     Return the file's last modified timestamp as ISO 8601 in UTC, e.g. 2026-01-08T12:34:56Z
+    (mtime, when given, is used instead of stat-ing the file, e.g. from a cache key)
     """
-    ts = os.path.getmtime(file_path)
+    ts = mtime if mtime is not None else os.path.getmtime(file_path)
     dt = datetime.fromtimestamp(ts, tz=timezone.utc)
     return dt.strftime("%Y-%m-%dT%H:%M:%SZ")
 
 
-def _detect_unique_columns(df: pd.DataFrame) -> List[str]:
+def _distinct_upper_bound(s: pd.Series) -> Optional[int]:
+    """
+    Cheap upper bound on the number of distinct values of s, from its dtype
+    alone (booleans, categoricals) or its range (integers); None if unknown.
+    """
+    if pd.api.types.is_bool_dtype(s.dtype):
+        return 2
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        return len(s.dtype.categories)
+    if pd.api.types.is_integer_dtype(s.dtype) and len(s):
+        return int(s.max()) - int(s.min()) + 1
+    return None
+
+
+def _check_cost(s: pd.Series) -> int:
+    """Rank columns so fixed-width values (cheap to hash) are checked before objects."""
+    return 0 if isinstance(s.dtype, np.dtype) and s.dtype.kind in "biufcmM" else 1
+
+
+def _detect_unique_columns(
+    df: pd.DataFrame, max_key_width: int = 1, hll_precision: Optional[int] = None
+) -> List[str]:
     """
     Identify columns that are uniquely identifying *by themselves*:
     - no nulls
-    - nunique == number of rows
+    - no repeated value
 
-    Returns a list of column names. (Does not attempt multi-column composite keys.)
+    Columns whose dtype or integer range cannot hold one distinct value per
+    row are ruled out without hashing; the rest are checked cheapest first
+    with an early-exit scan that stops at the first repeated value.
+
+    With max_key_width > 1, minimal composite keys of up to that many
+    columns are searched as well (see _detect_composite_keys) and listed
+    after the single columns as "(a, b)"; hll_precision makes that search
+    prune with HyperLogLog distinct estimates instead of exact counts.
+
+    Returns a list of column names, in column order.
     """
     if df.empty:
         return []
 
-    unique_cols: List[str] = []
     n = len(df)
-
-    for col in df.columns:
-        s = df[col]
+    candidates = []
+    non_null = []
+    for pos in range(df.shape[1]):
+        s = df.iloc[:, pos]
         # exclude columns that contain any nulls (can't uniquely identify every row)
         if s.isna().any():
             continue
-        if s.nunique(dropna=False) == n:
-            unique_cols.append(str(col))
-
+        non_null.append(pos)
+        bound = _distinct_upper_bound(s)
+        if bound is not None and bound < n:
+            continue
+        candidates.append(pos)
+
+    unique_positions = []
+    for pos in sorted(candidates, key=lambda p: _check_cost(df.iloc[:, p])):
+        with stage("unique_check", column=str(df.columns[pos])):
+            if not has_duplicate_values(df.iloc[:, pos]):
+                unique_positions.append(pos)
+    unique_cols = [str(df.columns[pos]) for pos in sorted(unique_positions)]
+
+    if max_key_width > 1:
+        pool = [pos for pos in non_null if pos not in unique_positions]
+        for key in _detect_composite_keys(df, pool, max_key_width, hll_precision):
+            unique_cols.append("(" + ", ".join(str(df.columns[pos]) for pos in key) + ")")
     return unique_cols
 
 
-def analyze_csv_file(file_path: str) -> TableStats:
+def _distinct_counts(df: pd.DataFrame, positions: List[int], hll_precision: Optional[int] = None) -> Dict[int, int]:
+    """
+    Distinct values per column position: exact, or with hll_precision an
+    upper bound (the HyperLogLog estimate plus its error margin, capped at
+    the row count) that is safe to prune with.
+    """
+    if hll_precision is None:
+        return {pos: int(df.iloc[:, pos].nunique(dropna=False)) for pos in positions}
+
+    counts = {}
+    for pos in positions:
+        sketch = HyperLogLog.of(df.iloc[:, pos], hll_precision)
+        upper = sketch.estimate() * (1 + HLL_MARGIN_SIGMAS * sketch.relative_error)
+        counts[pos] = min(len(df), int(np.ceil(upper)))
+    return counts
+
+
+def _detect_composite_keys(
+    df: pd.DataFrame, positions: List[int], max_width: int, hll_precision: Optional[int] = None
+) -> List[Tuple[int, ...]]:
+    """
+    Minimal multi-column keys among the columns at positions, smallest first.
+
+    The search walks the lattice of column combinations level by level
+    (width 2, 3, ... max_width) and prunes it:
+    - a combination containing a key already found is not minimal;
+    - a combination whose product of distinct counts is below the row
+      count cannot be a key (constant columns are dropped for the same reason);
+      the counts are HyperLogLog upper bounds when hll_precision is set;
+    - candidates are tested on hashed combined rows with the early-exit scan,
+      so most combinations are rejected after a few thousand rows.
+    At most MAX_KEY_CHECKS combinations are tested per table.
+    """
+    n = len(df)
+    distinct = _distinct_counts(df, positions, hll_precision)
+    pool = [pos for pos in positions if distinct[pos] > 1]
+
+    keys: List[Tuple[int, ...]] = []
+    checks = 0
+    for width in range(2, max_width + 1):
+        for combo in combinations(pool, width):
+            if any(set(key) <= set(combo) for key in keys):
+                continue
+            if prod(distinct[pos] for pos in combo) < n:
+                continue
+            if checks >= MAX_KEY_CHECKS:
+                return keys
+            checks += 1
+            if not has_duplicate_values(df.iloc[:, list(combo)]):
+                keys.append(combo)
+    return keys
+
+
+def _infer_kind(s: pd.Series) -> Tuple[Optional[str], Optional[pd.Series]]:
+    """
+    Kind of a column of strings as pandas would infer it on reading: "number"
+    when every value parses as a number (returned too, as floats), "bool"
+    when every value is a boolean spelling, else "text"; None if all null.
+    """
+    values = s.dropna()
+    if values.empty:
+        return None, None
+    numbers = pd.to_numeric(s, errors="coerce")
+    if int(numbers.notna().sum()) == len(values):
+        return "number", numbers.astype(float)
+    if values.isin(_BOOL_STRINGS).all():
+        return "bool", None
+    return "text", None
+
+
+def _join_kinds(a: Optional[str], b: Optional[str]) -> Optional[str]:
+    """Kind of a column made of parts of kinds a and b."""
+    if a is None or a == b:
+        return b
+    return a if b is None else "text"
+
+
+@dataclass
+class StreamState:
+    """
+    Mergeable state of the streaming statistics for one file: the counters,
+    the fingerprint sets for duplicate rows and still-unique columns, and how
+    far into the file they reach. Persisted between runs by the incremental
+    mode so an append-only file only has its new tail processed.
+
+    Values are compared as pandas would parse their column (kinds), so "1"
+    and "1.0" are equal in a numeric column, as in the in-memory path. A
+    column found to be text after numeric or boolean values were already
+    hashed makes the state stale: it has to be rebuilt with the final kinds.
+    """
+
+    columns: List[str]
+    row_count: int = 0
+    duplicate_rows_count: int = 0
+    null_count: int = 0
+    seen_rows: FingerprintSet = field(default_factory=FingerprintSet)
+    # Columns still in the running for uniqueness, with the values seen so far
+    candidates: Dict[str, FingerprintSet] = field(default_factory=dict)
+    offset: int = 0
+    head_hash: str = ""
+    tail_hash: str = ""
+    ends_with_newline: bool = True
+    fingerprint_bits: int = 64
+    # Kind of every column ("number", "bool", "text"; None while all null)
+    kinds: List[Optional[str]] = field(default_factory=list)
+    stale: bool = False
+
+    @classmethod
+    def start(
+        cls, file_path: str, fingerprint_bits: int = 64, kinds: Optional[List[Optional[str]]] = None
+    ) -> "StreamState":
+        """A state for file_path with nothing consumed; kinds pins the column kinds."""
+        columns = list(pd.read_csv(file_path, nrows=0).columns)
+        return cls(
+            columns=columns,
+            seen_rows=FingerprintSet(fingerprint_bits),
+            candidates={col: FingerprintSet(fingerprint_bits) for col in columns},
+            fingerprint_bits=fingerprint_bits,
+            kinds=list(kinds) if kinds is not None else [None] * len(columns),
+        )
+
+    def _value_fingerprints(self, s: pd.Series, kind: Optional[str], numbers: Optional[pd.Series]) -> np.ndarray:
+        """Fingerprints of the values of s as parsed for kind; every null gets the same one."""
+        bits = self.fingerprint_bits
+        if kind == "number" and numbers is not None:
+            s = numbers
+        elif kind == "bool":
+            s = s.isin(_TRUE_STRINGS).where(s.notna())
+        fingerprints = value_fingerprints(s, bits)
+        null = s.isna().to_numpy()
+        if null.any():
+            fingerprints = np.where(null, value_fingerprints(pd.Series([None], dtype=object), bits)[0], fingerprints)
+        return fingerprints
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        parsed = {}
+        for pos, kind in enumerate(self.kinds):
+            if kind == "text":
+                continue
+            chunk_kind, parsed[pos] = _infer_kind(chunk.iloc[:, pos])
+            self.kinds[pos] = _join_kinds(kind, chunk_kind)
+            if kind is not None and self.kinds[pos] != kind:
+                self.stale = True
+        if self.stale:
+            # Only the kinds matter now: the state will be rebuilt with them
+            return
+
+        self.row_count += len(chunk)
+        self.null_count += int(chunk.isna().sum().sum())
+        columns = [
+            self._value_fingerprints(chunk.iloc[:, pos], kind, parsed.get(pos)) for pos, kind in enumerate(self.kinds)
+        ]
+        self.duplicate_rows_count += int(self.seen_rows.add(combine_fingerprints(columns, self.fingerprint_bits)).sum())
+
+        for pos, col in enumerate(self.columns):
+            if col not in self.candidates:
+                continue
+            if chunk.iloc[:, pos].isna().any() or self.candidates[col].add(columns[pos]).any():
+                del self.candidates[col]
+
+    def merge(self, other: "StreamState") -> "StreamState":
+        """
+        Fold in the state of a later, disjoint part of the same file (e.g. a
+        byte range profiled by another worker).
+        """
+        kinds = [_join_kinds(a, b) for a, b in zip(self.kinds, other.kinds)]
+        self.stale = (
+            self.stale
+            or other.stale
+            or any(old is not None and old != new for part in (self, other) for old, new in zip(part.kinds, kinds))
+        )
+        self.kinds = kinds
+        self.row_count += other.row_count
+        self.null_count += other.null_count
+        self.seen_rows.merge(other.seen_rows)
+        # Every row is in seen_rows, so the duplicates are the rows beyond the distinct ones
+        self.duplicate_rows_count = self.row_count - len(self.seen_rows)
+
+        for col in list(self.candidates):
+            values = self.candidates[col]
+            if col not in other.candidates:
+                del self.candidates[col]
+                continue
+            expected = len(values) + len(other.candidates[col])
+            if len(values.merge(other.candidates[col])) < expected:
+                del self.candidates[col]
+        return self
+
+    def unique_columns(self) -> List[str]:
+        return [str(col) for col in self.columns if col in self.candidates] if self.row_count else []
+
+    def mark_consumed(self, file_path: str, offset: int) -> None:
+        """Record that the first offset bytes of file_path are folded into the state."""
+        self.offset = offset
+        self.head_hash, self.tail_hash, self.ends_with_newline = _boundary_signature(file_path, offset)
+
+    def is_prefix_of(self, file_path: str) -> bool:
+        """
+        True when file_path still starts with the bytes this state covers, i.e.
+        it has only been appended to since (and the last consumed record was
+        newline-terminated, so appended bytes start a new record).
+        """
+        if not self.ends_with_newline or os.path.getsize(file_path) < self.offset:
+            return False
+        head_hash, tail_hash, _ = _boundary_signature(file_path, self.offset)
+        return (head_hash, tail_hash) == (self.head_hash, self.tail_hash)
+
+
+def _boundary_signature(file_path: str, offset: int) -> Tuple[str, str, bool]:
+    """Hashes of the first and last SIGNATURE_BYTES before offset, and whether offset follows a newline."""
+    with open(file_path, "rb") as fh:
+        head = fh.read(min(offset, SIGNATURE_BYTES))
+        fh.seek(max(0, offset - SIGNATURE_BYTES))
+        tail = fh.read(offset - max(0, offset - SIGNATURE_BYTES))
+    ends_with_newline = offset == 0 or tail.endswith(b"\n")
+    return hashlib.sha1(head).hexdigest(), hashlib.sha1(tail).hexdigest(), ends_with_newline
+
+
+def _consume(state: StreamState, file_path: str, chunksize: int) -> bool:
+    """
+    Fold the bytes of file_path after state.offset into state. Returns False
+    if the file changed size while it was being read (the state then only
+    reflects an unknown prefix and must not be persisted).
+    """
+    size = os.path.getsize(file_path)
+    if size > state.offset:
+        with open(file_path, "rb") as fh:
+            fh.seek(state.offset)
+            header = 0 if state.offset == 0 else None
+            for chunk in iter_csv_chunks(fh, chunksize, header=header, names=state.columns):
+                state.update(chunk)
+    if os.path.getsize(file_path) != size:
+        return False
+    state.mark_consumed(file_path, size)
+    return True
+
+
+def _consume_range(
+    byte_range: Tuple[int, int],
+    file_path: str,
+    chunksize: int,
+    fingerprint_bits: int = 64,
+    kinds: Optional[List[Optional[str]]] = None,
+) -> StreamState:
+    """StreamState of the records in one byte range of file_path (a worker's share)."""
+    state = StreamState.start(file_path, fingerprint_bits, kinds)
+    for chunk in iter_csv_range_chunks(file_path, *byte_range, names=state.columns, chunksize=chunksize):
+        state.update(chunk)
+    return state
+
+
+def _analyze_csv_streaming(
+    file_path: str,
+    chunksize: int,
+    state_store: Optional[ProfileCache] = None,
+    fingerprint_bits: int = 64,
+    workers: Optional[int] = None,
+) -> Tuple[int, int, int, int, List[str]]:
+    """
+    Streaming counterpart of the in-memory statistics: reads the file in chunks
+    of chunksize rows and returns
+    (column_count, row_count, duplicate_rows_count, null_count, unique_cols).
+
+    Duplicate rows and unique columns are tracked with 64-bit (or, with
+    fingerprint_bits=128, 128-bit) fingerprints that persist across chunk
+    boundaries. Every chunk is read as strings (so a column cannot change
+    dtype from one chunk to the next) and values are compared as pandas
+    parses their whole column: numerically in a column of numbers, so "1"
+    equals "1.0", and as written in a text column. The one difference from
+    the in-memory path: integers beyond 2**53 are compared as floats. A
+    column that only turns out to be text after its numeric start costs a
+    second pass over the file.
+
+    With a state_store the StreamState is saved after the run and resumed on
+    the next one when the file has only been appended to, so only the new
+    tail is read. Any other change to the file starts from scratch.
+
+    Otherwise, workers > 1 splits the file into quote-safe byte ranges
+    (Scripts/csv_scan.py) profiled in parallel processes, whose states are
+    merged in file order.
+    """
+    workers = resolve_workers(workers)
+    ranges = split_ranges(file_path, workers) if state_store is None and workers > 1 else []
+    if len(ranges) > 1:
+        kinds = None
+        while True:
+            parts = map_ordered(
+                partial(
+                    _consume_range,
+                    file_path=file_path,
+                    chunksize=chunksize,
+                    fingerprint_bits=fingerprint_bits,
+                    kinds=kinds,
+                ),
+                ranges,
+                workers,
+            )
+            state = parts[0]
+            for part in parts[1:]:
+                state.merge(part)
+            if not state.stale:
+                break
+            kinds = state.kinds
+        return len(state.columns), state.row_count, state.duplicate_rows_count, state.null_count, state.unique_columns()
+
+    state = state_store.load_state(STATE_REPORT, file_path) if state_store is not None else None
+    if (
+        state is None
+        or state.fingerprint_bits != fingerprint_bits
+        or not state.is_prefix_of(file_path)
+    ):
+        state = StreamState.start(file_path, fingerprint_bits)
+
+    consumed = _consume(state, file_path, chunksize)
+    if state.stale:
+        state = StreamState.start(file_path, fingerprint_bits, state.kinds)
+        consumed = _consume(state, file_path, chunksize)
+    if consumed and state_store is not None:
+        state_store.save_state(STATE_REPORT, file_path, state)
+
+    return len(state.columns), state.row_count, state.duplicate_rows_count, state.null_count, state.unique_columns()
+
+
+def _inventory_stats(file_path: str, table_name: str, mtime: Optional[float] = None) -> TableStats:
+    """
+    TableStats answered from the header (CSV) or footer / batch metadata
+    (Parquet, Arrow) alone; CSV rows are counted by a memory-mapped record
+    scan. No values are decoded, so duplicate rows and unique columns are
+    left blank, as are null counts the file does not record. A footer null
+    count covers nulls only, not float NaN values, which the decoded modes
+    count as missing too.
+    """
+    metadata = table_metadata(file_path)
+    return TableStats(
+        table_name=table_name,
+        unique_columns="",
+        column_count=metadata.column_count,
+        row_count=metadata.row_count,
+        unique_rows_count=None,
+        duplicate_rows_count=None,
+        null_count=metadata.null_count,
+        date_updated=_last_modified_iso(file_path, mtime),
+    )
+
+
+def analyze_csv_file(
+    file_path: str,
+    session: Optional[ProfileSession] = None,
+    chunksize: Optional[int] = None,
+    memory_budget: Optional[int] = None,
+    mtime: Optional[float] = None,
+    state_store: Optional[ProfileCache] = None,
+    fingerprint_bits: int = 64,
+    verify_duplicates: bool = True,
+    max_key_width: int = 1,
+    hll_precision: Optional[int] = None,
+    inventory_only: bool = False,
+    workers: Optional[int] = None,
+) -> TableStats:
+    """
+    Compute the TableStats for one table file (CSV, Parquet or Arrow IPC).
+    When a ProfileSession is given the parsed table is taken from (and shared
+    through) the session. mtime overrides the file's modification time used
+    for date_updated. For Parquet and Arrow files the null count comes from
+    the file's own statistics when it records them.
+
+    Setting chunksize (rows) or memory_budget (bytes per parsed chunk) switches
+    to the streaming mode, which never holds more than one chunk of the file
+    in memory and produces the same statistics as the in-memory path
+    (see _analyze_csv_streaming for how values are compared). memory_budget
+    bounds the parsed chunk only: the fingerprint sets kept across chunks
+    grow by 8 bytes (16 with fingerprint_bits=128) per distinct row, plus as
+    much per value of every column still unique so far, e.g. about 1.6 GB
+    for 100 million distinct rows with one key column.
+    Passing a state_store (a ProfileCache) makes the streaming mode
+    incremental: for an append-only file only the bytes added since the last
+    run are read. Without one, workers > 1 parses quote-safe byte ranges of
+    the file in that many processes and merges their states. The streaming
+    modes apply to CSV files; other formats are always loaded whole.
+
+    Duplicate rows are found from row fingerprints (fingerprint_bits, 64 or
+    128) instead of a pandas factorization of every column. In memory,
+    verify_duplicates compares each candidate with the row it repeats, which
+    keeps the count exact even under a hash collision; the streaming mode
+    relies on the fingerprints alone.
+
+    max_key_width > 1 also reports minimal composite keys of up to that many
+    columns in unique_columns, pruned with HyperLogLog estimates when
+    hll_precision is set. It needs the whole table, so it cannot be
+    combined with the streaming mode.
+
+    inventory_only=True answers from metadata alone and decodes nothing:
+    column count from the header or footer, row count from the footer or a
+    memory-mapped record scan (Scripts/csv_scan.py), null count where the
+    file records it (Parquet / Arrow statistics, which leave out NaN).
+    """
     file_name = os.path.basename(file_path)
     table_name = os.path.splitext(file_name)[0]
-
-    # Read CSV: first row is header by default in pandas
-    df = pd.read_csv(file_path, low_memory=False)
+    if inventory_only:
+        return _inventory_stats(file_path, table_name, mtime)
+    is_csv = os.path.splitext(file_name)[1].lower() == ".csv"
+
+    streaming = chunksize is not None or memory_budget is not None or state_store is not None
+    if streaming and is_csv:
+        if max_key_width > 1:
+            raise ValueError("composite key discovery (max_key_width > 1) needs the in-memory mode")
+        if chunksize is None:
+            chunksize = plan_chunksize(file_path, memory_budget) if memory_budget is not None else DEFAULT_CHUNKSIZE
+        with stage("streaming", table=table_name):
+            column_count, row_count, duplicate_rows_count, null_count, unique_cols = (
+                _analyze_csv_streaming(file_path, chunksize, state_store, fingerprint_bits, workers)
+            )
+        return TableStats(
+            table_name=table_name,
+            unique_columns=", ".join(unique_cols) if unique_cols else "None",
+            column_count=column_count,
+            row_count=row_count,
+            unique_rows_count=row_count - duplicate_rows_count,
+            duplicate_rows_count=duplicate_rows_count,
+            null_count=null_count,
+            date_updated=_last_modified_iso(file_path, mtime),
+        )
+
+    # Read the table: for CSV the first row is the header by default in pandas
+    with stage("read", table=table_name):
+        if session is not None:
+            df = session.read(file_path)
+        else:
+            df = read_table(file_path)
 
     column_count = int(df.shape[1])
     row_count = int(df.shape[0])
 
-    # Duplicate rows based on all columns (pandas treats NaNs as equal for duplicated())
-    dup_mask = df.duplicated(keep="first")
-    duplicate_rows_count = int(dup_mask.sum())
+    # Duplicate rows based on all columns (NaNs compare equal, as in df.duplicated())
+    with stage("duplicates", table=table_name):
+        dup_mask = duplicate_mask(df, fingerprint_bits, verify=verify_duplicates)
+        duplicate_rows_count = int(dup_mask.sum())
     unique_rows_count = int(row_count - duplicate_rows_count)
 
-    # Total nulls across the table
-    null_count = int(df.isna().sum().sum())
+    # Total nulls across the table (NaN included, whatever the format)
+    with stage("null_count", table=table_name):
+        null_count = int(df.isna().sum().sum())
 
-    unique_cols = _detect_unique_columns(df)
+    with stage("unique_columns", table=table_name):
+        unique_cols = _detect_unique_columns(df, max_key_width, hll_precision)
     unique_columns_str = ", ".join(unique_cols) if unique_cols else "None"
 
-    date_updated = _last_modified_iso(file_path)
+    date_updated = _last_modified_iso(file_path, mtime)
 
     return TableStats(
         table_name=table_name,
@@ -104,27 +599,81 @@ def analyze_tables(
     raw_path: str = RAW_PATH,
     processed_path: str = PROCESSED_PATH,
     output_file: str = OUTPUT_FILE,
+    session: Optional[ProfileSession] = None,
+    chunksize: Optional[int] = None,
+    memory_budget: Optional[int] = None,
+    workers: Optional[int] = None,
+    cache: Optional[ProfileCache] = None,
+    incremental: bool = False,
+    fingerprint_bits: int = 64,
+    verify_duplicates: bool = True,
+    max_key_width: int = 1,
+    hll_precision: Optional[int] = None,
+    inventory_only: bool = False,
 ) -> pd.DataFrame:
     """
-    Analyze all CSV files in raw_path and write a summary CSV to processed_path/output_file.
+    Analyze all tables (CSV, Parquet, Arrow IPC) in raw_path and write a summary CSV to processed_path/output_file.
+    Pass a ProfileSession to reuse tables already parsed by another report, or
+    chunksize / memory_budget to stream files that do not fit in memory
+    (memory_budget bounds each parsed chunk, not the fingerprints kept
+    across chunks; see analyze_csv_file).
+    workers > 1 profiles that many files concurrently in a process pool (0 means
+    one per CPU); each worker reads its own files, so the session is bypassed.
+    In the (non-incremental) streaming mode the workers instead split each
+    CSV into byte ranges, so a single large file uses every core.
+    With a ProfileCache, files whose path, size and mtime are unchanged since
+    a previous run are not read at all, and incremental=True additionally
+    keeps the streaming state in the cache so files that only grew are
+    profiled from where the last run stopped.
+    fingerprint_bits and verify_duplicates configure duplicate-row detection
+    (see analyze_csv_file); max_key_width > 1 adds composite keys of up to
+    that many columns to "Unique Column(s)" (hll_precision: see analyze_csv_file).
+    inventory_only=True lists every table from its header / footer without
+    decoding any values; statistics that need the data are left blank.
     Returns the resulting DataFrame.
     """
     if not os.path.isdir(raw_path):
         raise FileNotFoundError(f"Raw path not found: {raw_path}")
+    if incremental and cache is None:
+        raise ValueError("incremental=True needs a ProfileCache to keep its state in")
 
     os.makedirs(processed_path, exist_ok=True)
 
-    rows: List[TableStats] = []
-
-    for file_name in sorted(os.listdir(raw_path)):
-        if not file_name.lower().endswith(".csv"):
-            continue
-
-        file_path = os.path.join(raw_path, file_name)
-        if not os.path.isfile(file_path):
-            continue
-
-        rows.append(analyze_csv_file(file_path))
+    if session is None:
+        session = ProfileSession(raw_path, keep_frames=False)
+
+    file_paths = [str(p) for p in session.table_files()]
+
+    # The streaming mode spends its workers inside each file (byte ranges)
+    # rather than across files
+    split_files = (chunksize is not None or memory_budget is not None) and not incremental
+    file_workers = None if split_files else workers
+
+    analyze = partial(
+        analyze_csv_file,
+        session=session if resolve_workers(file_workers) <= 1 else None,
+        chunksize=chunksize,
+        memory_budget=memory_budget,
+        state_store=cache if incremental else None,
+        fingerprint_bits=fingerprint_bits,
+        verify_duplicates=verify_duplicates,
+        max_key_width=max_key_width,
+        hll_precision=hll_precision,
+        inventory_only=inventory_only,
+        workers=workers if split_files else None,
+    )
+    params = {
+        # The run mode: streamed results are cached apart from in-memory ones
+        "chunksize": chunksize,
+        "memory_budget": memory_budget,
+        "incremental": incremental,
+        "fingerprint_bits": fingerprint_bits,
+        "verify_duplicates": verify_duplicates,
+        "max_key_width": max_key_width,
+        "hll_precision": hll_precision,
+        "inventory_only": inventory_only,
+    }
+    rows: List[TableStats] = cached_map(analyze, file_paths, cache, CACHE_REPORT, params, file_workers)
 
     df_out = pd.DataFrame(
         [
@@ -154,7 +703,7 @@ def analyze_tables(
 
     out_path = os.path.join(processed_path, output_file)
     df_out.to_csv(out_path, index=False)
-    print(f"The output file {OUTPUT_FILE} exported to: {PROCESSED_PATH}")
+    print(f"The output file {output_file} exported to: {processed_path}")
     return df_out
     
 
@@ -162,17 +711,6 @@ def main() -> None:
     analyze_tables()
 
 
-
-
 if __name__ == "__main__":
-    main()  # Run the coulumn_row_count.py script
-
-  # Automatically run tests after the main script
-    try:
-        import pytest
-        print("\nRunning tests...\n")
-        # Run all tests in the ./tests folder
-        pytest_args = ["-q", "--tb=short", "./tests/test_column_row_count.py"]
-        pytest.main(pytest_args)
-    except ImportError:
-        print("pytest not installed. Skipping tests.")
\ No newline at end of file
+    start()
+    main()
@@ -0,0 +1,42 @@
+"""
+console.py
+
+Terminal handling for the command-line entry points.
+
+The report modules are plain libraries: importing them prints nothing and
+starts no process. Clearing the screen and printing the "please wait"
+banner happen only when a report is run as a program, and only if its
+output goes to an interactive terminal (not a pipe, a log file or a worker
+process).
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+from typing import Optional, TextIO
+
+BANNER = "The script is currently running, please wait..."
+# Clear the screen and move the cursor home, without spawning `clear`
+_ANSI_CLEAR = "\033[2J\033[H"
+
+
+def is_interactive(stream: Optional[TextIO] = None) -> bool:
+    stream = stream if stream is not None else sys.stdout
+    isatty = getattr(stream, "isatty", None)
+    return bool(isatty and isatty())
+
+
+def clear_screen() -> None:
+    if os.name == "nt":
+        os.system("cls")
+    else:
+        sys.stdout.write(_ANSI_CLEAR)
+        sys.stdout.flush()
+
+
+def start(banner: str = BANNER) -> None:
+    """Clear the screen and print banner, if stdout is an interactive terminal."""
+    if is_interactive():
+        clear_screen()
+        print(banner)
@@ -0,0 +1,160 @@
+"""
+dtypes.py
+
+Narrow column dtypes for the in-memory reports.
+
+By default pandas parses every integer column as int64, every float column
+as float64 and every string column as Python objects. read_narrow() loads a
+table with the narrowest dtypes that represent it exactly:
+
+- integers as int8 / int16 / int32 when their range allows;
+- floats as float32 when every value survives the round trip;
+- low-cardinality text as category.
+
+Numeric dtypes are only chosen after checking the whole column, because a
+sample cannot prove that a later value fits (pandas silently wraps integers
+that overflow a pinned dtype). A CSV that has not been seen before is
+therefore parsed with categories pinned from a sample (always lossless) and
+its numeric columns are downcast after the read. The verified dtypes are
+stored in the ProfileCache per table path, so later runs apply them to new
+versions of the file too: categories and float32 are pinned in the read (a
+float that now needs float64 precision is rounded), while integer columns
+are read as int64 and narrowed again after a range check. If a pinned read
+fails, the table is read again with pandas' defaults.
+
+    session = ProfileSession("./data/raw", cache=ProfileCache(), narrow_dtypes=True)
+"""
+
+from __future__ import annotations
+
+import warnings
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from Scripts.readers import PathLike, read_table
+
+if TYPE_CHECKING:
+    from Scripts.cache import ProfileCache
+
+# Rows parsed by the pre-pass that picks category columns of a CSV
+DEFAULT_SAMPLE_ROWS = 10_000
+# Text columns with at most this share of distinct values are stored as category
+CATEGORY_MAX_RATIO = 0.5
+# Cache "report" under which the verified dtypes of each file are stored
+CACHE_REPORT = "dtypes"
+
+_INTEGER_DTYPES = ("int8", "int16", "int32")
+# Stored dtypes the reader can parse into directly; integers could wrap
+_PINNED_AS_IS = ("category", "float32")
+
+
+def _category_candidate(s: pd.Series) -> bool:
+    """Low-cardinality text that does not look numeric (the reports coerce numeric-looking text)."""
+    if s.dtype != object:
+        return False
+    values = s.dropna()
+    if values.empty or pd.api.types.infer_dtype(values, skipna=False) != "string":
+        return False
+    if values.nunique() > CATEGORY_MAX_RATIO * len(values):
+        return False
+    return not pd.to_numeric(values.str.replace(",", "", regex=False), errors="coerce").notna().any()
+
+
+def sample_dtypes(path: PathLike, sample_rows: int = DEFAULT_SAMPLE_ROWS) -> Dict[str, str]:
+    """
+    Pre-pass over the first sample_rows rows of a CSV: the columns that can
+    be parsed as category. Other formats carry their own types ({}).
+    """
+    if Path(path).suffix.lower() != ".csv":
+        return {}
+    sample = pd.read_csv(path, nrows=sample_rows, low_memory=False)
+    return {col: "category" for col in sample.columns if _category_candidate(sample[col])}
+
+
+def _narrow_numeric(s: pd.Series) -> Optional[str]:
+    if not isinstance(s.dtype, np.dtype):
+        return None
+    if s.dtype.kind in "iu" and len(s):
+        lo, hi = s.min(), s.max()
+        for name in _INTEGER_DTYPES:
+            info = np.iinfo(name)
+            if info.min <= lo and hi <= info.max:
+                return name if np.dtype(name).itemsize < s.dtype.itemsize else None
+    if s.dtype == np.float64:
+        values = s.to_numpy()
+        with np.errstate(over="ignore"):
+            narrowed = values.astype(np.float32)
+        if np.array_equal(narrowed.astype(np.float64), values, equal_nan=True):
+            return "float32"
+    return None
+
+
+def narrowest_dtypes(df: pd.DataFrame) -> Dict[str, str]:
+    """The dtypes that hold every column of df exactly, for the columns where they are narrower."""
+    dtypes = {}
+    for col in df.columns:
+        s = df[col]
+        if isinstance(s.dtype, pd.CategoricalDtype):
+            dtypes[col] = "category"
+        elif _category_candidate(s):
+            dtypes[col] = "category"
+        else:
+            narrow = _narrow_numeric(s)
+            if narrow is not None:
+                dtypes[col] = narrow
+    return dtypes
+
+
+def _cast(df: pd.DataFrame, dtypes: Dict[str, str]) -> pd.DataFrame:
+    changed = {col: kind for col, kind in dtypes.items() if col in df.columns and str(df[col].dtype) != kind}
+    return df.astype(changed) if changed else df
+
+
+def read_narrow(
+    path: PathLike,
+    columns: Optional[Sequence[str]] = None,
+    cache: Optional[ProfileCache] = None,
+    sample_rows: int = DEFAULT_SAMPLE_ROWS,
+) -> pd.DataFrame:
+    """
+    Load the table at path (only columns, if given) with narrow dtypes.
+    The dtypes verified on earlier reads of the table are taken from (and
+    new ones are stored in) cache; without a cache every read starts with
+    the pre-pass.
+    """
+    known: Dict[str, str] = (cache.load_state(CACHE_REPORT, path) if cache is not None else None) or {}
+    wanted = set(columns) if columns is not None else None
+    pinned = {
+        col: kind if kind in _PINNED_AS_IS else "int64"
+        for col, kind in known.items()
+        if wanted is None or col in wanted
+    }
+
+    df = None
+    if pinned:
+        try:
+            with warnings.catch_warnings():
+                # A failing cast warns before it raises
+                warnings.simplefilter("ignore", category=RuntimeWarning)
+                df = read_table(path, columns, pinned)
+        except (ValueError, TypeError, OverflowError):
+            # The file no longer fits what was verified: start over
+            known, pinned = {}, {}
+    if df is None:
+        pinned = {
+            col: kind for col, kind in sample_dtypes(path, sample_rows).items() if wanted is None or col in wanted
+        }
+        df = read_table(path, columns, pinned)
+
+    # Integer columns are checked again: the file may have changed since
+    as_is = [col for col, kind in pinned.items() if kind in _PINNED_AS_IS and col in df.columns]
+    fresh = narrowest_dtypes(df.drop(columns=as_is))
+    df = _cast(df, fresh)
+    if cache is not None:
+        verified = {**{col: kind for col, kind in known.items() if col in as_is or col not in df.columns}, **fresh}
+        if verified != known:
+            cache.save_state(CACHE_REPORT, path, verified)
+    return df
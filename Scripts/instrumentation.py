@@ -0,0 +1,112 @@
+"""
+instrumentation.py
+
+Per-stage wall-clock timings for the profiling hot paths.
+
+The reports wrap each stage of their work in stage(), e.g.
+
+    with stage("duplicates", table=table_name):
+        dup_mask = duplicate_mask(df)
+
+Nothing is measured unless a StageTimer is recording: stage() then returns
+a shared no-op context manager, so the disabled cost is one global lookup
+per stage. To collect timings:
+
+    with recording() as timer:
+        analyze_tables(...)
+    timer.write("./data/processed/Stage_Timings.csv")
+
+or run_reports(..., timings=True), which writes that file next to the
+reports. A stage without a table nested in one with a table belongs to
+that table. Records are kept in the order the stages finished; stages run
+in column threads are recorded too, stages run in worker processes are not.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import ContextManager, Iterator, List, Optional, Union
+
+import pandas as pd
+
+OUTPUT_NAME = "Stage_Timings.csv"
+
+_DISABLED = nullcontext()
+
+
+@dataclass(frozen=True)
+class StageRecord:
+    report: Optional[str]
+    table: Optional[str]
+    column: Optional[str]
+    stage: str
+    seconds: float
+
+
+class StageTimer:
+    """Collects a StageRecord for every stage timed while it is recording."""
+
+    def __init__(self) -> None:
+        self.records: List[StageRecord] = []
+        # Report the stages belong to, set by run_reports
+        self.report: Optional[str] = None
+        self._lock = threading.Lock()
+        self._scope = threading.local()
+
+    @contextmanager
+    def stage(self, name: str, table: Optional[str] = None, column: Optional[str] = None) -> Iterator[None]:
+        # Stages nested in a table's stage belong to that table (in this thread)
+        outer = getattr(self._scope, "table", None)
+        table = table if table is not None else outer
+        self._scope.table = table
+        report = self.report
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            record = StageRecord(report, table, column, name, time.perf_counter() - started)
+            self._scope.table = outer
+            with self._lock:
+                self.records.append(record)
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame([asdict(r) for r in self.records], columns=list(StageRecord.__dataclass_fields__))
+
+    def write(self, path: Union[str, Path]) -> Path:
+        """Write the records as CSV to path; returns it."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.to_frame().to_csv(path, index=False)
+        return path
+
+
+_active: Optional[StageTimer] = None
+
+
+def active_timer() -> Optional[StageTimer]:
+    """The StageTimer currently recording, if any."""
+    return _active
+
+
+def stage(name: str, table: Optional[str] = None, column: Optional[str] = None) -> ContextManager[None]:
+    """Time the enclosed block as stage name of table (and column) when recording."""
+    timer = _active
+    if timer is None:
+        return _DISABLED
+    return timer.stage(name, table, column)
+
+
+@contextmanager
+def recording(timer: Optional[StageTimer] = None) -> Iterator[StageTimer]:
+    """Record every stage timed inside the block into timer (a new one by default)."""
+    global _active
+    timer = timer if timer is not None else StageTimer()
+    previous, _active = _active, timer
+    try:
+        yield timer
+    finally:
+        _active = previous
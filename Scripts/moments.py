@@ -0,0 +1,94 @@
+"""
+moments.py
+
+Exact, mergeable count / mean / variance / min / max of numeric columns.
+
+Moments keeps the count, mean and M2 (sum of squared deviations from the
+mean) of the values it has seen, plus their extremes. Each batch of values is
+summarized on its own and folded in with Chan's parallel formula, which is
+numerically stable (no sum-of-squares cancellation), so a column can be fed
+chunk by chunk or split across workers and merged without changing the
+result beyond floating-point rounding.
+
+A 2-D batch (rows x columns) gives one set of moments per column, computed
+with vectorized reductions over all columns at once:
+
+    m = Moments.of(df[columns].to_numpy(dtype=float, na_value=np.nan))
+    m.mean, m.std    # arrays with one entry per column
+
+NaNs are ignored, like np.nanmean / np.nanstd.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+
+def _unwrap(x):
+    """Plain Python scalar for 0-d results, arrays otherwise."""
+    return x.item() if np.ndim(x) == 0 else x
+
+
+class Moments:
+    """Running moments of one column (1-D batches) or of several (2-D batches)."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        # NaN until a value is seen, like np.nanmean of nothing
+        self.mean = np.nan
+        self.m2 = 0.0
+        self.minimum = np.nan
+        self.maximum = np.nan
+
+    @classmethod
+    def of(cls, values) -> "Moments":
+        moments = cls()
+        moments.update(values)
+        return moments
+
+    def update(self, values) -> "Moments":
+        """Fold in a batch of values (reduced along axis 0); NaNs are skipped."""
+        v = np.asarray(values, dtype=float)
+        present = ~np.isnan(v)
+        batch = Moments()
+        batch.count = present.sum(axis=0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            batch.mean = np.where(present, v, 0.0).sum(axis=0) / batch.count
+            deviation = np.where(present, v - batch.mean, 0.0)
+        batch.m2 = (deviation * deviation).sum(axis=0)
+        batch.minimum = np.fmin.reduce(v, axis=0, initial=np.nan)
+        batch.maximum = np.fmax.reduce(v, axis=0, initial=np.nan)
+        return self.merge(batch)
+
+    def merge(self, other: "Moments") -> "Moments":
+        """Fold in the moments of other values (another chunk or worker) with Chan's formula."""
+        count, other_count = np.asarray(self.count), np.asarray(other.count)
+        if other_count.ndim == 0 and other_count == 0:
+            # Nothing seen (an empty or all-NaN batch): its NaN mean must not leak in
+            return self
+        total = count + other_count
+        both = (count > 0) & (other_count > 0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            share = other_count / total
+            delta = np.subtract(other.mean, self.mean)
+            mean = np.where(count > 0, self.mean + delta * share, other.mean)
+            mean = np.where(other_count > 0, mean, self.mean)
+            m2 = np.add(self.m2, other.m2) + np.where(both, delta * delta * count * share, 0.0)
+        self.count = _unwrap(total)
+        self.mean = _unwrap(np.where(total > 0, mean, np.nan))
+        self.m2 = _unwrap(m2)
+        self.minimum = _unwrap(np.fmin(self.minimum, other.minimum))
+        self.maximum = _unwrap(np.fmax(self.maximum, other.maximum))
+        return self
+
+    @property
+    def variance(self):
+        """Sample variance (ddof=1); NaN with fewer than two values."""
+        count = np.asarray(self.count)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return _unwrap(np.where(count >= 2, np.divide(self.m2, count - 1), np.nan))
+
+    @property
+    def std(self):
+        """Sample standard deviation (ddof=1); NaN with fewer than two values."""
+        return _unwrap(np.sqrt(self.variance))
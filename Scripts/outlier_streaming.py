@@ -0,0 +1,346 @@
+"""
+outlier_streaming.py
+
+Two-pass streaming IQR outlier extraction for files that do not fit in memory.
+
+Pass one (scan_columns) reads a table (any format in Scripts/readers.py) in chunks and keeps, per column, only
+mergeable summary state: value counts, mean/M2 moments, a KLL sketch of the
+numeric values and (for selected columns) a set of value fingerprints. The
+quartile fences are taken from the sketches. Pass two (extract_outliers) reads
+the file again and keeps only values outside the fences, at most max_outliers
+per column, counting the rest.
+
+Both passes can split a CSV into quote-safe byte ranges (Scripts/csv_scan.py)
+and process them in a pool of worker processes: each worker builds the same
+per-column state for its range, and the partial results are merged in file
+order.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from functools import partial
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from Scripts.csv_scan import split_ranges
+from Scripts.moments import Moments
+from Scripts.parallel import map_ordered, resolve_workers
+from Scripts.readers import PathLike, iter_chunks, iter_csv_range_chunks, table_columns
+from Scripts.row_hashing import FingerprintSet
+from Scripts.sketches import KLLSketch
+
+# Rank error used for streaming quartiles when the caller does not choose one.
+# Columns with up to k_for_error(...) values are still handled exactly.
+DEFAULT_STREAMING_ERROR = 0.001
+
+_INTEGER_TOKEN = r"[+-]?\d+"
+
+
+def parse_numeric(s: pd.Series, strip_commas: bool = False) -> pd.Series:
+    """
+    Parse string values as numbers (NaN where they do not parse). With
+    strip_commas, thousands separators are removed from the values that a
+    plain parse leaves unparsed, which are then parsed again.
+    """
+    values = pd.to_numeric(s, errors="coerce")
+    if strip_commas:
+        failed = values.isna().to_numpy() & s.notna().to_numpy()
+        if failed.any():
+            values[failed] = pd.to_numeric(s[failed].astype(str).str.replace(",", "", regex=False), errors="coerce")
+    return values
+
+
+@dataclass
+class ColumnScan:
+    """Pass-one state for one column of one file."""
+
+    sketch: KLLSketch
+    rows: int = 0
+    non_null: int = 0
+    numeric: int = 0
+    integral: int = 0
+    integer_tokens: bool = True
+    moments: Moments = field(default_factory=Moments)
+    distinct: Optional[FingerprintSet] = None
+    # Stop tracking distinct values once the column is known not to be integer
+    distinct_integers_only: bool = False
+
+    @property
+    def is_integer_column(self) -> bool:
+        """Whether pandas would parse the whole column as an integer dtype."""
+        return self.integer_tokens and self.non_null == self.rows
+
+    def update(self, raw: pd.Series, values: pd.Series) -> None:
+        """Fold one chunk of a column: raw strings and their parsed values."""
+        present = raw.notna()
+        self.rows += len(raw)
+        self.non_null += int(present.sum())
+
+        if self.integer_tokens:
+            self.integer_tokens = bool(raw[present].str.fullmatch(_INTEGER_TOKEN).all())
+            if not self.integer_tokens and self.distinct_integers_only:
+                self.distinct = None
+
+        v = values.dropna().to_numpy(dtype=float)
+        self.numeric += int(v.size)
+        self.integral += int(np.isclose(v % 1, 0).sum())
+        self.sketch.update(v)
+        self.moments.update(v)
+        if self.distinct is not None:
+            self.distinct.add(pd.util.hash_array(v))
+
+    def merge(self, other: "ColumnScan") -> "ColumnScan":
+        """Fold in the state of the same column scanned over a later part of the file."""
+        self.rows += other.rows
+        self.non_null += other.non_null
+        self.numeric += other.numeric
+        self.integral += other.integral
+        self.integer_tokens = self.integer_tokens and other.integer_tokens
+        self.moments.merge(other.moments)
+        self.sketch.merge(other.sketch)
+        if self.distinct is not None and other.distinct is not None:
+            self.distinct.merge(other.distinct)
+        else:
+            self.distinct = None
+        return self
+
+    def quartiles(self) -> Tuple[float, float]:
+        q1, q3 = self.sketch.quantiles([0.25, 0.75])
+        return float(q1), float(q3)
+
+
+def _csv_ranges(path: PathLike, workers: Optional[int]) -> Optional[List[Tuple[int, int]]]:
+    """Byte ranges to split path into for workers, or None to read it in one go."""
+    workers = resolve_workers(workers)
+    if workers <= 1 or Path(path).suffix.lower() != ".csv":
+        return None
+    ranges = split_ranges(path, workers)
+    return ranges if len(ranges) > 1 else None
+
+
+def _chunks(path: PathLike, chunksize: int, byte_range: Optional[Tuple[int, int]] = None) -> Iterator[pd.DataFrame]:
+    if byte_range is None:
+        return iter_chunks(path, chunksize)
+    return iter_csv_range_chunks(path, *byte_range, names=table_columns(path), chunksize=chunksize)
+
+
+def _scan_part(
+    byte_range: Optional[Tuple[int, int]],
+    path: PathLike,
+    chunksize: int,
+    error: float,
+    strip_commas: bool,
+    track_distinct: Optional[Callable[[str], bool]],
+    distinct_integers_only: bool,
+) -> Dict[str, ColumnScan]:
+    columns = table_columns(path)
+    scans = {
+        col: ColumnScan(
+            sketch=KLLSketch.for_error(error),
+            distinct=FingerprintSet() if track_distinct is not None and track_distinct(col) else None,
+            distinct_integers_only=distinct_integers_only,
+        )
+        for col in columns
+    }
+
+    for chunk in _chunks(path, chunksize, byte_range):
+        for pos, col in enumerate(columns):
+            raw = chunk.iloc[:, pos]
+            scans[col].update(raw, parse_numeric(raw, strip_commas))
+    return scans
+
+
+def scan_columns(
+    path: PathLike,
+    chunksize: int,
+    sketch_error: Optional[float] = None,
+    strip_commas: bool = False,
+    track_distinct: Optional[Callable[[str], bool]] = None,
+    distinct_integers_only: bool = False,
+    workers: Optional[int] = None,
+) -> Dict[str, ColumnScan]:
+    """
+    Pass one: stream the file and return {column: ColumnScan}. Distinct numeric
+    values are only tracked for columns where track_distinct(name) is true
+    (and, with distinct_integers_only, only while every value is an integer).
+    workers > 1 scans byte ranges of a CSV in that many processes and merges
+    the partial scans (track_distinct must then be picklable).
+    """
+    error = sketch_error if sketch_error is not None else DEFAULT_STREAMING_ERROR
+    scan = partial(
+        _scan_part,
+        path=path,
+        chunksize=chunksize,
+        error=error,
+        strip_commas=strip_commas,
+        track_distinct=track_distinct,
+        distinct_integers_only=distinct_integers_only,
+    )
+    ranges = _csv_ranges(path, workers)
+    if ranges is None:
+        return scan(None)
+
+    parts = map_ordered(scan, ranges, workers)
+    scans = parts[0]
+    for part in parts[1:]:
+        for col, column_scan in part.items():
+            scans[col].merge(column_scan)
+    return scans
+
+
+class OutlierCollector:
+    """
+    Bounded collection of the values falling outside [lower, upper].
+
+    With max_outliers set only the most extreme values (furthest outside
+    their fence) are kept; `overflow` counts the outlier rows not represented
+    in `values()`. unique=True keeps distinct values listed in ascending
+    order, otherwise every occurrence is kept in file order.
+    """
+
+    def __init__(self, lower: float, upper: float, max_outliers: Optional[int] = None, unique: bool = False) -> None:
+        self.lower = lower
+        self.upper = upper
+        self.max_outliers = max_outliers
+        self.unique = unique
+        self.total = 0
+        self._values = np.empty(0, dtype=float)
+        # Row positions (file order) or, when unique, occurrence counts
+        self._weights = np.empty(0, dtype=np.int64)
+
+    def _distance(self, values: np.ndarray) -> np.ndarray:
+        return np.maximum(self.lower - values, values - self.upper)
+
+    def add(self, values: np.ndarray, positions: Optional[np.ndarray] = None) -> None:
+        values = np.asarray(values, dtype=float)
+        mask = (values < self.lower) | (values > self.upper)
+        if not mask.any():
+            return
+        new_values = values[mask]
+        self.total += int(new_values.size)
+
+        if self.unique:
+            merged = np.concatenate([self._values, new_values])
+            weights = np.concatenate([self._weights, np.ones(new_values.size, dtype=np.int64)])
+            self._values, inverse = np.unique(merged, return_inverse=True)
+            self._weights = np.bincount(inverse, weights=weights).astype(np.int64)
+        else:
+            if positions is None:
+                positions = np.arange(values.size)
+            self._values = np.concatenate([self._values, new_values])
+            self._weights = np.concatenate([self._weights, np.asarray(positions, dtype=np.int64)[mask]])
+
+        self._cap()
+
+    def merge(self, other: "OutlierCollector", position_offset: int = 0) -> "OutlierCollector":
+        """
+        Fold in a collector with the same fences that saw a later part of the
+        file; position_offset is the number of rows before that part.
+        """
+        weights = other._weights if self.unique else other._weights + position_offset
+        total = self.total + other.total
+        if self.unique:
+            merged = np.concatenate([self._values, other._values])
+            self._values, inverse = np.unique(merged, return_inverse=True)
+            self._weights = np.bincount(
+                inverse, weights=np.concatenate([self._weights, weights])
+            ).astype(np.int64)
+        else:
+            self._values = np.concatenate([self._values, other._values])
+            self._weights = np.concatenate([self._weights, weights])
+        self.total = total
+        self._cap()
+        return self
+
+    def _cap(self) -> None:
+        if self.max_outliers is not None and self._values.size > self.max_outliers:
+            # Most extreme first; ties keep the earliest position / smallest value
+            keep = np.lexsort((self._weights if not self.unique else self._values, -self._distance(self._values)))
+            keep = np.sort(keep[: self.max_outliers])
+            self._values = self._values[keep]
+            self._weights = self._weights[keep]
+
+    def values(self) -> List[float]:
+        """The listed outliers: ascending distinct values, or occurrences in file order."""
+        if self.unique:
+            return self._values.tolist()
+        return self._values[np.argsort(self._weights, kind="stable")].tolist()
+
+    @property
+    def overflow(self) -> int:
+        listed = int(self._weights.sum()) if self.unique else int(self._values.size)
+        return self.total - listed
+
+
+def _extract_part(
+    byte_range: Optional[Tuple[int, int]],
+    path: PathLike,
+    chunksize: int,
+    fences: Dict[str, Tuple[float, float]],
+    max_outliers: Optional[int],
+    unique: bool,
+    strip_commas: bool,
+) -> Tuple[Dict[str, OutlierCollector], int]:
+    """Collectors for one part of the file (positions relative to it) and its row count."""
+    collectors = {
+        col: OutlierCollector(lower, upper, max_outliers, unique) for col, (lower, upper) in fences.items()
+    }
+    columns = table_columns(path)
+    offset = 0
+    for chunk in _chunks(path, chunksize, byte_range):
+        positions = np.arange(offset, offset + len(chunk))
+        for pos, col in enumerate(columns):
+            if col in collectors:
+                values = parse_numeric(chunk.iloc[:, pos], strip_commas).to_numpy(dtype=float)
+                present = ~np.isnan(values)
+                collectors[col].add(values[present], positions[present])
+        offset += len(chunk)
+    return collectors, offset
+
+
+def extract_outliers(
+    path: PathLike,
+    chunksize: int,
+    fences: Dict[str, Tuple[float, float]],
+    max_outliers: Optional[int] = None,
+    unique: bool = False,
+    strip_commas: bool = False,
+    workers: Optional[int] = None,
+) -> Dict[str, OutlierCollector]:
+    """
+    Pass two: stream the file again and collect the values outside each
+    column's (lower, upper) fences. Returns {column: OutlierCollector}.
+    workers > 1 splits a CSV into byte ranges as scan_columns does.
+    """
+    if not fences:
+        return {}
+
+    extract = partial(
+        _extract_part,
+        path=path,
+        chunksize=chunksize,
+        fences=fences,
+        max_outliers=max_outliers,
+        unique=unique,
+        strip_commas=strip_commas,
+    )
+    ranges = _csv_ranges(path, workers)
+    if ranges is None:
+        return extract(None)[0]
+
+    parts = map_ordered(extract, ranges, workers)
+    collectors, offset = parts[0]
+    for part, rows in parts[1:]:
+        for col, collector in part.items():
+            collectors[col].merge(collector, position_offset=offset)
+        offset += rows
+    return collectors
+
+
+def format_overflow(listed: str, overflow: int) -> str:
+    """Append the count of unlisted outliers to a rendered outlier list."""
+    return f"{listed} (+{overflow} more)" if overflow else listed
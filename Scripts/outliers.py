@@ -1,61 +1,115 @@
 import os
-import subprocess
 from datetime import datetime
+from functools import partial
 import pandas as pd
 import numpy as np
-import pytest
-import platform
 
-# Ensure the screen is cleared before running the script
-if platform.system() == "Windows":
-    os.system("cls")
-else:
-    os.system("clear")
-
-print("The script is currently running, please wait...")   
+from Scripts.cache import cached_map
+from Scripts.console import start
+from Scripts.outlier_streaming import OutlierCollector, extract_outliers, scan_columns
+from Scripts.profiling import ProfileSession, plan_chunksize
+from Scripts.readers import numeric_columns, read_table
+from Scripts.sketches import HyperLogLog, approx_quantiles, distinct_count
 
 RAW_PATH = "./data/raw"
 PROCESSED_PATH = "./data/processed"
 OUTPUT_FILE = "Outliers.csv"
+CACHE_REPORT = "outliers"
+
+
+ID_KEYWORDS = ["id", "uuid", "key"]
+
+
+def _name_suggests_id(name) -> bool:
+    return any(k in str(name).lower() for k in ID_KEYWORDS)
 
 
-def is_id_column(series: pd.Series) -> bool:
-    """Heuristic to detect ID-like numeric columns."""
-    name = series.name.lower()
+def _not_id_named(name) -> bool:
+    return not _name_suggests_id(name)
 
-    if any(k in name for k in ["id", "uuid", "key"]):
+
+def is_id_column(series: pd.Series, hll_precision=None) -> bool:
+    """
+    Heuristic to detect ID-like numeric columns. With hll_precision set, the
+    distinct ratio comes from a HyperLogLog sketch unless it is too close to
+    the threshold to decide.
+    """
+    if _name_suggests_id(series.name):
         return True
 
     if pd.api.types.is_integer_dtype(series):
-        unique_ratio = series.nunique(dropna=True) / len(series.dropna())
+        count = len(series.dropna())
+        sketch = HyperLogLog.of(series, hll_precision) if hll_precision is not None else None
+        unique_ratio = distinct_count(series, 0.9 * count, sketch) / count
         if unique_ratio > 0.9:
             return True
 
     return False
 
 
-def detect_outliers(series: pd.Series) -> list:
-    """Detect outliers using IQR."""
+def _iqr_bounds(q1, q3) -> tuple:
+    iqr = q3 - q1
+    return q1 - 1.5 * iqr, q3 + 1.5 * iqr
+
+
+def detect_outliers(series: pd.Series, sketch_error=None) -> list:
+    """
+    Detect outliers using IQR. With sketch_error set (e.g. 0.01), Q1 and Q3
+    come from a KLL quantile sketch with that rank error instead of an exact
+    quantile over the whole column.
+    """
     series = series.dropna()
     if series.empty:
         return []
 
-    q1 = series.quantile(0.25)
-    q3 = series.quantile(0.75)
-    iqr = q3 - q1
+    if sketch_error is not None:
+        q1, q3 = approx_quantiles(series.to_numpy(dtype=float), [0.25, 0.75], sketch_error)
+    else:
+        q1 = series.quantile(0.25)
+        q3 = series.quantile(0.75)
 
-    lower = q1 - 1.5 * iqr
-    upper = q3 + 1.5 * iqr
+    lower, upper = _iqr_bounds(q1, q3)
 
     return series[(series < lower) | (series > upper)].tolist()
 
 
-def load_tables():
+def detect_outliers_capped(series: pd.Series, max_outliers: int, sketch_error=None) -> tuple:
+    """
+    Like detect_outliers, but list at most max_outliers values (the most
+    extreme ones, in their original order). Returns (outliers, overflow) where
+    overflow is the number of outliers left out.
+    """
+    series = series.dropna()
+    if series.empty:
+        return [], 0
+
+    if sketch_error is not None:
+        q1, q3 = approx_quantiles(series.to_numpy(dtype=float), [0.25, 0.75], sketch_error)
+    else:
+        q1 = series.quantile(0.25)
+        q3 = series.quantile(0.75)
+
+    collector = OutlierCollector(*_iqr_bounds(q1, q3), max_outliers=max_outliers)
+    collector.add(series.to_numpy(dtype=float))
+    return _as_column_values(collector.values(), pd.api.types.is_integer_dtype(series)), collector.overflow
+
+
+def _as_column_values(values: list, integer: bool) -> list:
+    """Render collected float outliers the way Series.tolist() would."""
+    return [int(v) for v in values] if integer else values
+
+
+def load_tables(raw_path=RAW_PATH, session=None):
+    """
+    Return {file name: DataFrame}, reading through the shared session.
+    Parquet and Arrow tables are projected onto their numeric columns.
+    """
+    if session is None:
+        session = ProfileSession(raw_path, keep_frames=False)
+
     tables = {}
-    for file in os.listdir(RAW_PATH):
-        if file.endswith(".csv"):
-            path = os.path.join(RAW_PATH, file)
-            tables[file] = pd.read_csv(path, low_memory=False)
+    for path in session.table_files():
+        tables[path.name] = session.read(path, numeric_columns(path))
     return tables
 
 
@@ -72,49 +126,189 @@ def find_common_numeric_columns(tables: dict) -> set:
     return set.intersection(*numeric_sets)
 
 
-def main():
-    os.makedirs(PROCESSED_PATH, exist_ok=True)
+def _streaming_results(raw_path, chunksize, memory_budget, sketch_error, max_outliers, workers=None) -> list:
+    """
+    Two-pass streaming version of main(): pass one scans each file in chunks
+    (numeric and integer detection, distinct counts, quartile sketches), pass
+    two re-reads it and keeps only the values outside the IQR fences. With
+    workers > 1 both passes split each CSV into byte ranges parsed in parallel.
+    """
+    files = ProfileSession(raw_path).table_files()
+    chunksizes = {f: chunksize or plan_chunksize(f, memory_budget) for f in files}
+    scans = {
+        f: scan_columns(
+            f,
+            chunksizes[f],
+            sketch_error,
+            track_distinct=_not_id_named,
+            distinct_integers_only=True,
+            workers=workers,
+        )
+        for f in files
+    }
 
-    tables = load_tables()
-    common_numeric_cols = find_common_numeric_columns(tables)
+    # A column is numeric when every non-null value parses as a number
+    common_numeric_cols = set.intersection(*(
+        {col for col, scan in table_scans.items() if scan.numeric == scan.non_null}
+        for table_scans in scans.values()
+    ))
 
     results = []
+    for f, table_scans in scans.items():
+        modified_time = _modified_time(f)
 
-    for table_name, df in tables.items():
-        file_path = os.path.join(RAW_PATH, table_name)
-        modified_time = datetime.fromtimestamp(
-            os.path.getmtime(file_path)
-        ).isoformat()
-
-        for col in common_numeric_cols:
-            if is_id_column(df[col]):
+        fences = {}
+        for col in sorted(common_numeric_cols):
+            scan = table_scans[col]
+            if _name_suggests_id(col):
                 continue
+            if scan.is_integer_column and scan.numeric and len(scan.distinct) / scan.numeric > 0.9:
+                continue
+            if scan.numeric:
+                fences[col] = _iqr_bounds(*scan.quartiles())
 
-            outliers = detect_outliers(df[col])
-
+        collectors = extract_outliers(f, chunksizes[f], fences, max_outliers, workers=workers)
+        for col, collector in collectors.items():
+            outliers = _as_column_values(collector.values(), table_scans[col].is_integer_column)
             if outliers:
-                results.append({
-                    "Table Name": table_name,
+                row = {
+                    "Table Name": f.name,
                     "Numeric Column": col,
                     "Outliers": outliers,
                     "Date Updated": modified_time
-                })
+                }
+                if max_outliers is not None:
+                    row["Outliers Not Listed"] = collector.overflow
+                results.append(row)
+    return results
+
+
+def _modified_time(file_path, mtime=None) -> str:
+    return datetime.fromtimestamp(
+        mtime if mtime is not None else os.path.getmtime(file_path)
+    ).isoformat()
+
+
+def _table_results(
+    table_name, df, columns, modified_time, sketch_error=None, max_outliers=None, hll_precision=None
+) -> list:
+    """Outlier rows of one table for the given numeric columns (ID-like ones skipped)."""
+    results = []
+
+    for col in columns:
+        if is_id_column(df[col], hll_precision):
+            continue
+
+        if max_outliers is not None:
+            outliers, overflow = detect_outliers_capped(df[col], max_outliers, sketch_error)
+        else:
+            outliers, overflow = detect_outliers(df[col], sketch_error), 0
+
+        if outliers:
+            row = {
+                "Table Name": table_name,
+                "Numeric Column": col,
+                "Outliers": outliers,
+                "Date Updated": modified_time
+            }
+            if max_outliers is not None:
+                row["Outliers Not Listed"] = overflow
+            results.append(row)
+
+    return results
+
+
+def _profile_table(path, mtime=None, session=None, sketch_error=None, max_outliers=None, hll_precision=None) -> tuple:
+    """
+    Per-file unit of work for the result cache: the table's numeric columns
+    and its outlier rows for all of them (filtered to the common columns later).
+    """
+    columns = numeric_columns(path)
+    df = session.read(path, columns) if session is not None else read_table(path, columns)
+    numeric_cols = find_common_numeric_columns({path.name: df})
+    rows = _table_results(
+        path.name, df, sorted(numeric_cols), _modified_time(path, mtime), sketch_error, max_outliers, hll_precision
+    )
+    return numeric_cols, rows
+
+
+def _in_memory_results(raw_path, session, sketch_error, max_outliers, cache=None, hll_precision=None) -> list:
+    if cache is not None:
+        if session is None:
+            session = ProfileSession(raw_path, keep_frames=False)
+        profile = partial(
+            _profile_table,
+            session=session,
+            sketch_error=sketch_error,
+            max_outliers=max_outliers,
+            hll_precision=hll_precision,
+        )
+        params = {"sketch_error": sketch_error, "max_outliers": max_outliers, "hll_precision": hll_precision}
+        profiles = cached_map(profile, session.table_files(), cache, CACHE_REPORT, params)
+        common_numeric_cols = set.intersection(*(cols for cols, _ in profiles)) if profiles else set()
+        return [row for _, rows in profiles for row in rows if row["Numeric Column"] in common_numeric_cols]
+
+    tables = load_tables(raw_path, session)
+    common_numeric_cols = find_common_numeric_columns(tables)
+
+    results = []
+
+    for table_name, df in tables.items():
+        file_path = os.path.join(raw_path, table_name)
+        results.extend(
+            _table_results(
+                table_name,
+                df,
+                sorted(common_numeric_cols),
+                _modified_time(file_path),
+                sketch_error,
+                max_outliers,
+                hll_precision,
+            )
+        )
 
-    output_path = os.path.join(PROCESSED_PATH, OUTPUT_FILE)
-    pd.DataFrame(results).to_csv(output_path, index=False)
+    return results
+
+
+def main(
+    raw_path=RAW_PATH,
+    processed_path=PROCESSED_PATH,
+    session=None,
+    sketch_error=None,
+    max_outliers=None,
+    chunksize=None,
+    memory_budget=None,
+    cache=None,
+    hll_precision=None,
+    workers=None,
+):
+    """
+    Write the IQR outliers of every common numeric, non-ID column to
+    processed_path/Outliers.csv and return them.
+
+    max_outliers lists at most that many (most extreme) outliers per column and
+    adds an "Outliers Not Listed" count. chunksize (rows) or memory_budget
+    (bytes per chunk) switches to the two-pass streaming mode, where
+    workers > 1 parses byte ranges of each CSV in parallel. With a
+    ProfileCache (in-memory mode), files unchanged since an earlier run with
+    the same settings are not read at all. hll_precision (in-memory mode)
+    lets a HyperLogLog sketch decide the ID heuristic's distinct ratio.
+    """
+    os.makedirs(processed_path, exist_ok=True)
+
+    if chunksize is not None or memory_budget is not None:
+        results = _streaming_results(raw_path, chunksize, memory_budget, sketch_error, max_outliers, workers)
+    else:
+        results = _in_memory_results(raw_path, session, sketch_error, max_outliers, cache, hll_precision)
+
+    output_path = os.path.join(processed_path, OUTPUT_FILE)
+    results_df = pd.DataFrame(results)
+    results_df.to_csv(output_path, index=False)
 
     print(f"Outlier detection complete → {output_path}")
+    return results_df
 
 
 if __name__ == "__main__":
-    main()  # Run the outlier script
-
-  # Automatically run tests after the main script
-    try:
-        import pytest
-        print("\nRunning tests...\n")
-        # Run all tests in the ./tests folder
-        pytest_args = ["-q", "--tb=short", "./tests/test_outliers.py"]
-        pytest.main(pytest_args)
-    except ImportError:
-        print("pytest not installed. Skipping tests.")
+    start()
+    main()
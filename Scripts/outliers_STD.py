@@ -3,7 +3,7 @@
 """
 outliers_STD.py
 
-Reads all CSV files in ./data/raw, finds numeric columns that are numeric in *all* tables (intersection),
+Reads all tables in ./data/raw (CSV, Parquet or Arrow IPC), finds numeric columns that are numeric in *all* tables (intersection),
 excludes numeric ID-like columns, then for each table & numeric column computes:
 - Average (rounded to 1 decimal)
 - Standard deviation (rounded to 1 decimal)
@@ -15,69 +15,94 @@ Outputs: ./data/processed/Outliers_STD.csv
 
 from __future__ import annotations
 
-import os
-from dataclasses import dataclass
+from functools import partial
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Iterable, List, Optional, Sequence, Set
+from typing import Iterable, List, Optional, Set, Tuple
 
 import numpy as np
 import pandas as pd
-import platform
-
-# Ensure the screen is cleared before running the script
-if platform.system() == "Windows":
-    os.system("cls")
-else:
-    os.system("clear")
-
-print("The script is currently running, please wait...")  
+from pandas.api.types import is_numeric_dtype
+
+from Scripts.cache import ProfileCache, cached_map
+from Scripts.console import start
+from Scripts.instrumentation import stage
+from Scripts.moments import Moments
+from Scripts.parallel import map_column_shards, resolve_workers
+from Scripts.outlier_streaming import OutlierCollector, extract_outliers, format_overflow, parse_numeric, scan_columns
+from Scripts.profiling import ProfileSession, plan_chunksize
+from Scripts.readers import numeric_columns, read_table
+from Scripts.sketches import HyperLogLog, approx_quantiles, distinct_count
 
 DEFAULT_RAW_DIR = Path("./data/raw")
 DEFAULT_PROCESSED_DIR = Path("./data/processed")
 DEFAULT_OUTPUT_NAME = "Outliers_STD.csv"
+CACHE_REPORT = "outliers_std"
+# Rows of a text column parsed first; each later block is twice as large
+NUMERIC_SAMPLE_ROWS = 1000
 
 
-def _file_modified_iso(path: Path) -> str:
-    ts = path.stat().st_mtime
+def _file_modified_iso(path: Path, mtime: Optional[float] = None) -> str:
+    ts = mtime if mtime is not None else path.stat().st_mtime
     # Use UTC ISO format for consistent tests/runs
     return datetime.fromtimestamp(ts, tz=timezone.utc).isoformat(timespec="seconds")
 
 
 def _coerce_numeric_series(s: pd.Series) -> pd.Series:
-    # Convert strings like "1,234" safely; keep NaNs
-    if s.dtype == object:
-        s = s.astype(str).str.replace(",", "", regex=False)
-    return pd.to_numeric(s, errors="coerce")
+    # Numeric dtypes need no parsing; text like "1,234" is parsed with the separator removed; keep NaNs
+    if is_numeric_dtype(s.dtype):
+        return s
+    if s.dtype != object:
+        s = s.astype(object)
+    return parse_numeric(s, strip_commas=True)
 
 
-def _numeric_columns_in_df(df: pd.DataFrame, min_numeric_ratio: float = 0.9) -> Set[str]:
+def _numeric_columns_in_df(
+    df: pd.DataFrame, min_numeric_ratio: float = 0.9, sample_rows: int = NUMERIC_SAMPLE_ROWS
+) -> Set[str]:
     """
     Identify numeric columns by attempting coercion. A column is "numeric" if
     at least min_numeric_ratio of non-null entries are numeric after coercion.
+
+    Columns with a numeric dtype are accepted without parsing. Text columns
+    are parsed in blocks of sample_rows rows, then twice as many each time,
+    and rejected as soon as the values that failed so far keep the whole
+    column below the ratio: the answer is the same as parsing everything,
+    but a text column is usually settled after a fraction of its rows.
     """
     numeric_cols: Set[str] = set()
     for col in df.columns:
-        ser = df[col]
-        coerced = _coerce_numeric_series(ser)
-        non_null = ser.notna().sum()
-        if non_null == 0:
-            continue
-        numeric_non_null = coerced.notna().sum()
-        if (numeric_non_null / non_null) >= min_numeric_ratio:
-            numeric_cols.add(col)
+        with stage("numeric_detection", column=col):
+            if _is_numeric_column(df[col], min_numeric_ratio, sample_rows):
+                numeric_cols.add(col)
     return numeric_cols
 
 
-def _looks_like_id_column(name: str, numeric_values: pd.Series) -> bool:
-    """
-    Heuristic ID detection:
-    - Column name contains 'id' (case-insensitive) OR ends with common id patterns
-    - AND values are mostly integers
-    - AND high uniqueness ratio (identifier-like)
-    """
+def _is_numeric_column(ser: pd.Series, min_numeric_ratio: float, sample_rows: int) -> bool:
+    """The per-column test of _numeric_columns_in_df."""
+    non_null = ser.notna().sum()
+    if non_null == 0:
+        return False
+    if is_numeric_dtype(ser.dtype):
+        return True
+
+    failed = 0
+    lo, size = 0, sample_rows
+    while lo < len(ser):
+        block = ser.iloc[lo : lo + size]
+        failed += block.notna().sum() - _coerce_numeric_series(block).notna().sum()
+        # At most non_null - failed values can still turn out numeric
+        if (non_null - failed) / non_null < min_numeric_ratio:
+            return False
+        lo += len(block)
+        size *= 2
+    return True
+
+
+def _name_suggests_id(name: str) -> bool:
+    """Column name contains 'id' (case-insensitive) OR ends with common id patterns."""
     lname = name.strip().lower()
-    name_suggests_id = (
+    return (
         "id" == lname
         or lname.endswith("_id")
         or lname.endswith("id")
@@ -85,107 +110,261 @@ def _looks_like_id_column(name: str, numeric_values: pd.Series) -> bool:
         or " id " in f" {lname} "
         or "id" in lname
     )
-    if not name_suggests_id:
-        return False
 
-    vals = numeric_values.dropna()
-    if len(vals) < 3:
+
+def _id_like_counts(count: int, intish: int, distinct: int) -> bool:
+    """
+    Value side of the ID heuristic, from the number of numeric values, how
+    many of them are integer-ish and how many are distinct.
+    """
+    if count < 3:
         return False
 
     # Mostly integer-ish?
-    intish_ratio = np.mean(np.isclose(vals % 1, 0))
-    if intish_ratio < 0.95:
+    if intish / count < 0.95:
         return False
 
     # High uniqueness suggests identifier
-    uniq_ratio = vals.nunique(dropna=True) / len(vals)
-    return uniq_ratio >= 0.9
+    return distinct / count >= 0.9
 
 
-def _iqr_outliers(values: pd.Series) -> List[float]:
+def _looks_like_id_column(name: str, numeric_values: pd.Series, hll_precision: Optional[int] = None) -> bool:
     """
-    Outliers by IQR rule: < Q1 - 1.5*IQR or > Q3 + 1.5*IQR
-    Returns unique outlier values as floats, sorted.
+    Heuristic ID detection:
+    - Column name contains 'id' (case-insensitive) OR ends with common id patterns
+    - AND values are mostly integers
+    - AND high uniqueness ratio (identifier-like), estimated with a
+      HyperLogLog sketch when hll_precision is set and not near the threshold
     """
-    v = values.dropna().astype(float)
-    if len(v) < 4:
-        return []
+    if not _name_suggests_id(name):
+        return False
+
+    vals = numeric_values.dropna()
+    if len(vals) < 3:
+        return False
+
+    intish = int(np.isclose(vals % 1, 0).sum())
+    sketch = HyperLogLog.of(vals, hll_precision) if hll_precision is not None else None
+    return _id_like_counts(len(vals), intish, distinct_count(vals, 0.9 * len(vals), sketch))
+
 
-    q1 = np.percentile(v, 25)
-    q3 = np.percentile(v, 75)
+def _iqr_fences(q1: float, q3: float) -> Optional[Tuple[float, float]]:
+    """(lower, upper) IQR fences, or None when the IQR is zero."""
     iqr = q3 - q1
     if iqr == 0:
-        return []
+        return None
+    return q1 - 1.5 * iqr, q3 + 1.5 * iqr
 
-    lower = q1 - 1.5 * iqr
-    upper = q3 + 1.5 * iqr
-    outs = v[(v < lower) | (v > upper)]
-    if outs.empty:
-        return []
-    unique_sorted = sorted(set(outs.tolist()))
-    return unique_sorted
 
+def _iqr_outliers(
+    values: pd.Series,
+    sketch_error: Optional[float] = None,
+    max_outliers: Optional[int] = None,
+) -> Tuple[List[float], int]:
+    """
+    Outliers by IQR rule: < Q1 - 1.5*IQR or > Q3 + 1.5*IQR
+    Returns (unique outlier values as floats, sorted; overflow). With
+    max_outliers set only that many of the most extreme values are listed and
+    overflow counts the outlier rows left out; otherwise overflow is 0.
 
-def analyze_tables(
-    raw_dir: Path = DEFAULT_RAW_DIR,
-    processed_dir: Path = DEFAULT_PROCESSED_DIR,
-    output_name: str = DEFAULT_OUTPUT_NAME,
-) -> pd.DataFrame:
+    With sketch_error set, Q1 and Q3 are estimated by a KLL quantile sketch
+    with that rank error instead of exact percentiles.
     """
-    Core function for computing the output table. Returns the result DataFrame
-    and also writes it to processed_dir/output_name.
+    v = values.dropna().astype(float)
+    if len(v) < 4:
+        return [], 0
+
+    if sketch_error is not None:
+        q1, q3 = approx_quantiles(v.to_numpy(), [0.25, 0.75], sketch_error)
+    else:
+        q1 = np.percentile(v, 25)
+        q3 = np.percentile(v, 75)
+    fences = _iqr_fences(q1, q3)
+    if fences is None:
+        return [], 0
+
+    collector = OutlierCollector(*fences, max_outliers=max_outliers, unique=True)
+    collector.add(v.to_numpy())
+    return collector.values(), collector.overflow
+
+
+def _format_outliers(outliers: List[float], overflow: int = 0) -> str:
+    if not outliers:
+        return "No Outliers"
+    # Keep a compact, readable format
+    listed = "; ".join(str(int(x)) if float(x).is_integer() else str(x) for x in outliers)
+    return format_overflow(listed, overflow)
+
+
+def _rows_for_columns(
+    df: pd.DataFrame,
+    columns: List[str],
+    table_name: str,
+    date_updated: str,
+    sketch_error: Optional[float] = None,
+    max_outliers: Optional[int] = None,
+    hll_precision: Optional[int] = None,
+) -> List[dict]:
     """
-    raw_dir = Path(raw_dir)
-    processed_dir = Path(processed_dir)
-    processed_dir.mkdir(parents=True, exist_ok=True)
+    Compute the output rows of one table for the given numeric columns,
+    skipping ID-like columns. Rows follow the order of columns.
+    """
+    rows = []
+    for col in columns:
+        if col not in df.columns:
+            continue
 
-    csv_files = sorted([p for p in raw_dir.glob("*.csv") if p.is_file()])
-    if not csv_files:
-        # Still create an empty output with correct columns
-        empty = pd.DataFrame(
-            columns=["Table Name", "Numeric Column", "Average", "Standard Deviation", "list of outliers", "Date updated"]
-        )
-        out_path = processed_dir / output_name
-        empty.to_csv(out_path, index=False)
-        return empty
+        with stage("coerce", table_name, col):
+            numeric_series = _coerce_numeric_series(df[col])
 
-    # Read all tables and determine numeric columns per table
-    tables: dict[Path, pd.DataFrame] = {}
-    numeric_cols_per_table: dict[Path, Set[str]] = {}
+        # Exclude ID-like numeric columns
+        with stage("id_check", table_name, col):
+            if _looks_like_id_column(col, numeric_series, hll_precision):
+                continue
 
-    for f in csv_files:
-        df = pd.read_csv(f, low_memory=False)
-        tables[f] = df
-        numeric_cols_per_table[f] = _numeric_columns_in_df(df)
+        with stage("moments", table_name, col):
+            moments = Moments.of(numeric_series.to_numpy(dtype=float, na_value=np.nan))
+        mean_val, std_val = moments.mean, moments.std
+
+        mean_rounded = round(mean_val, 1) if np.isfinite(mean_val) else np.nan
+        std_rounded = round(std_val, 1) if np.isfinite(std_val) else np.nan
+
+        with stage("iqr_outliers", table_name, col):
+            outliers, overflow = _iqr_outliers(numeric_series, sketch_error, max_outliers)
+        outliers_str = _format_outliers(outliers, overflow)
+
+        rows.append(
+            {
+                "Table Name": table_name,
+                "Numeric Column": col,
+                "Average": mean_rounded,
+                "Standard Deviation": std_rounded,
+                "list of outliers": outliers_str,
+                "Date updated": date_updated,
+            }
+        )
+    return rows
+
+
+def _column_rows(
+    f: Path,
+    df: pd.DataFrame,
+    columns: Iterable[str],
+    column_workers: Optional[int] = None,
+    column_executor: str = "thread",
+    sketch_error: Optional[float] = None,
+    max_outliers: Optional[int] = None,
+    mtime: Optional[float] = None,
+    hll_precision: Optional[int] = None,
+) -> List[dict]:
+    """
+    Output rows of table f for columns, optionally sharding the columns across
+    column_workers threads (or processes, with column_executor="process").
+    """
+    table_name = f.stem  # exact file name without extension
+    rows_for = partial(
+        _rows_for_columns,
+        table_name=table_name,
+        date_updated=_file_modified_iso(f, mtime),
+        sketch_error=sketch_error,
+        max_outliers=max_outliers,
+        hll_precision=hll_precision,
+    )
+    return map_column_shards(rows_for, df, list(columns), column_workers, column_executor)
+
+
+def _profile_csv_file(
+    f: Path,
+    column_workers: Optional[int] = None,
+    column_executor: str = "thread",
+    sketch_error: Optional[float] = None,
+    max_outliers: Optional[int] = None,
+    mtime: Optional[float] = None,
+    session: Optional[ProfileSession] = None,
+    hll_precision: Optional[int] = None,
+) -> Tuple[Set[str], List[dict]]:
+    """
+    Per-file unit of work for the process pool and the result cache: read one
+    CSV and return its numeric columns plus the output rows for all of them.
+    The caller keeps only the rows of columns that turn out to be numeric in
+    every table.
+    """
+    columns = numeric_columns(f, include_text=True)
+    with stage("read", f.stem):
+        df = session.read(f, columns) if session is not None else read_table(f, columns)
+    with stage("numeric_columns", f.stem):
+        numeric_cols = _numeric_columns_in_df(df)
+    rows = _column_rows(
+        f, df, sorted(numeric_cols), column_workers, column_executor, sketch_error, max_outliers, mtime, hll_precision
+    )
+    return numeric_cols, rows
+
+
+def _streaming_rows(
+    table_files: List[Path],
+    chunksize: Optional[int],
+    memory_budget: Optional[int],
+    sketch_error: Optional[float],
+    max_outliers: Optional[int],
+    min_numeric_ratio: float = 0.9,
+    workers: Optional[int] = None,
+) -> List[dict]:
+    """
+    Two-pass streaming version of the report: pass one scans every file in
+    chunks (numeric ratios, moments, quartile sketches, distinct counts of
+    ID-named columns); pass two re-reads each file and keeps only the values
+    outside the fences. Memory is bounded by the chunk size, the sketches and
+    max_outliers rather than by file size. workers > 1 splits each CSV into
+    byte ranges processed in parallel and merges the partial results.
+    """
+    chunksizes = {f: chunksize or plan_chunksize(f, memory_budget) for f in table_files}
+    scans = {}
+    for f in table_files:
+        with stage("scan", f.stem):
+            scans[f] = scan_columns(
+                f, chunksizes[f], sketch_error, strip_commas=True, track_distinct=_name_suggests_id, workers=workers
+            )
 
-    # Intersection: numeric columns that are numeric in all tables
-    common_numeric_cols: Set[str] = set.intersection(*numeric_cols_per_table.values()) if numeric_cols_per_table else set()
+    numeric_cols_per_table = [
+        {
+            col for col, scan in table_scans.items()
+            if scan.non_null and scan.numeric / scan.non_null >= min_numeric_ratio
+        }
+        for table_scans in scans.values()
+    ]
+    common_numeric_cols = sorted(set.intersection(*numeric_cols_per_table))
 
     results = []
-    for f, df in tables.items():
+    for f, table_scans in scans.items():
         table_name = f.stem  # exact file name without extension
         date_updated = _file_modified_iso(f)
 
-        for col in sorted(common_numeric_cols):
-            if col not in df.columns:
-                continue
-
-            numeric_series = _coerce_numeric_series(df[col])
-
+        columns = []
+        fences = {}
+        for col in common_numeric_cols:
+            scan = table_scans[col]
             # Exclude ID-like numeric columns
-            if _looks_like_id_column(col, numeric_series):
+            if _name_suggests_id(col) and _id_like_counts(scan.numeric, scan.integral, len(scan.distinct)):
                 continue
+            columns.append(col)
+            if scan.numeric >= 4:
+                col_fences = _iqr_fences(*scan.quartiles())
+                if col_fences is not None:
+                    fences[col] = col_fences
+
+        with stage("extract_outliers", table_name):
+            collectors = extract_outliers(
+                f, chunksizes[f], fences, max_outliers, unique=True, strip_commas=True, workers=workers
+            )
 
-            mean_val = float(np.nanmean(numeric_series.values)) if numeric_series.notna().any() else np.nan
-            std_val = float(np.nanstd(numeric_series.values, ddof=1)) if numeric_series.dropna().shape[0] >= 2 else np.nan
-
-            mean_rounded = round(mean_val, 1) if np.isfinite(mean_val) else np.nan
-            std_rounded = round(std_val, 1) if np.isfinite(std_val) else np.nan
+        for col in columns:
+            scan = table_scans[col]
+            mean_val = scan.moments.mean
+            std_val = scan.moments.std
 
-            outliers = _iqr_outliers(numeric_series)
-            if outliers:
-                # Keep a compact, readable format
-                outliers_str = "; ".join(str(int(x)) if float(x).is_integer() else str(x) for x in outliers)
+            collector = collectors.get(col)
+            if collector is not None:
+                outliers_str = _format_outliers(collector.values(), collector.overflow)
             else:
                 outliers_str = "No Outliers"
 
@@ -193,12 +372,120 @@ def analyze_tables(
                 {
                     "Table Name": table_name,
                     "Numeric Column": col,
-                    "Average": mean_rounded,
-                    "Standard Deviation": std_rounded,
+                    "Average": round(mean_val, 1) if np.isfinite(mean_val) else np.nan,
+                    "Standard Deviation": round(std_val, 1) if np.isfinite(std_val) else np.nan,
                     "list of outliers": outliers_str,
                     "Date updated": date_updated,
                 }
             )
+    return results
+
+
+def analyze_tables(
+    raw_dir: Path = DEFAULT_RAW_DIR,
+    processed_dir: Path = DEFAULT_PROCESSED_DIR,
+    output_name: str = DEFAULT_OUTPUT_NAME,
+    session: Optional[ProfileSession] = None,
+    workers: Optional[int] = None,
+    column_workers: Optional[int] = None,
+    column_executor: str = "thread",
+    sketch_error: Optional[float] = None,
+    max_outliers: Optional[int] = None,
+    chunksize: Optional[int] = None,
+    memory_budget: Optional[int] = None,
+    cache: Optional[ProfileCache] = None,
+    hll_precision: Optional[int] = None,
+) -> pd.DataFrame:
+    """
+    Core function for computing the output table. Returns the result DataFrame
+    and also writes it to processed_dir/output_name.
+
+    Pass a ProfileSession to reuse tables already parsed by another report.
+    workers > 1 profiles that many files concurrently in a process pool (0 means
+    one per CPU); each worker reads its own files, so the session is bypassed.
+    column_workers > 1 also splits the columns of each table across workers,
+    for very wide tables. sketch_error switches the IQR quartiles to a KLL
+    sketch with that rank error (see Scripts/sketches.py).
+
+    max_outliers caps each "list of outliers" at the most extreme values and
+    appends "(+N more)" with the number of outlier rows left out. Setting
+    chunksize (rows) or memory_budget (bytes per chunk) switches to the
+    two-pass streaming mode, which never loads a whole file; there workers
+    splits every single CSV into byte ranges parsed in parallel instead.
+
+    With a ProfileCache (in-memory and process-pool modes), files unchanged
+    since an earlier run with the same settings are not read at all.
+    hll_precision (in-memory modes) lets a HyperLogLog sketch decide the ID
+    heuristic's distinct ratio unless it is close to the threshold.
+    """
+    raw_dir = Path(raw_dir)
+    processed_dir = Path(processed_dir)
+    processed_dir.mkdir(parents=True, exist_ok=True)
+
+    if session is None:
+        session = ProfileSession(raw_dir, keep_frames=False)
+
+    table_files = session.table_files() if session.raw_dir.is_dir() else []
+    if not table_files:
+        # Still create an empty output with correct columns
+        empty = pd.DataFrame(
+            columns=["Table Name", "Numeric Column", "Average", "Standard Deviation", "list of outliers", "Date updated"]
+        )
+        out_path = processed_dir / output_name
+        empty.to_csv(out_path, index=False)
+        return empty
+
+    if chunksize is not None or memory_budget is not None:
+        results = _streaming_rows(
+            table_files, chunksize, memory_budget, sketch_error, max_outliers, workers=workers
+        )
+    elif resolve_workers(workers) > 1 or cache is not None:
+        # Each file is profiled on its own (in a worker, or from the cache);
+        # rows are filtered once the intersection of numeric columns across
+        # all tables is known.
+        profile = partial(
+            _profile_csv_file,
+            column_workers=column_workers,
+            column_executor=column_executor,
+            sketch_error=sketch_error,
+            max_outliers=max_outliers,
+            session=session if resolve_workers(workers) <= 1 else None,
+            hll_precision=hll_precision,
+        )
+        params = {"sketch_error": sketch_error, "max_outliers": max_outliers, "hll_precision": hll_precision}
+        profiles = cached_map(profile, table_files, cache, CACHE_REPORT, params, workers)
+        common_numeric_cols: Set[str] = set.intersection(*(cols for cols, _ in profiles))
+        results = [row for _, rows in profiles for row in rows if row["Numeric Column"] in common_numeric_cols]
+    else:
+        # Read all tables and determine numeric columns per table
+        tables: dict[Path, pd.DataFrame] = {}
+        numeric_cols_per_table: dict[Path, Set[str]] = {}
+
+        for f in table_files:
+            # Numeric and text columns only, for formats that carry a schema
+            with stage("read", f.stem):
+                df = session.read(f, numeric_columns(f, include_text=True))
+            tables[f] = df
+            with stage("numeric_columns", f.stem):
+                numeric_cols_per_table[f] = _numeric_columns_in_df(df)
+
+        # Intersection: numeric columns that are numeric in all tables
+        common_numeric_cols = set.intersection(*numeric_cols_per_table.values()) if numeric_cols_per_table else set()
+
+        results = []
+        for f, df in tables.items():
+            results.extend(
+                _column_rows(
+                    f,
+                    df,
+                    sorted(common_numeric_cols),
+                    column_workers,
+                    column_executor,
+                    sketch_error,
+                    max_outliers,
+                    hll_precision=hll_precision,
+                )
+            )
 
     result_df = pd.DataFrame(
         results,
@@ -214,15 +501,7 @@ def main() -> None:
     analyze_tables(DEFAULT_RAW_DIR, DEFAULT_PROCESSED_DIR, DEFAULT_OUTPUT_NAME)
     print(f"Outlier detection complete → {DEFAULT_PROCESSED_DIR}")
 
+
 if __name__ == "__main__":
-    main()  # Run the outlier script
-
-  # Automatically run tests after the main script
-    try:
-        import pytest
-        print("\nRunning tests...\n")
-        # Run all tests in the ./tests folder
-        pytest_args = ["-q", "--tb=short", "./tests/test_outliers_std.py"]
-        pytest.main(pytest_args)
-    except ImportError:
-        print("pytest not installed. Skipping tests.")
\ No newline at end of file
+    start()
+    main()
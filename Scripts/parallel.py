@@ -0,0 +1,84 @@
+"""
+parallel.py
+
+Small helpers for running independent profiling work on several cores.
+Results always come back in input order, so reports stay deterministic
+whatever the worker count.
+"""
+
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, List, Optional, Sequence, TypeVar
+
+import pandas as pd
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+COLUMN_EXECUTORS = ("thread", "process")
+# Shards per worker when splitting columns, so uneven columns balance out
+SHARDS_PER_WORKER = 4
+
+
+def resolve_workers(workers: Optional[int]) -> int:
+    """
+    Normalise a worker-count setting: None or 1 means sequential, 0 or a
+    negative number means one worker per CPU.
+    """
+    if workers is None:
+        return 1
+    if workers <= 0:
+        return os.cpu_count() or 1
+    return workers
+
+
+def map_ordered(func: Callable[[T], R], items: Sequence[T], workers: Optional[int] = None) -> List[R]:
+    """
+    Apply func to every item, in a process pool when more than one worker is
+    requested. func must be a picklable module-level callable.
+    """
+    workers = min(resolve_workers(workers), len(items))
+    if workers <= 1:
+        return [func(item) for item in items]
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(func, items))
+
+
+def map_column_shards(
+    func: Callable[[pd.DataFrame, List[Any]], List[R]],
+    df: pd.DataFrame,
+    columns: Sequence[Any],
+    workers: Optional[int] = None,
+    executor: str = "thread",
+) -> List[R]:
+    """
+    Run func(df, shard) over contiguous shards of columns and concatenate the
+    returned lists, so the result keeps the order of columns.
+
+    executor="thread" shares df with the workers and suits NumPy/pandas
+    reductions, which release the GIL. executor="process" sends each worker
+    only its own columns (df[shard]) and needs a picklable func.
+    """
+    if executor not in COLUMN_EXECUTORS:
+        raise ValueError(f"executor must be one of {COLUMN_EXECUTORS}, got {executor!r}")
+
+    columns = list(columns)
+    workers = min(resolve_workers(workers), len(columns))
+    if workers <= 1:
+        return list(func(df, columns))
+
+    n_shards = min(len(columns), workers * SHARDS_PER_WORKER)
+    bounds = [len(columns) * i // n_shards for i in range(n_shards + 1)]
+    shards = [columns[lo:hi] for lo, hi in zip(bounds, bounds[1:])]
+
+    if executor == "thread":
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(func, [df] * len(shards), shards))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(func, [df[shard] for shard in shards], shards))
+
+    return [item for part in parts for item in part]
@@ -0,0 +1,211 @@
+"""
+profiling.py
+
+Shared profiling engine for the EDA reports.
+
+A ProfileSession lists the tables in ./data/raw (CSV, Parquet and Arrow IPC
+files, see Scripts/readers.py) once and parses each file at most once, handing
+the same in-memory DataFrame to every report that asks for it. The report
+scripts (column_row_count, outliers, outliers_STD and summary_statistics)
+accept an optional session, so a full EDA run can produce all four outputs
+from a single read of every raw table:
+
+    session = ProfileSession("./data/raw")
+    run_reports(session, "./data/processed")
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from Scripts.dtypes import read_narrow
+from Scripts.instrumentation import OUTPUT_NAME as TIMINGS_OUTPUT_NAME, recording, stage
+# PathLike and iter_csv_chunks moved to readers.py; they stay importable from here
+from Scripts.readers import PathLike, is_supported, iter_chunks, iter_csv_chunks, read_table  # noqa: F401
+
+if TYPE_CHECKING:
+    from Scripts.cache import ProfileCache
+
+DEFAULT_RAW_DIR = Path("./data/raw")
+DEFAULT_PROCESSED_DIR = Path("./data/processed")
+
+
+class ProfileSession:
+    """
+    Per-run cache of the raw directory listing and the parsed raw tables.
+
+    Reports never mutate the DataFrames they receive, so a frame parsed for
+    one report is safe to reuse for the next one. With keep_frames=False
+    nothing is kept: each table is parsed on every read and released by the
+    caller, so a single report holds one table at a time (the reports create
+    such a session when none is passed). run_reports turns keep_frames off
+    for the last report it produces, so each frame is dropped once that
+    report has read it.
+
+    With narrow_dtypes=True tables are loaded with the narrowest exact dtypes
+    (see Scripts/dtypes.py), which are remembered in cache across runs.
+    """
+
+    def __init__(
+        self,
+        raw_dir: PathLike = DEFAULT_RAW_DIR,
+        narrow_dtypes: bool = False,
+        cache: Optional[ProfileCache] = None,
+        keep_frames: bool = True,
+    ) -> None:
+        self.raw_dir = Path(raw_dir)
+        self.narrow_dtypes = narrow_dtypes
+        self.cache = cache
+        self.keep_frames = keep_frames
+        self._files: Optional[List[Path]] = None
+        self._frames: Dict[Path, pd.DataFrame] = {}
+        self._projections: Dict[Tuple[Path, Tuple[str, ...]], pd.DataFrame] = {}
+
+    def table_files(self) -> List[Path]:
+        """
+        Return the supported table files in raw_dir (CSV, Parquet, Arrow IPC),
+        sorted by name. The directory is only listed the first time this is called.
+        """
+        if self._files is None:
+            if not self.raw_dir.is_dir():
+                raise FileNotFoundError(f"Raw path not found: {self.raw_dir}")
+            self._files = sorted(
+                p for p in self.raw_dir.iterdir()
+                if is_supported(p) and p.is_file()
+            )
+        return list(self._files)
+
+    def csv_files(self) -> List[Path]:
+        """Return the CSV files in raw_dir, sorted by name."""
+        return [p for p in self.table_files() if p.suffix.lower() == ".csv"]
+
+    def read(self, path: PathLike, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """
+        Return the parsed table for path, reading the file on first use only.
+        With columns, only those columns are returned: taken from the full
+        table if it is already loaded, else read (and kept) on their own.
+        Without keep_frames this is the table's last use: it is returned
+        and no longer kept.
+        """
+        path = Path(path)
+        df = self._frames.get(path)
+        key = (path, tuple(columns)) if columns is not None else None
+        if df is not None:
+            df = df if columns is None else df[list(columns)]
+        elif key is not None:
+            df = self._projections.get(key)
+            if df is None:
+                df = self._load(path, columns)
+                self._projections[key] = df
+        else:
+            df = self._frames[path] = self._load(path)
+
+        if not self.keep_frames:
+            self._forget(path)
+        return df
+
+    def _forget(self, path: Path) -> None:
+        self._frames.pop(path, None)
+        for key in [k for k in self._projections if k[0] == path]:
+            del self._projections[key]
+
+    def _load(self, path: Path, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        if self.narrow_dtypes:
+            return read_narrow(path, columns, self.cache)
+        return read_table(path, columns)
+
+    def tables(self) -> Dict[Path, pd.DataFrame]:
+        """Return {path: DataFrame} for every raw table, in sorted order."""
+        return {path: self.read(path) for path in self.table_files()}
+
+    def clear(self) -> None:
+        """Drop the cached listing and frames (e.g. to release memory)."""
+        self._files = None
+        self._frames.clear()
+        self._projections.clear()
+
+
+def plan_chunksize(path: PathLike, memory_budget: int, sample_rows: int = 1000) -> int:
+    """
+    Choose a chunksize so one parsed chunk stays within memory_budget bytes.
+    The per-row footprint is estimated from the first sample_rows rows
+    parsed as strings (the representation used by the streaming readers).
+    """
+    sample = next(iter_chunks(path, sample_rows), None)
+    if sample is None or sample.empty:
+        return sample_rows
+    bytes_per_row = max(1, int(sample.memory_usage(index=True, deep=True).sum()) // len(sample))
+    # Leave headroom for the temporaries created while processing a chunk
+    return max(1, memory_budget // (2 * bytes_per_row))
+
+
+# Report names accepted by run_reports, in the order they are produced
+REPORTS = ("column_row_count", "outliers", "outliers_std", "summary_statistics")
+
+
+def run_reports(
+    session: Optional[ProfileSession] = None,
+    processed_dir: PathLike = DEFAULT_PROCESSED_DIR,
+    reports: Optional[Sequence[str]] = None,
+    workers: Optional[int] = None,
+    cache: Optional[ProfileCache] = None,
+    timings: bool = False,
+) -> Dict[str, pd.DataFrame]:
+    """
+    Produce the selected reports (all of REPORTS by default) from one session,
+    so each raw table is listed and parsed once. workers and cache are passed
+    on to every report. timings=True also writes the time spent in each
+    stage, per report, table and column, to processed_dir/Stage_Timings.csv
+    (see Scripts/instrumentation.py). Returns {report name: result DataFrame}.
+    """
+    from Scripts import column_row_count, outliers, outliers_STD, summary_statistics
+
+    selected = list(REPORTS) if reports is None else list(reports)
+    unknown = sorted(set(selected) - set(REPORTS))
+    if unknown:
+        raise ValueError(f"Unknown report(s) {unknown}; choose from {list(REPORTS)}")
+
+    session = session if session is not None else ProfileSession()
+    processed_dir = Path(processed_dir)
+    keep_frames = session.keep_frames
+    raw_dir = session.raw_dir
+
+    producers = {
+        "column_row_count": lambda: column_row_count.analyze_tables(
+            raw_path=str(raw_dir), processed_path=str(processed_dir), session=session, workers=workers, cache=cache
+        ),
+        "outliers": lambda: outliers.main(
+            raw_path=str(raw_dir), processed_path=str(processed_dir), session=session, workers=workers, cache=cache
+        ),
+        "outliers_std": lambda: outliers_STD.analyze_tables(
+            raw_dir=raw_dir, processed_dir=processed_dir, session=session, workers=workers, cache=cache
+        ),
+        "summary_statistics": lambda: summary_statistics.main(
+            raw_path=str(raw_dir), processed_path=str(processed_dir), session=session, workers=workers, cache=cache
+        ),
+    }
+    ordered = [name for name in REPORTS if name in selected]
+
+    def produce(name: str) -> pd.DataFrame:
+        # The last report is the last reader of every table: drop each frame
+        # once it has been read, rather than holding all of them until the end
+        session.keep_frames = keep_frames and name != ordered[-1]
+        try:
+            return producers[name]()
+        finally:
+            session.keep_frames = keep_frames
+
+    if not timings:
+        results = {name: produce(name) for name in ordered}
+    else:
+        results = {}
+        with recording() as timer:
+            for name in ordered:
+                timer.report = name
+                with stage("report"):
+                    results[name] = produce(name)
+        timer.write(processed_dir / TIMINGS_OUTPUT_NAME)
+    return results
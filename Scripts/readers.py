@@ -0,0 +1,345 @@
+"""
+readers.py
+
+Pluggable table readers for the raw directory.
+
+Each supported file format has a TableReader that knows how to load a table
+(optionally only some of its columns), list its columns, name the numeric
+ones without parsing values when the format carries a schema, report what
+the file's own metadata says (row and null counts) and stream it in chunks
+of string values for the streaming modes.
+
+    read_table("./data/raw/sales.parquet", columns=["amount"])
+    table_metadata("./data/raw/sales.parquet").row_count
+
+CSV is read with pandas. Parquet and Arrow IPC (Feather v2) need the optional
+dependency pyarrow, which is imported only when such a file is read.
+Additional formats can be added with register_reader().
+"""
+
+from __future__ import annotations
+
+import io
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from Scripts.csv_scan import count_rows
+
+PathLike = Union[str, Path]
+
+
+@dataclass(frozen=True)
+class TableMetadata:
+    """What a file says about itself without its values being decoded (None = unknown)."""
+
+    column_count: int
+    row_count: Optional[int] = None
+    null_count: Optional[int] = None
+
+
+def iter_csv_chunks(path, chunksize: int, **read_kwargs) -> Iterator[pd.DataFrame]:
+    """
+    Yield the rows of a CSV in chunks of at most chunksize rows. Values are
+    kept as strings unless read_kwargs overrides dtype, so every chunk of a
+    column has the same representation regardless of what it contains.
+    """
+    read_kwargs.setdefault("dtype", str)
+    with pd.read_csv(path, chunksize=chunksize, **read_kwargs) as reader:
+        for chunk in reader:
+            yield chunk
+
+
+class _ByteRange(io.RawIOBase):
+    """Read-only view of the bytes [start, end) of a file."""
+
+    def __init__(self, path: PathLike, start: int, end: int) -> None:
+        super().__init__()
+        self._fh = open(path, "rb")
+        self._fh.seek(start)
+        self._remaining = end - start
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        n = min(len(buffer), self._remaining)
+        if n <= 0:
+            return 0
+        read = self._fh.readinto(memoryview(buffer)[:n])
+        self._remaining -= read
+        return read
+
+    def close(self) -> None:
+        self._fh.close()
+        super().close()
+
+
+def iter_csv_range_chunks(
+    path: PathLike, start: int, end: int, names: Sequence[str], chunksize: int
+) -> Iterator[pd.DataFrame]:
+    """
+    Like iter_csv_chunks, for the records in bytes [start, end) of a CSV
+    (see csv_scan.split_ranges): the range has no header, so the column
+    names are passed in.
+    """
+    with io.BufferedReader(_ByteRange(path, start, end)) as fh:
+        try:
+            yield from iter_csv_chunks(fh, chunksize, header=None, names=list(names))
+        except pd.errors.EmptyDataError:
+            return
+
+
+def _as_strings(df: pd.DataFrame) -> pd.DataFrame:
+    """Render every value as a string (nulls stay NaN), like a CSV read with dtype=str."""
+    return pd.DataFrame(
+        {col: df[col].astype("string").to_numpy(dtype=object, na_value=np.nan) for col in df.columns},
+        index=df.index,
+    )
+
+
+def _with_dtypes(df: pd.DataFrame, dtype: Optional[Dict[str, str]]) -> pd.DataFrame:
+    """Cast the columns named in dtype (formats whose readers cannot decode into a given dtype)."""
+    if not dtype:
+        return df
+    return df.astype({col: kind for col, kind in dtype.items() if col in df.columns})
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+    except ImportError as exc:
+        raise ImportError(
+            "Reading Parquet and Arrow IPC files needs the optional dependency pyarrow "
+            "(pip install pyarrow)"
+        ) from exc
+    return pyarrow
+
+
+class TableReader(ABC):
+    """Base class of the format readers; one instance serves every file of its format."""
+
+    suffixes: Tuple[str, ...] = ()
+
+    @abstractmethod
+    def read(
+        self, path: PathLike, columns: Optional[Sequence[str]] = None, dtype: Optional[Dict[str, str]] = None
+    ) -> pd.DataFrame:
+        """
+        Load the table, only the given columns if columns is not None. dtype
+        maps column names to the dtypes to load them as (see Scripts/dtypes.py).
+        """
+
+    @abstractmethod
+    def columns(self, path: PathLike) -> List[str]:
+        """The table's column names, from the header or schema alone."""
+
+    def numeric_columns(self, path: PathLike, include_text: bool = False) -> Optional[List[str]]:
+        """
+        Columns worth loading for numeric profiling, from the file's schema
+        (plus string columns with include_text, for reports that coerce text
+        to numbers), or None when the format has no schema to tell.
+        """
+        return None
+
+    def metadata(self, path: PathLike) -> TableMetadata:
+        return TableMetadata(column_count=len(self.columns(path)))
+
+    @abstractmethod
+    def iter_chunks(self, path: PathLike, chunksize: int) -> Iterator[pd.DataFrame]:
+        """Yield the table in chunks of at most chunksize rows, every value as a string."""
+
+
+class CsvReader(TableReader):
+    suffixes = (".csv",)
+
+    def read(
+        self, path: PathLike, columns: Optional[Sequence[str]] = None, dtype: Optional[Dict[str, str]] = None
+    ) -> pd.DataFrame:
+        # Parsed straight into the requested dtypes, so the wide defaults are never materialized
+        return pd.read_csv(
+            path, usecols=list(columns) if columns is not None else None, dtype=dtype or None, low_memory=False
+        )
+
+    def columns(self, path: PathLike) -> List[str]:
+        return [str(col) for col in pd.read_csv(path, nrows=0).columns]
+
+    def metadata(self, path: PathLike) -> TableMetadata:
+        """Column count from the header; row count from a memory-mapped record scan."""
+        return TableMetadata(column_count=len(self.columns(path)), row_count=count_rows(path))
+
+    def iter_chunks(self, path: PathLike, chunksize: int) -> Iterator[pd.DataFrame]:
+        return iter_csv_chunks(path, chunksize)
+
+
+def _is_numeric_field(pa, field) -> bool:
+    return pa.types.is_integer(field.type) or pa.types.is_floating(field.type)
+
+
+def _is_text_field(pa, field) -> bool:
+    return pa.types.is_string(field.type) or pa.types.is_large_string(field.type)
+
+
+class _ArrowSchemaReader(TableReader):
+    """Shared schema handling of the pyarrow-backed formats."""
+
+    @abstractmethod
+    def _schema(self, path: PathLike):
+        """The pyarrow schema of the table at path."""
+
+    def columns(self, path: PathLike) -> List[str]:
+        return list(self._schema(path).names)
+
+    def numeric_columns(self, path: PathLike, include_text: bool = False) -> Optional[List[str]]:
+        pa = _require_pyarrow()
+        return [
+            field.name
+            for field in self._schema(path)
+            if _is_numeric_field(pa, field) or (include_text and _is_text_field(pa, field))
+        ]
+
+
+class ParquetReader(_ArrowSchemaReader):
+    suffixes = (".parquet", ".pq")
+
+    def _schema(self, path: PathLike):
+        _require_pyarrow()
+        import pyarrow.parquet as pq
+
+        return pq.read_schema(path)
+
+    def read(
+        self, path: PathLike, columns: Optional[Sequence[str]] = None, dtype: Optional[Dict[str, str]] = None
+    ) -> pd.DataFrame:
+        _require_pyarrow()
+        df = pd.read_parquet(path, columns=list(columns) if columns is not None else None, engine="pyarrow")
+        return _with_dtypes(df, dtype)
+
+    def metadata(self, path: PathLike) -> TableMetadata:
+        """Row count from the footer; null count from the column chunk statistics, if every chunk has them."""
+        _require_pyarrow()
+        import pyarrow.parquet as pq
+
+        parquet_file = pq.ParquetFile(path)
+        meta = parquet_file.metadata
+        null_count: Optional[int] = 0
+        for rg in range(meta.num_row_groups):
+            group = meta.row_group(rg)
+            for col in range(group.num_columns):
+                stats = group.column(col).statistics
+                if stats is None or not stats.has_null_count:
+                    null_count = None
+                    break
+                null_count += stats.null_count
+            if null_count is None:
+                break
+        return TableMetadata(
+            column_count=len(parquet_file.schema_arrow.names),
+            row_count=int(meta.num_rows),
+            null_count=null_count,
+        )
+
+    def iter_chunks(self, path: PathLike, chunksize: int) -> Iterator[pd.DataFrame]:
+        _require_pyarrow()
+        import pyarrow.parquet as pq
+
+        offset = 0
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize):
+            chunk = batch.to_pandas()
+            chunk.index = pd.RangeIndex(offset, offset + len(chunk))
+            offset += len(chunk)
+            yield _as_strings(chunk)
+
+
+class ArrowIpcReader(_ArrowSchemaReader):
+    """Arrow IPC file format, also known as Feather v2. Files are memory-mapped."""
+
+    suffixes = (".arrow", ".feather", ".ipc")
+
+    def _open(self, path: PathLike):
+        pa = _require_pyarrow()
+        return pa.ipc.open_file(pa.memory_map(str(path)))
+
+    def _schema(self, path: PathLike):
+        return self._open(path).schema
+
+    def read(
+        self, path: PathLike, columns: Optional[Sequence[str]] = None, dtype: Optional[Dict[str, str]] = None
+    ) -> pd.DataFrame:
+        table = self._open(path).read_all()
+        if columns is not None:
+            table = table.select(list(columns))
+        return _with_dtypes(table.to_pandas(), dtype)
+
+    def metadata(self, path: PathLike) -> TableMetadata:
+        """Row and null counts from the record batch headers (the data stays mapped, not decoded)."""
+        table = self._open(path).read_all()
+        return TableMetadata(
+            column_count=table.num_columns,
+            row_count=table.num_rows,
+            null_count=sum(column.null_count for column in table.columns),
+        )
+
+    def iter_chunks(self, path: PathLike, chunksize: int) -> Iterator[pd.DataFrame]:
+        reader = self._open(path)
+        offset = 0
+        for i in range(reader.num_record_batches):
+            batch = reader.get_batch(i)
+            for start in range(0, batch.num_rows, chunksize):
+                chunk = batch.slice(start, chunksize).to_pandas()
+                chunk.index = pd.RangeIndex(offset, offset + len(chunk))
+                offset += len(chunk)
+                yield _as_strings(chunk)
+
+
+READERS: Dict[str, TableReader] = {}
+
+
+def register_reader(reader: TableReader) -> None:
+    """Make reader handle files with any of its suffixes (replacing earlier readers)."""
+    for suffix in reader.suffixes:
+        READERS[suffix.lower()] = reader
+
+
+for _reader in (CsvReader(), ParquetReader(), ArrowIpcReader()):
+    register_reader(_reader)
+
+
+def is_supported(path: PathLike) -> bool:
+    return Path(path).suffix.lower() in READERS
+
+
+def reader_for(path: PathLike) -> TableReader:
+    suffix = Path(path).suffix.lower()
+    if suffix not in READERS:
+        raise ValueError(f"Unsupported table format {suffix!r} ({path}); supported: {sorted(READERS)}")
+    return READERS[suffix]
+
+
+def read_table(
+    path: PathLike, columns: Optional[Sequence[str]] = None, dtype: Optional[Dict[str, str]] = None
+) -> pd.DataFrame:
+    """Load the table at path, only the given columns if columns is not None (see TableReader.read)."""
+    return reader_for(path).read(path, columns, dtype)
+
+
+def table_columns(path: PathLike) -> List[str]:
+    return reader_for(path).columns(path)
+
+
+def numeric_columns(path: PathLike, include_text: bool = False) -> Optional[List[str]]:
+    """See TableReader.numeric_columns; None means "read every column"."""
+    return reader_for(path).numeric_columns(path, include_text)
+
+
+def table_metadata(path: PathLike) -> TableMetadata:
+    return reader_for(path).metadata(path)
+
+
+def iter_chunks(path: PathLike, chunksize: int) -> Iterator[pd.DataFrame]:
+    """Stream any supported table in string-valued chunks (see iter_csv_chunks)."""
+    return reader_for(path).iter_chunks(path, chunksize)
@@ -0,0 +1,232 @@
+"""
+row_hashing.py
+
+Vectorized 64-bit (or 128-bit) fingerprints for rows and column values, plus a
+compact set of fingerprints that can be fed chunk by chunk. Used to count
+duplicate rows and detect unique columns without holding the whole table in
+memory, or a pandas factorization of it.
+
+With 64-bit fingerprints two different rows collide with probability about
+n**2 / 2**65 over n rows (negligible below ~10**8 rows); bits=128 adds a
+second, independently keyed hash, and duplicate_mask(..., verify=True)
+compares the candidate rows with the row they supposedly repeat so the
+result is exact.
+"""
+
+from __future__ import annotations
+
+from typing import List, Sequence
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_float_dtype
+
+FINGERPRINT_BITS = (64, 128)
+# Rows hashed at a time by duplicate_mask, bounding the per-column temporaries
+DEFAULT_BATCH_ROWS = 1_000_000
+# Values hashed in the first block by has_duplicate_values; each later block is 4x larger
+EARLY_EXIT_BLOCK = 4096
+_BLOCK_GROWTH = 4
+# Key of the second hash for 128-bit fingerprints (pandas' default is "0123456789123456")
+_SECOND_HASH_KEY = "f3e9b1c7a5d20864"
+
+
+def _check_bits(bits: int) -> None:
+    if bits not in FINGERPRINT_BITS:
+        raise ValueError(f"bits must be one of {FINGERPRINT_BITS}, got {bits!r}")
+
+
+def _without_negative_zero(obj):
+    """
+    obj with -0.0 replaced by 0.0 in its float columns: they compare equal,
+    as in df.duplicated(), but their bits (which are hashed) differ.
+    """
+    if isinstance(obj, pd.Series):
+        return obj + 0.0 if is_float_dtype(obj.dtype) else obj
+    floats = [pos for pos, dtype in enumerate(obj.dtypes) if is_float_dtype(dtype)]
+    if not floats:
+        return obj
+    obj = obj.copy(deep=False)
+    for pos in floats:
+        obj.isetitem(pos, obj.iloc[:, pos] + 0.0)
+    return obj
+
+
+def _fingerprints(obj, bits: int) -> np.ndarray:
+    _check_bits(bits)
+    obj = _without_negative_zero(obj)
+    low = pd.util.hash_pandas_object(obj, index=False).to_numpy(dtype=np.uint64)
+    if bits == 64:
+        return low
+    high = pd.util.hash_pandas_object(obj, index=False, hash_key=_SECOND_HASH_KEY).to_numpy(dtype=np.uint64)
+    # One opaque 16-byte item per row, which NumPy sorts and compares as a unit
+    return np.ascontiguousarray(np.column_stack([low, high])).view("V16").ravel()
+
+
+def row_fingerprints(df: pd.DataFrame, bits: int = 64) -> np.ndarray:
+    """
+    Return one fingerprint per row of df (the index is not hashed): uint64
+    values, or 16-byte void items when bits=128.
+    """
+    return _fingerprints(df, bits)
+
+
+def value_fingerprints(s: pd.Series, bits: int = 64) -> np.ndarray:
+    """Return one fingerprint per value of s (see row_fingerprints)."""
+    return _fingerprints(s, bits)
+
+
+def combine_fingerprints(columns: Sequence[np.ndarray], bits: int = 64) -> np.ndarray:
+    """
+    Return one fingerprint per row from the value fingerprints of each column
+    (equal-length outputs of value_fingerprints with the same bits), for
+    callers that normalize or replace values column by column before hashing.
+    """
+    halves = [np.asarray(c).view(np.uint64).reshape(len(c), -1) for c in columns]
+    return _fingerprints(pd.DataFrame(np.hstack(halves)), bits)
+
+
+def _empty_fingerprints(bits: int) -> np.ndarray:
+    _check_bits(bits)
+    return np.empty(0, dtype=np.uint64 if bits == 64 else np.dtype("V16"))
+
+
+def _rows_equal(df: pd.DataFrame, rows: np.ndarray, others: np.ndarray) -> np.ndarray:
+    """Whether row rows[i] of df equals row others[i] in every column (NaN equals NaN)."""
+    same = np.ones(rows.size, dtype=bool)
+    for pos in range(df.shape[1]):
+        col = df.iloc[:, pos]
+        a = col.take(rows).reset_index(drop=True)
+        b = col.take(others).reset_index(drop=True)
+        equal = (a == b).fillna(False).to_numpy(dtype=bool)
+        same &= equal | (a.isna() & b.isna()).to_numpy(dtype=bool)
+    return same
+
+
+def duplicate_mask(
+    df: pd.DataFrame,
+    bits: int = 64,
+    verify: bool = False,
+    batch_rows: int = DEFAULT_BATCH_ROWS,
+) -> np.ndarray:
+    """
+    Boolean keep="first" duplicate mask of the rows of df, like
+    df.duplicated() but computed from row fingerprints hashed batch_rows rows
+    at a time, so the extra memory is a few integers per row.
+
+    With verify=True every candidate duplicate is compared with the first row
+    of the same fingerprint; groups where that finds a hash collision are
+    re-checked exactly with pandas, so the mask matches df.duplicated().
+    """
+    n = len(df)
+    if n == 0:
+        return np.zeros(0, dtype=bool)
+
+    parts: List[np.ndarray] = [row_fingerprints(df.iloc[lo : lo + batch_rows], bits) for lo in range(0, n, batch_rows)]
+    fingerprints = np.concatenate(parts) if len(parts) > 1 else parts[0]
+
+    _, first, inverse = np.unique(fingerprints, return_index=True, return_inverse=True)
+    inverse = inverse.ravel()
+    first_of = first[inverse]
+    duplicate = first_of != np.arange(n)
+
+    if verify and duplicate.any():
+        rows = np.flatnonzero(duplicate)
+        same = _rows_equal(df, rows, first_of[rows])
+        if not same.all():
+            collided = np.isin(inverse, inverse[rows[~same]])
+            duplicate[collided] = df[collided].duplicated(keep="first").to_numpy()
+    return duplicate
+
+
+def has_duplicate_values(s, first_block: int = EARLY_EXIT_BLOCK, bits: int = 64) -> bool:
+    """
+    Whether any value of the Series s occurs more than once (NaNs count as
+    equal values, and so do 0.0 and -0.0, as in nunique()). For a DataFrame, whether any row does, i.e. whether its
+    columns fail to form a key.
+
+    Values are fingerprinted in geometrically growing blocks and the scan
+    stops at the first block that repeats a fingerprint, so a column that is
+    clearly not unique costs a few thousand hashes instead of a full
+    nunique(). A repeat is confirmed on the actual values before answering.
+    """
+    seen = FingerprintSet(bits)
+    lo, size = 0, first_block
+    while lo < len(s):
+        block = s.iloc[lo : lo + size]
+        lo += len(block)
+        if seen.add(value_fingerprints(block, bits)).any():
+            if s.iloc[:lo].duplicated().any():
+                return True
+            # Hash collision: settle it exactly
+            return bool(s.duplicated().any())
+        size *= _BLOCK_GROWTH
+    return False
+
+
+class FingerprintSet:
+    """
+    The distinct fingerprints seen so far, kept as a few sorted runs.
+
+    Each batch of new fingerprints becomes a run of its own, and the newest
+    run is merged into the one before it while that one is less than twice
+    its size. Run sizes therefore at least halve from one run to the next:
+    there are O(log n) runs to search, each fingerprint is merged O(log n)
+    times, and adding n fingerprints costs O(n log n) whatever the batch
+    size (a single sorted array with inserts would cost O(n) per batch).
+
+    Costs 8 bytes (16 with bits=128) per distinct fingerprint, far less than a
+    Python set or a pandas factorization of the original values.
+    """
+
+    def __init__(self, bits: int = 64) -> None:
+        self._dtype = _empty_fingerprints(bits).dtype
+        self._runs: List[np.ndarray] = []
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _contains(self, values: np.ndarray) -> np.ndarray:
+        found = np.zeros(values.size, dtype=bool)
+        for run in self._runs:
+            pos = np.searchsorted(run, values)
+            found |= run[np.minimum(pos, run.size - 1)] == values
+        return found
+
+    def add(self, fingerprints: np.ndarray) -> np.ndarray:
+        """
+        Add a batch of fingerprints. Returns a boolean mask that is True for
+        every element already seen, either in an earlier batch or earlier in
+        this one (i.e. the keep="first" duplicate mask).
+        """
+        fingerprints = np.asarray(fingerprints)
+        if self._dtype == np.uint64:
+            fingerprints = fingerprints.astype(np.uint64, copy=False)
+        elif fingerprints.dtype != self._dtype:
+            raise ValueError(f"expected {self._dtype} fingerprints, got {fingerprints.dtype}")
+        duplicate = np.ones(fingerprints.size, dtype=bool)
+        if fingerprints.size == 0:
+            return duplicate
+
+        uniq, first_idx = np.unique(fingerprints, return_index=True)
+        duplicate[first_idx] = False
+
+        if self._runs:
+            found = self._contains(uniq)
+            duplicate[first_idx[found]] = True
+            uniq = uniq[~found]
+        if uniq.size:
+            self._runs.append(uniq)
+            self._size += int(uniq.size)
+            while len(self._runs) > 1 and self._runs[-2].size < 2 * self._runs[-1].size:
+                newest = self._runs.pop()
+                # Two sorted runs: the stable sort merges them in linear time
+                self._runs[-1] = np.sort(np.concatenate([self._runs[-1], newest]), kind="stable")
+        return duplicate
+
+    def merge(self, other: "FingerprintSet") -> "FingerprintSet":
+        """Fold in the fingerprints of another set (e.g. from another worker)."""
+        if other._runs:
+            self.add(np.concatenate(other._runs))
+        return self
@@ -0,0 +1,218 @@
+"""
+sketches.py
+
+Bounded-memory, mergeable summaries of columns.
+
+KLLSketch answers quantile queries (median, Q1, Q3) with a configurable rank
+error using O(k log(n/k)) memory, so a column can be summarized chunk by chunk
+or split across workers and merged afterwards. While a sketch has seen fewer
+values than its capacity it keeps them all and its quantiles are exact
+(NumPy's default linear interpolation).
+
+HyperLogLog estimates the number of distinct values of a column with a
+relative error of about 1.04 / sqrt(2**precision) in 2**precision bytes.
+distinct_count uses it to answer threshold questions ("is this column
+unique?", "are more than 90% of the values distinct?") and only counts
+exactly when the estimate is too close to the threshold to decide.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from Scripts.row_hashing import value_fingerprints
+
+DEFAULT_K = 200
+# Approximate normalised rank error of a KLL sketch is about RANK_ERROR_FACTOR / k
+RANK_ERROR_FACTOR = 3.3
+_CAPACITY_DECAY = 2.0 / 3.0
+_MIN_CAPACITY = 8
+
+DEFAULT_HLL_PRECISION = 14
+HLL_PRECISIONS = range(4, 19)
+# Estimates within this many standard errors of a threshold are re-counted exactly
+HLL_MARGIN_SIGMAS = 4
+
+
+def k_for_error(error: float) -> int:
+    """Smallest sketch size k whose expected rank error is at most error (e.g. 0.01 = 1%)."""
+    if not 0 < error < 1:
+        raise ValueError(f"error must be between 0 and 1, got {error!r}")
+    return max(_MIN_CAPACITY, math.ceil(RANK_ERROR_FACTOR / error))
+
+
+class KLLSketch:
+    """
+    KLL quantile sketch over float values. NaNs are ignored.
+
+    Level h holds items that each stand for 2**h original values. When a
+    level exceeds its capacity it is sorted and every other item (random
+    offset) is promoted to the next level.
+    """
+
+    def __init__(self, k: int = DEFAULT_K, seed: Optional[int] = 0) -> None:
+        if k < _MIN_CAPACITY:
+            raise ValueError(f"k must be at least {_MIN_CAPACITY}, got {k!r}")
+        self.k = k
+        self.n = 0
+        self._levels: List[np.ndarray] = [np.empty(0, dtype=float)]
+        self._rng = np.random.default_rng(seed)
+
+    @classmethod
+    def for_error(cls, error: float, seed: Optional[int] = 0) -> "KLLSketch":
+        """Create a sketch sized for the given normalised rank error."""
+        return cls(k_for_error(error), seed=seed)
+
+    @property
+    def is_exact(self) -> bool:
+        """True while no compaction has happened (all values are retained)."""
+        return len(self._levels) == 1
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self._levels) - level - 1
+        return max(_MIN_CAPACITY, int(math.ceil(self.k * _CAPACITY_DECAY ** depth)))
+
+    def _compress(self) -> None:
+        level = 0
+        while level < len(self._levels):
+            items = self._levels[level]
+            if items.size > self._capacity(level):
+                if level + 1 == len(self._levels):
+                    self._levels.append(np.empty(0, dtype=float))
+                items = np.sort(items)
+                # An odd item out stays behind so weights are preserved exactly
+                keep = items[:1] if items.size % 2 else items[:0]
+                pairs = items[keep.size:]
+                offset = int(self._rng.integers(2))
+                self._levels[level + 1] = np.concatenate([self._levels[level + 1], pairs[offset::2]])
+                self._levels[level] = keep
+            level += 1
+
+    def update(self, values: Sequence[float]) -> "KLLSketch":
+        """Add a batch of values (any array-like of numbers)."""
+        values = np.asarray(values, dtype=float).ravel()
+        values = values[~np.isnan(values)]
+        if values.size:
+            self.n += int(values.size)
+            self._levels[0] = np.concatenate([self._levels[0], values])
+            self._compress()
+        return self
+
+    def merge(self, other: "KLLSketch") -> "KLLSketch":
+        """Fold another sketch (e.g. from another chunk or worker) into this one."""
+        while len(self._levels) < len(other._levels):
+            self._levels.append(np.empty(0, dtype=float))
+        for level, items in enumerate(other._levels):
+            self._levels[level] = np.concatenate([self._levels[level], items])
+        self.n += other.n
+        self._compress()
+        return self
+
+    def quantiles(self, qs: Sequence[float]) -> np.ndarray:
+        """Return the estimated quantiles qs (fractions in [0, 1]); NaN if empty."""
+        qs = np.asarray(qs, dtype=float)
+        if self.n == 0:
+            return np.full(qs.shape, np.nan)
+        if self.is_exact:
+            return np.quantile(self._levels[0], qs)
+
+        items = np.concatenate(self._levels)
+        weights = np.concatenate(
+            [np.full(level.size, 2 ** h, dtype=np.int64) for h, level in enumerate(self._levels)]
+        )
+        order = np.argsort(items, kind="stable")
+        items = items[order]
+        cumulative = np.cumsum(weights[order])
+        ranks = np.ceil(qs * cumulative[-1]).clip(1, cumulative[-1])
+        return items[np.searchsorted(cumulative, ranks)]
+
+    def quantile(self, q: float) -> float:
+        return float(self.quantiles([q])[0])
+
+
+def approx_quantiles(values: Sequence[float], qs: Sequence[float], error: float) -> np.ndarray:
+    """One-shot helper: sketch values with the given rank error and return quantiles qs."""
+    return KLLSketch.for_error(error).update(values).quantiles(qs)
+
+
+def _bit_length(values: np.ndarray) -> np.ndarray:
+    """Vectorized int.bit_length() of uint64 values (exact, via 32-bit halves)."""
+    high = (values >> np.uint64(32)).astype(np.float64)
+    low = (values & np.uint64(0xFFFFFFFF)).astype(np.float64)
+    return np.where(high > 0, 32 + np.frexp(high)[1], np.frexp(low)[1])
+
+
+class HyperLogLog:
+    """
+    HyperLogLog distinct-count sketch over 64-bit fingerprints (see
+    Scripts/row_hashing.py). Sketches with the same precision merge by
+    taking the register-wise maximum, so chunks or workers can be sketched
+    separately.
+    """
+
+    def __init__(self, precision: int = DEFAULT_HLL_PRECISION) -> None:
+        if precision not in HLL_PRECISIONS:
+            raise ValueError(
+                f"precision must be between {HLL_PRECISIONS.start} and {HLL_PRECISIONS.stop - 1}, got {precision!r}"
+            )
+        self.precision = precision
+        self._registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    @classmethod
+    def of(cls, values: pd.Series, precision: int = DEFAULT_HLL_PRECISION) -> "HyperLogLog":
+        """Sketch the non-null values of a Series."""
+        return cls(precision).update(value_fingerprints(values.dropna()))
+
+    @property
+    def relative_error(self) -> float:
+        """Standard error of estimate() relative to the true count."""
+        return 1.04 / math.sqrt(self._registers.size)
+
+    def update(self, fingerprints: np.ndarray) -> "HyperLogLog":
+        """Add a batch of uint64 fingerprints."""
+        fingerprints = np.asarray(fingerprints, dtype=np.uint64).ravel()
+        if fingerprints.size:
+            p = self.precision
+            index = (fingerprints >> np.uint64(64 - p)).astype(np.intp)
+            rest = fingerprints << np.uint64(p)
+            # Position of the first 1-bit in the remaining 64 - p bits
+            rank = np.minimum(64 - _bit_length(rest) + 1, 64 - p + 1).astype(np.uint8)
+            np.maximum.at(self._registers, index, rank)
+        return self
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        """Fold another sketch of the same precision into this one."""
+        if other.precision != self.precision:
+            raise ValueError(f"cannot merge precision {other.precision} into {self.precision}")
+        np.maximum(self._registers, other._registers, out=self._registers)
+        return self
+
+    def estimate(self) -> float:
+        m = self._registers.size
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / float(np.sum(np.ldexp(1.0, -self._registers.astype(int))))
+        zeros = int(np.count_nonzero(self._registers == 0))
+        if raw <= 2.5 * m and zeros:
+            # Linear counting is more accurate for small cardinalities
+            return m * math.log(m / zeros)
+        return raw
+
+    def is_near(self, count: float) -> bool:
+        """Whether count lies within the error margin of the estimate."""
+        margin = HLL_MARGIN_SIGMAS * self.relative_error * max(count, 1.0)
+        return abs(self.estimate() - count) <= margin
+
+
+def distinct_count(values: pd.Series, near: float, sketch: Optional[HyperLogLog] = None) -> float:
+    """
+    Number of distinct non-null values, for comparison against the threshold
+    near. Without a sketch this is the exact nunique(); with one, its estimate
+    is returned unless it is too close to near to tell which side it is on.
+    """
+    if sketch is not None and not sketch.is_near(near):
+        return sketch.estimate()
+    return values.nunique(dropna=True)
@@ -1,106 +1,248 @@
 import os
-import platform
+import warnings
 from datetime import datetime
+from functools import partial
+from typing import Optional
 import pandas as pd
 import numpy as np
 
-# Ensure the screen is cleared before running the script
-if platform.system() == "Windows":
-    os.system("cls")
-else:
-    os.system("clear")
-
-print("The script is currently running, please wait...")
+from Scripts.cache import ProfileCache, cached_map
+from Scripts.console import start
+from Scripts.moments import Moments
+from Scripts.parallel import map_column_shards, resolve_workers
+from Scripts.profiling import ProfileSession
+from Scripts.readers import numeric_columns, read_table
+from Scripts.sketches import HyperLogLog, approx_quantiles, distinct_count
 
 RAW_PATH = "./data/raw"
 PROCESSED_PATH = "./data/processed"
 OUTPUT_FILE = "Summary_Statistics.csv"
+CACHE_REPORT = "summary_statistics"
 
   
-def is_id_column(series: pd.Series, column_name: str) -> bool:
+def is_id_column(series: pd.Series, column_name: str, sketch: Optional[HyperLogLog] = None) -> bool:
     """
     Determine whether a numeric column should be treated as an ID.
+    A HyperLogLog sketch of the column, when given, settles the uniqueness
+    test unless its estimate is too close to the row count.
     """
     name_flag = any(
         keyword in column_name.lower()
         for keyword in ["id", "key", "identifier"]
     )
+    if name_flag:
+        return True
 
-    uniqueness_flag = series.nunique(dropna=True) == len(series)
+    return distinct_count(series, len(series), sketch) >= len(series)
 
-    return name_flag or uniqueness_flag
 
+def _integer_min_max(df: pd.DataFrame, columns: list) -> dict:
+    """
+    Exact {column: (min, max)} for the NumPy integer columns, computed one
+    block per dtype so the extremes keep their integer type (and precision).
+    """
+    extremes = {}
+    int_cols = [col for col in columns if isinstance(df[col].dtype, np.dtype) and df[col].dtype.kind in "iu"]
+    for dtype in {df[col].dtype for col in int_cols}:
+        block_cols = [col for col in int_cols if df[col].dtype == dtype]
+        block = df[block_cols].to_numpy()
+        if len(block):
+            for col, lo, hi in zip(block_cols, block.min(axis=0), block.max(axis=0)):
+                extremes[col] = (lo, hi)
+    return extremes
+
+
+def _summarize_columns(
+    df: pd.DataFrame,
+    columns: list,
+    table_name: str,
+    date_updated: str,
+    sketch_error: Optional[float] = None,
+    hll_precision: Optional[int] = None,
+) -> list:
+    """
+    Return the summary rows for the given numeric columns of df, skipping
+    ID-like columns. Rows follow the order of columns.
+
+    All statistics are computed in one batch over a 2-D float array with
+    NaN-aware reductions along axis 0, instead of one Series per column;
+    mean, standard deviation and extremes come from one Moments pass.
+    With sketch_error set, medians come from KLL quantile sketches instead.
+    With hll_precision set, each column is also sketched with HyperLogLog,
+    which feeds the ID check and a "Distinct Count (est.)" column.
+    """
+    sketches = {
+        col: HyperLogLog.of(df[col], hll_precision) if hll_precision is not None else None for col in columns
+    }
+    columns = [col for col in columns if not is_id_column(df[col], col, sketches[col])]
+    if not columns:
+        return []
+
+    values = df[columns].to_numpy(dtype=float, na_value=np.nan)
+    # Count, mean, spread and extremes of every column in one pass
+    moments = Moments.of(values)
+    means, stds = moments.mean, moments.std
+    minimums, maximums = moments.minimum, moments.maximum
+
+    # All-null columns legitimately produce NaN here
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", category=RuntimeWarning)
+        if sketch_error is None:
+            medians = np.nanmedian(values, axis=0)
+        else:
+            medians = np.array([approx_quantiles(values[:, i], [0.5], sketch_error)[0] for i in range(len(columns))])
+
+    integer_extremes = _integer_min_max(df, columns)
 
-def calculate_summary_statistics(raw_path: str = RAW_PATH) -> pd.DataFrame:
     results = []
+    for i, col in enumerate(columns):
+        minimum, maximum = integer_extremes.get(col, (minimums[i], maximums[i]))
+
+        mean = round(means[i],1)
+        std = round(stds[i],1)
+        variation_coeff = round((std / mean)*100 if mean != 0 else np.nan,1)
+
+        row = {
+            "Table Name": table_name,
+            "Numeric Column(s)": col,
+            "Minimum": minimum,
+            "Maximum": maximum,
+            "Median": medians[i],
+            "Average": mean,
+            "Standard Deviation": std,
+            "Variation Coefficient": variation_coeff,
+            "Date Updated": date_updated
+        }
+        if sketches[col] is not None:
+            row["Distinct Count (est.)"] = int(round(sketches[col].estimate()))
+        results.append(row)
+
+    return results
+
+
+def summarize_table(
+    df: pd.DataFrame,
+    file_path: str,
+    column_workers: Optional[int] = None,
+    column_executor: str = "thread",
+    sketch_error: Optional[float] = None,
+    mtime: Optional[float] = None,
+    hll_precision: Optional[int] = None,
+) -> list:
+    """
+    Return the summary-statistics rows for one parsed table.
+    column_workers > 1 shards the numeric columns across that many threads
+    (or processes, with column_executor="process"). mtime overrides the
+    file's modification time used for "Date Updated".
+    """
+    table_name = os.path.splitext(os.path.basename(file_path))[0]
+
+    # Identify numeric columns
+    numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
+    if not numeric_cols:
+        return []
+
+    date_updated = datetime.fromtimestamp(
+        mtime if mtime is not None else os.path.getmtime(file_path)
+    ).strftime("%Y-%m-%d %H:%M:%S")
+
+    summarize = partial(
+        _summarize_columns,
+        table_name=table_name,
+        date_updated=date_updated,
+        sketch_error=sketch_error,
+        hll_precision=hll_precision,
+    )
+    return map_column_shards(summarize, df, numeric_cols, column_workers, column_executor)
+
+
+def summarize_file(
+    file_path: str,
+    column_workers: Optional[int] = None,
+    column_executor: str = "thread",
+    sketch_error: Optional[float] = None,
+    mtime: Optional[float] = None,
+    session: Optional[ProfileSession] = None,
+    hll_precision: Optional[int] = None,
+) -> list:
+    """
+    Read one table (through the session, if given) and summarize it. This is
+    the per-file unit of work for the process pool and the result cache.
+    Formats with a schema (Parquet, Arrow) only have their numeric columns read.
+    """
+    columns = numeric_columns(file_path)
+    if session is not None:
+        df = session.read(file_path, columns)
+    else:
+        df = read_table(file_path, columns)
+    return summarize_table(df, file_path, column_workers, column_executor, sketch_error, mtime, hll_precision)
+
+
+def calculate_summary_statistics(
+    raw_path: str = RAW_PATH,
+    session: Optional[ProfileSession] = None,
+    workers: Optional[int] = None,
+    column_workers: Optional[int] = None,
+    column_executor: str = "thread",
+    sketch_error: Optional[float] = None,
+    cache: Optional[ProfileCache] = None,
+    hll_precision: Optional[int] = None,
+) -> pd.DataFrame:
+    """
+    Summarize every numeric, non-ID column of every table in raw_path
+    (CSV, Parquet or Arrow IPC files).
+    workers > 1 summarizes that many files concurrently in a process pool
+    (0 means one per CPU); rows keep the sorted file order either way.
+    column_workers > 1 also splits the columns of each table across workers,
+    for very wide tables. sketch_error switches medians to KLL quantile
+    sketches with that rank error (see Scripts/sketches.py). With a
+    ProfileCache, unchanged files reuse the rows computed on an earlier run.
+    hll_precision (4-18) adds a HyperLogLog distinct-count estimate per
+    column, which also shortcuts the ID uniqueness check.
+    """
+    if session is None:
+        session = ProfileSession(raw_path, keep_frames=False)
+
+    file_paths = [str(p) for p in session.table_files()]
+
+    summarize = partial(
+        summarize_file,
+        column_workers=column_workers,
+        column_executor=column_executor,
+        sketch_error=sketch_error,
+        session=session if resolve_workers(workers) <= 1 else None,
+        hll_precision=hll_precision,
+    )
+    params = {"sketch_error": sketch_error, "hll_precision": hll_precision}
+    per_file = cached_map(summarize, file_paths, cache, CACHE_REPORT, params, workers)
 
-    for file_name in os.listdir(raw_path):
-        if not file_name.lower().endswith(".csv"):
-            continue
-
-        file_path = os.path.join(raw_path, file_name)
-        table_name = os.path.splitext(file_name)[0]
-
-        df = pd.read_csv(file_path, low_memory=False)
-
-        # Identify numeric columns
-        numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
-
-        # Exclude ID-like numeric columns
-        numeric_cols = [
-            col for col in numeric_cols
-            if not is_id_column(df[col], col)
-        ]
-
-        if not numeric_cols:
-            continue
-
-        date_updated = datetime.fromtimestamp(
-            os.path.getmtime(file_path)
-        ).strftime("%Y-%m-%d %H:%M:%S")
-
-        for col in numeric_cols:
-            col_data = df[col].dropna()
-
-            mean = round(col_data.mean(),1)
-            std = round(col_data.std(),1)
-            variation_coeff = round((std / mean)*100 if mean != 0 else np.nan,1)
-
-            results.append({
-                "Table Name": table_name,
-                "Numeric Column(s)": col,
-                "Minimum": col_data.min(),
-                "Maximum": col_data.max(),
-                "Median": col_data.median(),
-                "Average": mean,
-                "Standard Deviation": std,
-                "Variation Coefficient": variation_coeff,
-                "Date Updated": date_updated
-            })
-
+    results = [row for rows in per_file for row in rows]
     return pd.DataFrame(results)
 
 
-def main():
-    os.makedirs(PROCESSED_PATH, exist_ok=True)
-
-    summary_df = calculate_summary_statistics(RAW_PATH)
+def main(
+    raw_path=RAW_PATH,
+    processed_path=PROCESSED_PATH,
+    session=None,
+    workers=None,
+    column_workers=None,
+    sketch_error=None,
+    cache=None,
+    hll_precision=None,
+):
+    os.makedirs(processed_path, exist_ok=True)
+
+    summary_df = calculate_summary_statistics(
+        raw_path, session, workers, column_workers, sketch_error=sketch_error, cache=cache, hll_precision=hll_precision
+    )
 
-    output_path = os.path.join(PROCESSED_PATH, OUTPUT_FILE)
+    output_path = os.path.join(processed_path, OUTPUT_FILE)
     summary_df.to_csv(output_path, index=False)
 
     print(f"Summary statistics exported to: {output_path}")
+    return summary_df
 
 
 if __name__ == "__main__":
-    main()  # Run the summary statistics
-
-  # Automatically run tests after the main script
-    try:
-        import pytest
-        print("\nRunning tests...\n")
-        # Run all tests in the ./tests folder
-        pytest_args = ["--tb=short", "./tests/test_summary_statistics.py"]
-        pytest.main(pytest_args)
-    except ImportError:
-        print("pytest not installed. Skipping tests.")
+    start()
+    main()
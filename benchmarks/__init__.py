@@ -0,0 +1 @@
+"""Throughput and memory benchmarks of the EDA reports on synthetic data (see run.py)."""
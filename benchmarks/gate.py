@@ -0,0 +1,166 @@
+"""
+gate.py
+
+Performance regression gate: compare a benchmark run with a stored baseline.
+
+    python -m benchmarks.gate                      # run, compare, exit 1 on a regression
+    python -m benchmarks.gate --tolerance 0.5      # allow up to 50% slower
+    python -m benchmarks.gate --current bench.json # compare an existing run
+    python -m benchmarks.gate --update             # re-measure and store a new baseline
+
+The baseline (benchmarks/baseline.json by default) is a results file of
+benchmarks/run.py; the gate re-runs the same scenarios and reports at the
+same scales, seed and repeat count. A measurement regresses when it is
+more than tolerance (a fraction) above the baseline. The gated metrics are
+seconds and rss_increase_bytes, the memory a report needed beyond the
+imports; peak RSS itself is mostly the imports and would hide growth.
+
+The tolerance is relative only, so the baseline must be recorded at scales
+where every run takes at least half a second: shorter runs are dominated by
+scheduling noise. Timings are only comparable on the machine that produced
+the baseline: refresh it with --update when the benchmark host changes.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from benchmarks.run import run_benchmarks
+
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baseline.json"
+DEFAULT_TOLERANCE = 0.25
+
+_METRICS = ("seconds", "rss_increase_bytes")
+
+
+@dataclass(frozen=True)
+class Regression:
+    scenario: str
+    report: str
+    metric: str
+    baseline: float
+    current: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current / self.baseline if self.baseline else float("inf")
+
+    def __str__(self) -> str:
+        return (
+            f"{self.scenario}/{self.report}: {self.metric} {self.baseline:g} -> {self.current:g} "
+            f"(+{(self.ratio - 1) * 100:.0f}%)"
+        )
+
+
+def _index(results: Dict[str, Any]) -> Dict[Tuple[str, str], Dict[str, Any]]:
+    return {(r["scenario"], r["report"]): r for r in results["results"]}
+
+
+def compare(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    tolerance: float = DEFAULT_TOLERANCE,
+    memory_tolerance: Optional[float] = None,
+) -> Tuple[List[Regression], List[Tuple[str, str]]]:
+    """
+    Return (regressions, missing): the measurements of current that exceed
+    the baseline by more than the tolerance (memory_tolerance for the RSS
+    increase, tolerance if None), and the baseline measurements current lacks.
+    """
+    tolerances = {
+        "seconds": tolerance,
+        "rss_increase_bytes": tolerance if memory_tolerance is None else memory_tolerance,
+    }
+    measured = _index(current)
+    regressions, missing = [], []
+    for key, expected in _index(baseline).items():
+        actual = measured.get(key)
+        if actual is None:
+            missing.append(key)
+            continue
+        for metric in _METRICS:
+            before, after = expected.get(metric), actual.get(metric)
+            if before is None or after is None:
+                continue
+            if after > before * (1 + tolerances[metric]):
+                regressions.append(Regression(key[0], key[1], metric, before, after))
+    return regressions, missing
+
+
+def _rerun(baseline: Dict[str, Any], reports: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+    """Measure the baseline's scenarios and reports again with its settings."""
+    keys = list(_index(baseline))
+    scenarios = list(dict.fromkeys(s for s, _ in keys))
+    selected = list(dict.fromkeys(r for _, r in keys if reports is None or r in reports))
+    return run_benchmarks(
+        scenarios,
+        selected,
+        scale=baseline["scale"],
+        repeat=baseline.get("repeat", 1),
+        workers=baseline.get("workers"),
+        seed=baseline.get("seed", 0),
+        scenario_scales=baseline.get("scenario_scales"),
+    )
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.gate", description="Fail when the reports got slower or hungrier than the baseline."
+    )
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--current", type=Path, default=None, help="results to check (default: run the benchmarks)")
+    parser.add_argument(
+        "--tolerance", type=float, default=DEFAULT_TOLERANCE, help="allowed slowdown, as a fraction (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--memory-tolerance", type=float, default=None, help="allowed growth of the RSS increase (default: --tolerance)"
+    )
+    parser.add_argument("--reports", nargs="+", default=None, help="only gate these reports")
+    parser.add_argument("--update", action="store_true", help="store the new measurements as the baseline")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = _parser().parse_args(argv)
+    baseline = json.loads(args.baseline.read_text())
+
+    if args.current is not None:
+        current = json.loads(args.current.read_text())
+    else:
+        current = _rerun(baseline, args.reports)
+
+    if args.update:
+        # Keep the baseline records that were not measured again
+        remeasured = set(_index(current))
+        kept = [r for r in baseline["results"] if (r["scenario"], r["report"]) not in remeasured]
+        current = {**current, "results": kept + current["results"]}
+        args.baseline.write_text(json.dumps(current, indent=2) + "\n")
+        print(f"Baseline updated: {args.baseline}")
+        return 0
+
+    if args.reports is not None:
+        baseline = {**baseline, "results": [r for r in baseline["results"] if r["report"] in args.reports]}
+    regressions, missing = compare(baseline, current, args.tolerance, args.memory_tolerance)
+
+    for scenario, report in missing:
+        print(f"MISSING: no measurement of {scenario}/{report}", file=sys.stderr)
+    if regressions:
+        print("\n" + "=" * 72, file=sys.stderr)
+        print(f"PERFORMANCE REGRESSION against {args.baseline}", file=sys.stderr)
+        print("=" * 72, file=sys.stderr)
+        for regression in regressions:
+            print(f"  {regression}", file=sys.stderr)
+        print("=" * 72 + "\n", file=sys.stderr)
+    if regressions or missing:
+        return 1
+    print(f"No regressions against {args.baseline} (tolerance {args.tolerance:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,252 @@
+"""
+run.py
+
+Time each report on each synthetic scenario and record its peak memory.
+
+    python -m benchmarks.run --scale 0.001 --output bench.json
+    python -m benchmarks.run --scenarios tall wide --reports outliers --repeat 3
+    python -m benchmarks.run --scale 0.01 --scenario-scale wide=0.002
+
+Every measurement runs in a fresh interpreter, so peak RSS belongs to that
+report alone and nothing is warm from an earlier one. The child imports the
+reports first, then times run_reports(..., reports=[report]) on the
+scenario's raw directory (output included, as in production). Generated
+data is kept in --data-dir and reused while the scenario and scale match.
+--scenario-scale overrides --scale for one scenario, so each can be sized
+to run long enough to time reliably.
+
+Results are written as JSON: the run's settings and environment, then one
+record per (scenario, report) with seconds (fastest of --repeat runs),
+rows_per_second, import_rss_bytes (resident memory once the imports are
+done), peak_rss_bytes (peak resident memory while the report ran) and
+rss_increase_bytes, the difference: the memory the report itself needed
+(largest of the runs). On Linux the peak is reset after the imports, so it
+belongs to the report alone; elsewhere it is the process-wide peak, and a
+report that needs less than the imports shows no increase.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from benchmarks.synthetic import SCENARIOS, Scenario, generate
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+REPORTS = ("column_row_count", "outliers", "outliers_std", "summary_statistics")
+DEFAULT_SCALE = 0.001
+
+
+def _proc_status_bytes(field: str) -> Optional[int]:
+    """A memory field of /proc/self/status (Linux), in bytes; None elsewhere."""
+    try:
+        with open("/proc/self/status") as fh:
+            for line in fh:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+def _rusage_peak_bytes() -> Optional[int]:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return int(peak) if sys.platform == "darwin" else int(peak) * 1024
+
+
+def _reset_peak_rss() -> None:
+    """Restart the peak RSS from the current RSS (Linux only; a no-op elsewhere)."""
+    try:
+        with open("/proc/self/clear_refs", "w") as fh:
+            fh.write("5")
+    except OSError:
+        pass
+
+
+def _current_rss_bytes() -> Optional[int]:
+    current = _proc_status_bytes("VmRSS")
+    return current if current is not None else _rusage_peak_bytes()
+
+
+def _peak_rss_bytes() -> Optional[int]:
+    peak = _proc_status_bytes("VmHWM")
+    return peak if peak is not None else _rusage_peak_bytes()
+
+
+def measure(raw_dir: str, processed_dir: str, report: str, workers: Optional[int] = None) -> Dict[str, Any]:
+    """Run one report in this process; returns its wall time and memory use."""
+    from Scripts import column_row_count, outliers, outliers_STD, summary_statistics  # noqa: F401  (run_reports imports them)
+    from Scripts.profiling import ProfileSession, run_reports
+
+    import_rss = _current_rss_bytes()
+    _reset_peak_rss()
+    started = time.perf_counter()
+    run_reports(ProfileSession(raw_dir), processed_dir, reports=[report], workers=workers)
+    seconds = time.perf_counter() - started
+    peak = _peak_rss_bytes()
+    increase = max(0, peak - import_rss) if peak is not None and import_rss is not None else None
+    return {"seconds": seconds, "peak_rss_bytes": peak, "import_rss_bytes": import_rss, "rss_increase_bytes": increase}
+
+
+def _measure_in_child(raw_dir: Path, report: str, workers: Optional[int]) -> Dict[str, Any]:
+    with tempfile.TemporaryDirectory() as processed_dir:
+        code = (
+            "import json, sys; from benchmarks.run import measure; "
+            "print(json.dumps(measure(*sys.argv[1:4], workers=json.loads(sys.argv[4]))))"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code, str(raw_dir), processed_dir, report, json.dumps(workers)],
+            cwd=REPO_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def prepare(scenario: Scenario, data_dir: Path, seed: int = 0) -> Path:
+    """Generate the scenario under data_dir unless an identical copy is already there."""
+    raw_dir = data_dir / f"{scenario.name}-{scenario.files}x{scenario.rows}x{scenario.columns}-seed{seed}"
+    marker = raw_dir / ".complete"
+    if not marker.exists():
+        for stale in raw_dir.glob("*.csv"):
+            stale.unlink()
+        generate(scenario, raw_dir, seed)
+        marker.touch()
+    return raw_dir
+
+
+def run_benchmarks(
+    scenarios: Sequence[str],
+    reports: Sequence[str] = REPORTS,
+    scale: float = DEFAULT_SCALE,
+    repeat: int = 1,
+    data_dir: Optional[Path] = None,
+    workers: Optional[int] = None,
+    seed: int = 0,
+    scenario_scales: Optional[Mapping[str, float]] = None,
+) -> Dict[str, Any]:
+    """
+    Measure every (scenario, report) pair; returns the JSON-ready results.
+    scenario_scales maps scenario names to a scale used instead of scale.
+    """
+    data_dir = Path(data_dir) if data_dir is not None else Path(tempfile.gettempdir()) / "eda-benchmarks"
+    scenario_scales = dict(scenario_scales or {})
+    results: List[Dict[str, Any]] = []
+    for name in scenarios:
+        scenario_scale = scenario_scales.get(name, scale)
+        scenario = SCENARIOS[name].scaled(scenario_scale)
+        raw_dir = prepare(scenario, data_dir, seed)
+        rows = scenario.files * scenario.rows
+        for report in reports:
+            runs = [_measure_in_child(raw_dir, report, workers) for _ in range(repeat)]
+            seconds = min(run["seconds"] for run in runs)
+            peaks = [run["peak_rss_bytes"] for run in runs if run["peak_rss_bytes"] is not None]
+            increases = [run["rss_increase_bytes"] for run in runs if run["rss_increase_bytes"] is not None]
+            results.append(
+                {
+                    "scenario": name,
+                    "report": report,
+                    "scale": scenario_scale,
+                    "files": scenario.files,
+                    "rows": scenario.rows,
+                    "columns": scenario.columns,
+                    "bytes": sum(p.stat().st_size for p in raw_dir.glob("*.csv")),
+                    "seconds": round(seconds, 4),
+                    "rows_per_second": round(rows / seconds) if seconds > 0 else None,
+                    "peak_rss_bytes": max(peaks) if peaks else None,
+                    "import_rss_bytes": runs[0]["import_rss_bytes"],
+                    "rss_increase_bytes": max(increases) if increases else None,
+                }
+            )
+            print(f"{name:>12} {report:<20} {seconds:9.3f}s", file=sys.stderr)
+
+    import numpy
+    import pandas
+
+    return {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "scale": scale,
+        "scenario_scales": scenario_scales,
+        "repeat": repeat,
+        "workers": workers,
+        "seed": seed,
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "pandas": pandas.__version__,
+            "numpy": numpy.__version__,
+        },
+        "results": results,
+    }
+
+
+def _scenario_scale(text: str) -> Tuple[str, float]:
+    name, sep, value = text.partition("=")
+    if not sep or name not in SCENARIOS:
+        raise argparse.ArgumentTypeError(f"expected SCENARIO=SCALE with SCENARIO one of {sorted(SCENARIOS)}, got {text!r}")
+    try:
+        return name, float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid scale in {text!r}") from None
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.run", description="Time the EDA reports on synthetic data."
+    )
+    parser.add_argument("--scenarios", nargs="+", choices=sorted(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--reports", nargs="+", choices=REPORTS, default=list(REPORTS))
+    parser.add_argument("--scale", type=float, default=DEFAULT_SCALE, help="1.0 is full size (default: %(default)s)")
+    parser.add_argument(
+        "--scenario-scale",
+        type=_scenario_scale,
+        action="append",
+        default=[],
+        metavar="SCENARIO=SCALE",
+        help="scale of one scenario instead of --scale (repeatable)",
+    )
+    parser.add_argument("--repeat", type=int, default=1, help="runs per measurement; the fastest is kept")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--data-dir", type=Path, default=None, help="where generated data is kept and reused")
+    parser.add_argument("--output", type=Path, default=None, help="JSON file for the results (default: stdout)")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = _parser().parse_args(argv)
+    results = run_benchmarks(
+        args.scenarios,
+        args.reports,
+        args.scale,
+        args.repeat,
+        args.data_dir,
+        args.workers,
+        args.seed,
+        scenario_scales=dict(args.scenario_scale),
+    )
+    text = json.dumps(results, indent=2)
+    if args.output is None:
+        print(text)
+    else:
+        args.output.write_text(text + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
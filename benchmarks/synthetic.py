@@ -0,0 +1,126 @@
+"""
+synthetic.py
+
+Synthetic raw directories for the benchmarks, at a configurable scale.
+
+Each Scenario describes one production-like workload at full size; scaled()
+shrinks its dominant dimension (rows, columns or number of files) so the
+same scenario can run in seconds on a laptop or at full size on a
+benchmark machine:
+
+    scenario = SCENARIOS["tall"].scaled(0.001)   # 100k rows instead of 100M
+    generate(scenario, "./bench-data/tall")
+
+Tables are written as CSV in blocks of BLOCK_ROWS rows, so generating a
+large table needs little memory. The data is deterministic for a given
+scenario, scale and seed.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Dict, List, Union
+
+import numpy as np
+import pandas as pd
+
+PathLike = Union[str, Path]
+
+# Rows generated and written at a time
+BLOCK_ROWS = 500_000
+# Column kinds, cycled through to build a table of any width
+COLUMN_KINDS = ("amount", "quantity", "category", "label", "price", "score")
+_CATEGORIES = np.array([f"group {i}" for i in range(20)])
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """One benchmark workload: files x rows x columns, plus data properties."""
+
+    name: str
+    description: str
+    files: int
+    rows: int
+    columns: int
+    # Dimension shrunk by scaled(): "rows", "columns" or "files"
+    scales: str = "rows"
+    null_ratio: float = 0.0
+    duplicate_ratio: float = 0.0
+    skewed: bool = False
+
+    def scaled(self, scale: float) -> "Scenario":
+        """The same scenario with its dominant dimension multiplied by scale."""
+        size = max(1, int(round(getattr(self, self.scales) * scale)))
+        return replace(self, **{self.scales: size})
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    s.name: s
+    for s in [
+        Scenario("tall", "one very long table", files=1, rows=100_000_000, columns=8),
+        # Scales rows, so the table stays wide at every scale
+        Scenario("wide", "one table with thousands of columns", files=1, rows=1_000_000, columns=10_000),
+        Scenario("many_small", "thousands of small tables", files=10_000, rows=100, columns=6, scales="files"),
+        Scenario("skewed", "heavy-tailed numeric distributions", files=1, rows=10_000_000, columns=8, skewed=True),
+        Scenario("duplicates", "half of the rows repeat other rows", files=1, rows=10_000_000, columns=8,
+                 duplicate_ratio=0.5),
+        Scenario("nulls", "most values missing", files=1, rows=10_000_000, columns=8, null_ratio=0.6),
+    ]
+}
+
+
+def _column(kind: str, rng: np.random.Generator, rows: int, skewed: bool) -> np.ndarray:
+    if kind == "amount":
+        return rng.lognormal(3.0, 1.5, rows).round(2) if skewed else rng.normal(100.0, 15.0, rows).round(2)
+    if kind == "quantity":
+        return rng.zipf(1.8, rows) if skewed else rng.integers(0, 100, rows)
+    if kind == "category":
+        return _CATEGORIES[rng.integers(0, _CATEGORIES.size, rows)]
+    if kind == "label":
+        return np.char.add("item ", rng.integers(0, rows * 10 + 1, rows).astype(str))
+    if kind == "price":
+        # Text with thousands separators, as exported by spreadsheets
+        values = (rng.pareto(1.5, rows) * 1000 if skewed else rng.uniform(0, 5000, rows)).astype(np.int64)
+        return np.array([f"{v:,}" for v in values.tolist()], dtype=object)
+    if kind == "score":
+        return rng.standard_t(2, rows) if skewed else rng.random(rows)
+    raise ValueError(f"Unknown column kind {kind!r}")
+
+
+def _block(scenario: Scenario, rng: np.random.Generator, first_row: int, rows: int) -> pd.DataFrame:
+    data = {"row_id": np.arange(first_row, first_row + rows)}
+    for i in range(scenario.columns - 1):
+        kind = COLUMN_KINDS[i % len(COLUMN_KINDS)]
+        data[f"{kind}_{i}"] = _column(kind, rng, rows, scenario.skewed)
+    df = pd.DataFrame(data)
+
+    if scenario.duplicate_ratio and rows > 1:
+        # Overwrite a share of the rows with copies of the others (row_id included)
+        n = min(int(rows * scenario.duplicate_ratio), rows - 1)
+        order = rng.permutation(rows)
+        originals, targets = order[: rows - n], order[rows - n :]
+        df.iloc[targets] = df.iloc[rng.choice(originals, size=n)].to_numpy()
+    if scenario.null_ratio:
+        values = df.columns[1:]
+        mask = rng.random((rows, len(values))) < scenario.null_ratio
+        df[values] = df[values].mask(mask)
+    return df
+
+
+def generate(scenario: Scenario, out_dir: PathLike, seed: int = 0) -> List[Path]:
+    """Write the scenario's tables into out_dir (created if needed); returns their paths."""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    digits = len(str(scenario.files))
+
+    paths = []
+    for f in range(scenario.files):
+        path = out_dir / f"{scenario.name}_{f:0{digits}d}.csv"
+        for first_row in range(0, scenario.rows, BLOCK_ROWS):
+            rows = min(BLOCK_ROWS, scenario.rows - first_row)
+            block = _block(scenario, rng, first_row, rows)
+            block.to_csv(path, mode="a" if first_row else "w", header=not first_row, index=False)
+        paths.append(path)
+    return paths
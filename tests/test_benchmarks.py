@@ -0,0 +1,92 @@
+import json
+
+import pandas as pd
+
+from benchmarks.gate import DEFAULT_BASELINE, compare
+from benchmarks.gate import main as gate
+from benchmarks.run import main
+from benchmarks.synthetic import SCENARIOS, generate
+
+
+def test_scaling_shrinks_the_dominant_dimension():
+    assert SCENARIOS["tall"].scaled(0.001).rows == 100_000
+    assert SCENARIOS["wide"].scaled(0.001).rows == 1_000
+    assert SCENARIOS["wide"].scaled(0.001).columns == 10_000
+    assert SCENARIOS["many_small"].scaled(0.001).files == 10
+    assert SCENARIOS["many_small"].scaled(0.001).rows == 100
+
+
+def test_generated_data_has_the_scenario_properties(tmp_path):
+    dup = pd.read_csv(generate(SCENARIOS["duplicates"].scaled(0.0001), tmp_path / "d")[0])
+    nulls = pd.read_csv(generate(SCENARIOS["nulls"].scaled(0.0001), tmp_path / "n")[0])
+    small = generate(SCENARIOS["many_small"].scaled(0.0003), tmp_path / "m")
+
+    assert dup.shape == (1000, 8)
+    assert dup.duplicated().sum() == 500
+    assert 0.5 < nulls.drop(columns="row_id").isna().mean().mean() < 0.7
+    assert len(small) == 3
+
+
+def test_run_writes_machine_readable_results(tmp_path):
+    output = tmp_path / "bench.json"
+    main(
+        [
+            "--scenarios", "many_small",
+            "--reports", "summary_statistics",
+            "--scale", "0.0002",
+            "--data-dir", str(tmp_path / "data"),
+            "--output", str(output),
+        ]
+    )
+
+    results = json.loads(output.read_text())
+    (record,) = results["results"]
+    assert (record["scenario"], record["report"], record["files"]) == ("many_small", "summary_statistics", 2)
+    assert record["seconds"] > 0
+    assert record["rss_increase_bytes"] >= 0
+    assert results["environment"]["pandas"] == pd.__version__
+
+
+def _results(*records):
+    return {"results": [dict(zip(("scenario", "report", "seconds", "rss_increase_bytes"), r)) for r in records]}
+
+
+def test_gate_flags_only_regressions_beyond_tolerance():
+    baseline = _results(
+        ("tall", "outliers_std", 1.0, 200_000_000),
+        ("tall", "summary_statistics", 0.5, 4_000_000),
+        ("wide", "outliers_std", 1.0, 100_000_000),
+    )
+    current = _results(
+        ("tall", "outliers_std", 2.0, 210_000_000),  # twice as slow
+        ("tall", "summary_statistics", 0.6, 10_000_000),  # within 25%, but 2.5x the memory
+    )
+
+    regressions, missing = compare(baseline, current, tolerance=0.25)
+
+    assert [(r.report, r.metric) for r in regressions] == [
+        ("outliers_std", "seconds"),
+        ("summary_statistics", "rss_increase_bytes"),
+    ]
+    assert regressions[0].ratio == 2.0
+    assert missing == [("wide", "outliers_std")]
+    assert compare(baseline, current, tolerance=1.5)[0] == []
+
+
+def test_baseline_runs_are_long_enough_to_gate_on_time():
+    baseline = json.loads(DEFAULT_BASELINE.read_text())
+
+    assert len(baseline["results"]) == len(SCENARIOS) * 4
+    assert min(r["seconds"] for r in baseline["results"]) >= 0.5
+    assert all(r["rss_increase_bytes"] > 0 for r in baseline["results"])
+
+
+def test_gate_exits_non_zero_on_a_regression(tmp_path, capsys):
+    baseline, current = tmp_path / "baseline.json", tmp_path / "current.json"
+    baseline.write_text(json.dumps(_results(("tall", "summary_statistics", 1.0, 100_000_000))))
+    current.write_text(json.dumps(_results(("tall", "summary_statistics", 1.1, 400_000_000))))
+    args = ["--baseline", str(baseline), "--current", str(current)]
+
+    assert gate(args) == 1
+    assert "PERFORMANCE REGRESSION" in capsys.readouterr().err
+    assert gate(args + ["--memory-tolerance", "4"]) == 0
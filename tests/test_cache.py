@@ -0,0 +1,136 @@
+import os
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from Scripts.cache import ProfileCache, cached_map
+from Scripts.column_row_count import analyze_tables
+from Scripts.outliers import main as outliers_main
+from Scripts.outliers_STD import analyze_tables as analyze_std_tables
+from Scripts.summary_statistics import calculate_summary_statistics
+
+
+def _write_table(path: Path, values) -> None:
+    pd.DataFrame({"k": range(len(values)), "value": values}).to_csv(path, index=False)
+
+
+def _fail_read_csv(*args, **kwargs):
+    raise AssertionError("unchanged file was re-read")
+
+
+def test_get_put_and_key_change(tmp_path: Path):
+    raw = tmp_path / "t.csv"
+    _write_table(raw, [1, 2, 3])
+    cache = ProfileCache(tmp_path / "cache")
+
+    key = cache.key_for(raw)
+    assert cache.get("report", key) is None
+    cache.put("report", key, {"rows": 3})
+    assert cache.get("report", key) == {"rows": 3}
+    assert cache.get("report", key, {"option": 1}) is None
+
+    _write_table(raw, [1, 2, 3, 4])
+    os.utime(raw, ns=(key.mtime_ns + 10**9, key.mtime_ns + 10**9))
+    assert cache.get("report", cache.key_for(raw)) is None
+
+
+def test_content_hash_and_invalidate(tmp_path: Path):
+    raw = tmp_path / "t.csv"
+    _write_table(raw, [1, 2, 3])
+    cache = ProfileCache(tmp_path / "cache", hash_content=True)
+
+    key = cache.key_for(raw)
+    assert key.content_hash is not None
+    cache.put("report", key, "value")
+    cache.invalidate(raw)
+    assert cache.get("report", key) is None
+
+
+def test_lru_eviction_keeps_cache_under_budget(tmp_path: Path):
+    cache = ProfileCache(tmp_path / "cache", max_bytes=3000)
+    for i in range(5):
+        raw = tmp_path / f"t{i}.csv"
+        _write_table(raw, [i])
+        cache.put("report", cache.key_for(raw), "x" * 1000)
+
+    assert cache.size_bytes() <= 3000
+    assert cache.get("report", cache.key_for(tmp_path / "t4.csv")) == "x" * 1000
+    assert cache.get("report", cache.key_for(tmp_path / "t0.csv")) is None
+
+
+def test_writes_do_not_rescan_the_cache(tmp_path: Path, monkeypatch):
+    # Room for two entries
+    cache = ProfileCache(tmp_path / "cache", max_bytes=2100)
+    keys = []
+    for i in range(3):
+        raw = tmp_path / f"t{i}.csv"
+        _write_table(raw, [i])
+        keys.append(cache.key_for(raw))
+    cache.put("report", keys[0], "x" * 1000)
+
+    listings = []
+    real_glob = Path.glob
+    monkeypatch.setattr(Path, "glob", lambda self, pattern: listings.append(pattern) or real_glob(self, pattern))
+    cache.put("report", keys[1], "x" * 1000)
+    assert cache.get("report", keys[0]) == "x" * 1000  # now the most recently used
+    cache.put("report", keys[2], "x" * 1000)
+    assert "*/*.pkl" not in listings
+
+    assert cache.get("report", keys[1]) is None
+    assert cache.get("report", keys[0]) == "x" * 1000
+    # A new instance lists the directory once and agrees on the size
+    assert ProfileCache(tmp_path / "cache").size_bytes() == cache.size_bytes() <= 2100
+
+
+def test_cached_map_takes_mtime_from_key(tmp_path: Path):
+    raw = tmp_path / "t.csv"
+    _write_table(raw, [1])
+    cache = ProfileCache(tmp_path / "cache")
+
+    seen = []
+    result = cached_map(lambda path, mtime: seen.append(mtime) or mtime, [raw], cache, "report")
+
+    assert result == [cache.key_for(raw).mtime]
+    assert seen == result
+
+
+def test_reports_skip_unchanged_files(tmp_path: Path, monkeypatch):
+    raw_dir = tmp_path / "raw"
+    raw_dir.mkdir()
+    _write_table(raw_dir / "a.csv", [10, 11, 9, 10, 100])
+    _write_table(raw_dir / "b.csv", [1, 1, 2, 2, 3])
+    cache = ProfileCache(tmp_path / "cache")
+
+    first = (
+        analyze_tables(raw_path=str(raw_dir), processed_path=str(tmp_path / "out"), cache=cache),
+        calculate_summary_statistics(str(raw_dir), cache=cache),
+        analyze_std_tables(raw_dir=raw_dir, processed_dir=tmp_path / "out", cache=cache),
+        outliers_main(raw_path=str(raw_dir), processed_path=str(tmp_path / "out"), cache=cache),
+    )
+
+    monkeypatch.setattr(pd, "read_csv", _fail_read_csv)
+    second = (
+        analyze_tables(raw_path=str(raw_dir), processed_path=str(tmp_path / "out"), cache=cache),
+        calculate_summary_statistics(str(raw_dir), cache=cache),
+        analyze_std_tables(raw_dir=raw_dir, processed_dir=tmp_path / "out", cache=cache),
+        outliers_main(raw_path=str(raw_dir), processed_path=str(tmp_path / "out"), cache=cache),
+    )
+
+    for before, after in zip(first, second):
+        pd.testing.assert_frame_equal(after, before)
+
+    with pytest.raises(AssertionError):
+        cache.invalidate(raw_dir / "a.csv")
+        analyze_tables(raw_path=str(raw_dir), processed_path=str(tmp_path / "out"), cache=cache)
+
+
+def test_states_of_an_older_cache_format_are_ignored(tmp_path, monkeypatch):
+    table = tmp_path / "t.csv"
+    _write_table(table, [1, 2])
+    cache = ProfileCache(tmp_path / "cache")
+    cache.save_state("report", table, {"resume": "here"})
+    assert cache.load_state("report", table) == {"resume": "here"}
+
+    monkeypatch.setattr("Scripts.cache.CACHE_FORMAT", 99)
+    assert cache.load_state("report", table) is None
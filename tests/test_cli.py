@@ -0,0 +1,58 @@
+import pandas as pd
+import pytest
+
+from Scripts import profiling
+from Scripts.__main__ import main
+
+OUTPUTS = {
+    "column_row_count": "Column-RowCount-duplicate.csv",
+    "outliers": "Outliers.csv",
+    "outliers_std": "Outliers_STD.csv",
+    "summary_statistics": "Summary_Statistics.csv",
+}
+
+
+def _raw(tmp_path):
+    raw_dir = tmp_path / "raw"
+    raw_dir.mkdir()
+    pd.DataFrame({"a": [1, 2, 3, 4, 99], "b": [1.5, 2.5, 2.0, 1.0, 3.0]}).to_csv(raw_dir / "t1.csv", index=False)
+    pd.DataFrame({"a": [5, 6, 7, 5, 6], "b": [0.5, 0.6, 0.7, 0.5, 9.9]}).to_csv(raw_dir / "t2.csv", index=False)
+    return raw_dir
+
+
+def _written(processed_dir):
+    return {name for name, output in OUTPUTS.items() if (processed_dir / output).exists()}
+
+
+def test_selected_reports_share_one_parse(tmp_path, monkeypatch):
+    raw_dir = _raw(tmp_path)
+    reads = []
+    real = profiling.read_table
+    monkeypatch.setattr(profiling, "read_table", lambda path, *args: reads.append(path) or real(path, *args))
+
+    out = tmp_path / "out"
+    assert main(["run", "--raw", str(raw_dir), "--processed", str(out), "--reports", "outliers", "summary_statistics"]) == 0
+
+    assert _written(out) == {"outliers", "summary_statistics"}
+    assert sorted(p.name for p in reads) == ["t1.csv", "t2.csv"]
+
+
+def test_default_runs_every_report(tmp_path):
+    out = tmp_path / "out"
+    main(["--raw", str(_raw(tmp_path)), "--processed", str(out)])
+    assert _written(out) == set(OUTPUTS)
+
+
+def test_report_subcommand_and_options_after_it(tmp_path):
+    out = tmp_path / "out"
+    main(["outliers_std", "--raw", str(_raw(tmp_path)), "--processed", str(out), "--narrow-dtypes"])
+    assert _written(out) == {"outliers_std"}
+
+
+def test_list_and_unknown_report(tmp_path, capsys):
+    raw_dir = _raw(tmp_path)
+    main(["--raw", str(raw_dir), "list"])
+    assert [line.rsplit("/", 1)[-1] for line in capsys.readouterr().out.split()] == ["t1.csv", "t2.csv"]
+
+    with pytest.raises(SystemExit):
+        main(["run", "--reports", "histograms"])
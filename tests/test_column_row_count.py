@@ -11,7 +11,7 @@ from datetime import datetime
 import pandas as pd
 import pytest
 
-from Scripts.column_row_count import analyze_tables
+from Scripts.column_row_count import _detect_unique_columns, analyze_tables
 
 
 def test_analyze_tables_counts_and_duplicates(tmp_path):
@@ -76,3 +76,256 @@ def test_analyze_tables_missing_raw_path(tmp_path):
     missing = tmp_path / "does_not_exist"
     with pytest.raises(FileNotFoundError):
         analyze_tables(raw_path=str(missing), processed_path=str(tmp_path))
+
+
+def test_streaming_mode_matches_in_memory_output(tmp_path):
+    raw_dir = tmp_path / "data" / "raw"
+    raw_dir.mkdir(parents=True)
+
+    # Duplicates and repeated key values straddle the chunk boundaries
+    pd.DataFrame(
+        {"id": [1, 2, 3, 1, 4, 2, 5], "value": ["a", "b", None, "a", "c", "b", "d"]}
+    ).to_csv(raw_dir / "table_one.csv", index=False)
+    pd.DataFrame(
+        {"pk": [10, 11, 12, 13, 14], "x": [5, 6, 7, 8, 5]}
+    ).to_csv(raw_dir / "table_two.csv", index=False)
+
+    in_memory_dir = tmp_path / "in_memory"
+    streaming_dir = tmp_path / "streaming"
+    analyze_tables(raw_path=str(raw_dir), processed_path=str(in_memory_dir))
+    result_df = analyze_tables(raw_path=str(raw_dir), processed_path=str(streaming_dir), chunksize=2)
+
+    out_name = "Column-RowCount-duplicate.csv"
+    assert (streaming_dir / out_name).read_bytes() == (in_memory_dir / out_name).read_bytes()
+
+    row1 = result_df[result_df["Table Name"] == "table_one"].iloc[0]
+    assert row1["Duplicate rows count"] == 2
+    assert row1["Null count"] == 1
+    assert row1["Unique Column(s)"] == "None"
+
+    row2 = result_df[result_df["Table Name"] == "table_two"].iloc[0]
+    assert row2["Unique Column(s)"] == "pk"
+
+
+def test_streaming_mode_compares_values_as_pandas_parses_them(tmp_path):
+    raw_dir = tmp_path / "raw"
+    raw_dir.mkdir()
+    # Numbers spelled differently are equal; so are boolean spellings
+    (raw_dir / "numbers.csv").write_text(
+        "a,b,c,flag\n1,x,5,True\n1.0,x,5.0,true\n2.5,y,2.5,False\n2.50,y,2.50,FALSE\n3,z,7,True\n4,z,8,\n"
+    )
+    # A column only found to be text in its last chunk compares as written
+    (raw_dir / "late_text.csv").write_text("k,v\n1,a\n1.0,a\n2,b\n2,b\n3,c\nthree,d\n")
+
+    expected = analyze_tables(raw_path=str(raw_dir), processed_path=str(tmp_path / "in_memory"))
+    assert expected["Duplicate rows count"].tolist() == [1, 2]
+    assert expected["Unique Column(s)"].tolist() == ["None", "None"]
+
+    for workers in (None, 2):
+        streamed = analyze_tables(
+            raw_path=str(raw_dir), processed_path=str(tmp_path / "streaming"), chunksize=2, workers=workers
+        )
+        pd.testing.assert_frame_equal(streamed, expected)
+
+
+def test_streaming_mode_with_memory_budget(tmp_path):
+    raw_dir = tmp_path / "raw"
+    raw_dir.mkdir()
+    pd.DataFrame({"a": [1, 1, 2], "b": ["x", "x", "y"]}).to_csv(raw_dir / "t.csv", index=False)
+
+    result_df = analyze_tables(raw_path=str(raw_dir), processed_path=str(tmp_path / "out"), memory_budget=1)
+
+    row = result_df.iloc[0]
+    assert row["Row count"] == 3
+    assert row["Duplicate rows count"] == 1
+    assert row["Unique Column(s)"] == "None"
+
+
+def test_128_bit_fingerprints_match_default(tmp_path):
+    raw_dir = tmp_path / "raw"
+    raw_dir.mkdir()
+    pd.DataFrame({"a": [1, 1, 2, 3], "b": ["x", "x", "y", None]}).to_csv(raw_dir / "t.csv", index=False)
+
+    default = analyze_tables(raw_path=str(raw_dir), processed_path=str(tmp_path / "a"))
+    wide = analyze_tables(raw_path=str(raw_dir), processed_path=str(tmp_path / "b"), fingerprint_bits=128)
+    streamed = analyze_tables(
+        raw_path=str(raw_dir), processed_path=str(tmp_path / "c"), chunksize=1, fingerprint_bits=128
+    )
+
+    pd.testing.assert_frame_equal(default, wide)
+    pd.testing.assert_frame_equal(default, streamed)
+    assert default.iloc[0]["Duplicate rows count"] == 1
+
+
+def test_parallel_mode_matches_sequential(tmp_path):
+    raw_dir = tmp_path / "raw"
+    raw_dir.mkdir()
+    for i in range(4):
+        pd.DataFrame({"k": [i, i + 1, i + 1], "v": ["a", "b", "b"]}).to_csv(raw_dir / f"t{i}.csv", index=False)
+
+    sequential = analyze_tables(raw_path=str(raw_dir), processed_path=str(tmp_path / "seq"))
+    parallel = analyze_tables(raw_path=str(raw_dir), processed_path=str(tmp_path / "par"), workers=2)
+
+    pd.testing.assert_frame_equal(parallel, sequential)
+    assert parallel["Table Name"].tolist() == ["t0", "t1", "t2", "t3"]
+
+
+def test_streaming_byte_range_workers_match_sequential(tmp_path):
+    raw_dir = tmp_path / "raw"
+    raw_dir.mkdir()
+    # Duplicate rows and repeated ids land in different byte ranges
+    pd.DataFrame(
+        {
+            "id": list(range(40)) + [3, 17, 31],
+            "note": ["line\nbreak" if i % 5 == 0 else f"n{i}" for i in range(40)] + ["n3", None, "x"],
+        }
+    ).to_csv(raw_dir / "t.csv", index=False)
+
+    sequential = analyze_tables(raw_path=str(raw_dir), processed_path=str(tmp_path / "seq"), chunksize=4)
+    ranged = analyze_tables(raw_path=str(raw_dir), processed_path=str(tmp_path / "par"), chunksize=4, workers=3)
+
+    pd.testing.assert_frame_equal(ranged, sequential)
+    row = ranged.iloc[0]
+    assert row["Row count"] == 43
+    assert row["Duplicate rows count"] == 1
+    assert row["Unique Column(s)"] == "None"
+
+
+def test_incremental_mode_only_processes_appended_rows(tmp_path, monkeypatch):
+    from Scripts.cache import ProfileCache
+    from Scripts.column_row_count import StreamState
+
+    raw_dir = tmp_path / "raw"
+    raw_dir.mkdir()
+    log = raw_dir / "log.csv"
+    pd.DataFrame({"seq": [1, 2, 3], "event": ["a", "b", "a"]}).to_csv(log, index=False)
+    cache = ProfileCache(tmp_path / "cache")
+
+    processed = []
+    real_update = StreamState.update
+
+    def counting_update(self, chunk):
+        processed.append(len(chunk))
+        real_update(self, chunk)
+
+    monkeypatch.setattr(StreamState, "update", counting_update)
+
+    analyze_tables(raw_path=str(raw_dir), processed_path=str(tmp_path / "out"), cache=cache, incremental=True)
+    assert sum(processed) == 3
+
+    # Append a duplicate of row 1 and a new row
+    with open(log, "a") as fh:
+        fh.write("1,a\n4,c\n")
+    processed.clear()
+
+    result = analyze_tables(raw_path=str(raw_dir), processed_path=str(tmp_path / "out"), cache=cache, incremental=True)
+    assert sum(processed) == 2
+
+    expected = analyze_tables(raw_path=str(raw_dir), processed_path=str(tmp_path / "full"))
+    pd.testing.assert_frame_equal(result, expected)
+    assert result.iloc[0]["Row count"] == 5
+    assert result.iloc[0]["Duplicate rows count"] == 1
+    assert result.iloc[0]["Unique Column(s)"] == "None"
+
+
+def test_incremental_mode_restarts_when_file_is_rewritten(tmp_path):
+    from Scripts.cache import ProfileCache
+
+    raw_dir = tmp_path / "raw"
+    raw_dir.mkdir()
+    table = raw_dir / "t.csv"
+    pd.DataFrame({"k": [1, 2, 3]}).to_csv(table, index=False)
+    cache = ProfileCache(tmp_path / "cache")
+    analyze_tables(raw_path=str(raw_dir), processed_path=str(tmp_path / "out"), cache=cache, incremental=True)
+
+    pd.DataFrame({"k": [9, 9, 8, 7]}).to_csv(table, index=False)
+    result = analyze_tables(raw_path=str(raw_dir), processed_path=str(tmp_path / "out"), cache=cache, incremental=True)
+
+    assert result.iloc[0]["Row count"] == 4
+    assert result.iloc[0]["Unique Column(s)"] == "None"
+
+
+def test_cache_keeps_streaming_and_in_memory_results_apart(tmp_path, monkeypatch):
+    import Scripts.column_row_count as crc
+    from Scripts.cache import ProfileCache
+
+    raw_dir = tmp_path / "raw"
+    raw_dir.mkdir()
+    pd.DataFrame({"k": [1, 2, 2]}).to_csv(raw_dir / "t.csv", index=False)
+    cache = ProfileCache(tmp_path / "cache")
+
+    in_memory_runs = []
+    real_duplicate_mask = crc.duplicate_mask
+
+    def counting_duplicate_mask(*args, **kwargs):
+        in_memory_runs.append(1)
+        return real_duplicate_mask(*args, **kwargs)
+
+    monkeypatch.setattr(crc, "duplicate_mask", counting_duplicate_mask)
+
+    analyze_tables(raw_path=str(raw_dir), processed_path=str(tmp_path / "out"), cache=cache, chunksize=2)
+    assert in_memory_runs == []
+    analyze_tables(raw_path=str(raw_dir), processed_path=str(tmp_path / "out"), cache=cache)
+    assert in_memory_runs == [1]
+
+
+def test_incremental_mode_requires_cache(tmp_path):
+    with pytest.raises(ValueError):
+        analyze_tables(raw_path=str(tmp_path), processed_path=str(tmp_path / "out"), incremental=True)
+
+
+def test_detect_unique_columns_uses_cardinality_bounds():
+    df = pd.DataFrame(
+        {
+            "flag": [True, False, True],
+            "narrow": [1, 2, 2],
+            "text": ["a", "b", "c"],
+            "id": [10, 20, 30],
+            "cat": pd.Categorical(["x", "y", "z"]),
+            "with_null": [1.0, None, 2.0],
+        }
+    )
+    assert _detect_unique_columns(df) == ["text", "id", "cat"]
+
+
+def test_signed_zeros_are_not_a_unique_key():
+    df = pd.DataFrame({"zero": [0.0, -0.0, 1.5], "other": [0.0, 1.0, 2.0], "pair": [1, 1, 2]})
+
+    assert df["zero"].nunique() == 2
+    assert _detect_unique_columns(df) == ["other"]
+    # (zero, pair) repeats (0.0, 1) as well
+    assert _detect_unique_columns(df, max_key_width=2) == ["other"]
+
+
+def test_composite_keys_are_reported(tmp_path):
+    raw_dir = tmp_path / "raw"
+    raw_dir.mkdir()
+    pd.DataFrame(
+        {
+            "order": [1, 1, 2, 2, 3],
+            "line": [1, 2, 1, 2, 1],
+            "sku": ["a", "b", "a", "c", "b"],
+            "const": ["x"] * 5,
+        }
+    ).to_csv(raw_dir / "lines.csv", index=False)
+
+    single = analyze_tables(raw_path=str(raw_dir), processed_path=str(tmp_path / "a"))
+    composite = analyze_tables(raw_path=str(raw_dir), processed_path=str(tmp_path / "b"), max_key_width=3)
+
+    assert single.iloc[0]["Unique Column(s)"] == "None"
+    # Minimal keys only: supersets such as (order, line, sku) are not listed
+    assert composite.iloc[0]["Unique Column(s)"] == "(order, line), (order, sku)"
+
+    sketched = analyze_tables(
+        raw_path=str(raw_dir), processed_path=str(tmp_path / "c"), max_key_width=3, hll_precision=10
+    )
+    assert sketched.iloc[0]["Unique Column(s)"] == composite.iloc[0]["Unique Column(s)"]
+
+
+def test_composite_keys_need_in_memory_mode(tmp_path):
+    raw_dir = tmp_path / "raw"
+    raw_dir.mkdir()
+    pd.DataFrame({"a": [1, 2]}).to_csv(raw_dir / "t.csv", index=False)
+
+    with pytest.raises(ValueError):
+        analyze_tables(raw_path=str(raw_dir), processed_path=str(tmp_path / "out"), chunksize=1, max_key_width=2)
@@ -0,0 +1,51 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from Scripts.csv_scan import count_rows, scan_csv, split_ranges
+
+SAMPLES = {
+    "quoted_newlines": b'a,b\n1,"x\ny"\n2,"q""\nz"\n\n3,w',
+    "crlf_and_blank_lines": b"a,b\r\n1,2\r\n\r\n3,4\r\n",
+    "leading_blank_lines": b"\n\na,b\n1,2\n",
+    "header_only": b"a,b\n",
+}
+
+
+@pytest.mark.parametrize("name", sorted(SAMPLES))
+def test_row_count_matches_pandas(tmp_path, name):
+    path = tmp_path / f"{name}.csv"
+    path.write_bytes(SAMPLES[name])
+
+    # Tiny blocks so records and quoted fields straddle block boundaries
+    assert scan_csv(path, block_bytes=3).rows == len(pd.read_csv(path))
+    assert count_rows(path) == len(pd.read_csv(path))
+
+
+def test_empty_file(tmp_path):
+    path = tmp_path / "empty.csv"
+    path.write_bytes(b"")
+    assert count_rows(path) == 0
+    assert split_ranges(path, 4) == []
+
+
+@pytest.mark.parametrize("parts", [1, 2, 3, 7])
+def test_split_ranges_cut_on_record_boundaries(tmp_path, parts):
+    path = tmp_path / "t.csv"
+    pd.DataFrame(
+        {
+            "x": np.arange(300),
+            "s": ["a\nb" if i % 7 == 0 else 'c,"d"' for i in range(300)],
+        }
+    ).to_csv(path, index=False)
+    data = path.read_bytes()
+    header = data[: scan_csv(path).header_end]
+
+    ranges = split_ranges(path, parts, block_bytes=64)
+    assert len(ranges) == parts
+    parsed = pd.concat(
+        [pd.read_csv(io.BytesIO(header + data[lo:hi])) for lo, hi in ranges], ignore_index=True
+    )
+    pd.testing.assert_frame_equal(parsed, pd.read_csv(path))
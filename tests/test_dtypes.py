@@ -0,0 +1,93 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from Scripts.cache import ProfileCache
+from Scripts.dtypes import CACHE_REPORT, narrowest_dtypes, read_narrow
+from Scripts.profiling import ProfileSession, run_reports
+
+
+def _frame(n=200):
+    rng = np.random.default_rng(0)
+    return pd.DataFrame(
+        {
+            "small": rng.integers(-100, 100, n),
+            "medium": rng.integers(0, 40_000, n),
+            "wide": rng.integers(0, 2**40, n),
+            "quarter": rng.integers(0, 400, n) / 4,
+            "noise": rng.normal(size=n),
+            "city": rng.choice(["Oslo", "Lima", "Pune"], n),
+            "label": [f"row {i}" for i in range(n)],
+            "amount": rng.choice(["1,200", "50"], n),
+        }
+    )
+
+
+def test_narrowest_dtypes_are_exact():
+    df = _frame()
+    dtypes = narrowest_dtypes(df)
+
+    assert dtypes == {"small": "int8", "medium": "int32", "quarter": "float32", "city": "category"}
+    narrowed = df.astype(dtypes)
+    for col in df.columns:
+        assert narrowed[col].astype(df[col].dtype).equals(df[col])
+
+
+def test_verified_dtypes_are_pinned_on_later_reads(tmp_path, monkeypatch):
+    path = tmp_path / "t.csv"
+    _frame().to_csv(path, index=False)
+    cache = ProfileCache(tmp_path / "cache")
+
+    first = read_narrow(path, cache=cache)
+    assert first["small"].dtype == np.int8 and first["city"].dtype == "category"
+
+    def no_prepass(*args, **kwargs):
+        raise AssertionError("the dtypes of an unchanged file are already known")
+
+    monkeypatch.setattr("Scripts.dtypes.sample_dtypes", no_prepass)
+    again = read_narrow(path, ["medium", "quarter"], cache=cache)
+    assert again.dtypes.astype(str).tolist() == ["int32", "float32"]
+
+
+def test_failed_pinned_read_falls_back(tmp_path):
+    path = tmp_path / "t.csv"
+    pd.DataFrame({"x": [1, None, 3]}).to_csv(path, index=False)
+    cache = ProfileCache(tmp_path / "cache")
+    # Stale entry: an integer dtype cannot hold the missing value
+    cache.save_state(CACHE_REPORT, path, {"x": "int8"})
+
+    df = read_narrow(path, cache=cache)
+    assert df["x"].tolist()[0] == 1 and df["x"].isna().sum() == 1
+    assert cache.load_state(CACHE_REPORT, path) == {"x": "float32"}
+
+
+def test_verified_dtypes_apply_to_a_changed_file(tmp_path, monkeypatch):
+    path = tmp_path / "t.csv"
+    pd.DataFrame({"small": [1, 2, 3], "quarter": [0.25, 0.5, 0.75], "city": ["Oslo", "Lima", "Oslo"]}).to_csv(
+        path, index=False
+    )
+    cache = ProfileCache(tmp_path / "cache")
+    read_narrow(path, cache=cache)
+
+    # The file grew, and its integers no longer fit int8
+    pd.DataFrame(
+        {"small": [1, 2, 3, 300], "quarter": [0.25, 0.5, 0.75, 1.0], "city": ["Oslo", "Lima", "Oslo", "Lima"]}
+    ).to_csv(path, index=False)
+    monkeypatch.setattr("Scripts.dtypes.sample_dtypes", lambda *a, **kw: pytest.fail("dtypes of the table are known"))
+    df = read_narrow(path, cache=cache)
+
+    assert df["small"].tolist() == [1, 2, 3, 300]
+    assert df.dtypes.astype(str).tolist() == ["int16", "float32", "category"]
+    assert cache.load_state(CACHE_REPORT, path) == {"small": "int16", "quarter": "float32", "city": "category"}
+
+
+def test_reports_unchanged_by_narrow_dtypes(tmp_path):
+    raw_dir = tmp_path / "raw"
+    raw_dir.mkdir()
+    _frame().to_csv(raw_dir / "t.csv", index=False)
+
+    run_reports(ProfileSession(raw_dir), tmp_path / "wide")
+    run_reports(ProfileSession(raw_dir, narrow_dtypes=True), tmp_path / "narrow")
+
+    for name in ["Outliers.csv", "Outliers_STD.csv", "Summary_Statistics.csv"]:
+        assert (tmp_path / "narrow" / name).read_bytes() == (tmp_path / "wide" / name).read_bytes()
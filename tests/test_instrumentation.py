@@ -0,0 +1,69 @@
+from pathlib import Path
+
+import pandas as pd
+
+from Scripts.instrumentation import StageTimer, active_timer, recording, stage
+from Scripts.profiling import ProfileSession, run_reports
+
+
+def _write_tables(raw_dir: Path) -> None:
+    raw_dir.mkdir(parents=True, exist_ok=True)
+    pd.DataFrame(
+        {"id": [1, 2, 3, 4, 5], "value": [10, 11, 9, 10, 100], "text": list("abcde")}
+    ).to_csv(raw_dir / "table_one.csv", index=False)
+    pd.DataFrame(
+        {"id": [10, 11, 12, 13, 14], "value": [10, 10, 11, 9, 10], "text": list("vwxyz")}
+    ).to_csv(raw_dir / "table_two.csv", index=False)
+
+
+def test_stages_are_not_timed_unless_recording():
+    assert active_timer() is None
+    assert stage("read", "t") is stage("duplicates", "u", "c")
+
+    with recording() as timer:
+        with stage("outer", table="t"):
+            with stage("inner", column="c"):
+                pass
+    assert active_timer() is None
+    with stage("ignored"):
+        pass
+
+    assert [(r.stage, r.table, r.column) for r in timer.records] == [("inner", "t", "c"), ("outer", "t", None)]
+    assert all(r.seconds >= 0 for r in timer.records)
+
+
+def test_run_reports_writes_stage_timings_next_to_the_reports(tmp_path: Path):
+    raw_dir, processed_dir = tmp_path / "raw", tmp_path / "processed"
+    _write_tables(raw_dir)
+
+    plain = run_reports(ProfileSession(raw_dir), tmp_path / "plain", reports=["column_row_count", "outliers_std"])
+    timed = run_reports(
+        ProfileSession(raw_dir), processed_dir, reports=["column_row_count", "outliers_std"], timings=True
+    )
+
+    for name, df in plain.items():
+        pd.testing.assert_frame_equal(df, timed[name])
+    assert not (tmp_path / "plain" / "Stage_Timings.csv").exists()
+
+    records = pd.read_csv(processed_dir / "Stage_Timings.csv")
+    assert list(records.columns) == ["report", "table", "column", "stage", "seconds"]
+    crc = records[records["report"] == "column_row_count"]
+    assert set(crc.loc[crc["table"] == "table_one", "stage"]) == {
+        "read", "duplicates", "null_count", "unique_columns", "unique_check"
+    }
+    std = records[records["report"] == "outliers_std"]
+    assert {"read", "numeric_columns", "numeric_detection", "coerce", "id_check", "moments", "iqr_outliers"} <= set(
+        std["stage"]
+    )
+    iqr = std[std["stage"] == "iqr_outliers"]
+    assert set(zip(iqr["table"], iqr["column"])) == {("table_one", "value"), ("table_two", "value")}
+    assert len(records[records["stage"] == "report"]) == 2
+
+
+def test_timer_can_be_written_on_its_own(tmp_path: Path):
+    timer = StageTimer()
+    with recording(timer):
+        with stage("read", "t"):
+            pass
+    path = timer.write(tmp_path / "out" / "timings.csv")
+    assert pd.read_csv(path)["stage"].tolist() == ["read"]
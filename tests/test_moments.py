@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+
+from Scripts.moments import Moments
+
+
+def test_chunked_moments_match_numpy():
+    # Large offset: a naive sum of squares would lose the spread entirely
+    values = np.random.default_rng(0).normal(1e9, 3.0, 2001)
+    values[[7, 500]] = np.nan
+
+    moments = Moments()
+    for chunk in np.array_split(values, 9):
+        moments.update(chunk)
+
+    assert moments.count == 1999
+    assert np.isclose(moments.mean, np.nanmean(values), rtol=0, atol=1e-6)
+    assert np.isclose(moments.std, np.nanstd(values, ddof=1), rtol=1e-9)
+    assert (moments.minimum, moments.maximum) == (np.nanmin(values), np.nanmax(values))
+
+
+def test_merged_workers_match_single_pass():
+    values = np.arange(20, dtype=float) ** 1.5
+    merged = Moments.of(values[:3]).merge(Moments.of(values[3:11])).merge(Moments.of(values[11:]))
+    whole = Moments.of(values)
+
+    assert merged.count == whole.count
+    assert np.isclose(merged.mean, whole.mean)
+    assert np.isclose(merged.variance, whole.variance)
+
+
+def test_columns_of_a_2d_batch_match_pandas():
+    df = pd.DataFrame({"a": [1.0, 2.0, 4.0, np.nan], "b": [np.nan, np.nan, 5.0, np.nan], "c": [np.nan] * 4})
+    moments = Moments.of(df.to_numpy())
+
+    assert moments.count.tolist() == [3, 1, 0]
+    np.testing.assert_allclose(moments.mean, df.mean().to_numpy())
+    np.testing.assert_allclose(moments.std, df.std().to_numpy())
+    np.testing.assert_array_equal(moments.minimum, df.min().to_numpy())
+
+
+def test_empty_moments_are_nan():
+    assert np.isnan(Moments().mean) and np.isnan(Moments().std)
+    assert np.isnan(Moments.of([3.0]).std)
+    assert Moments().merge(Moments.of([3.0])).mean == 3.0
+
+
+def test_empty_batches_leave_the_moments_unchanged():
+    moments = Moments.of([1.0, 2.0]).update([]).update([np.nan, np.nan]).merge(Moments())
+    assert (moments.count, moments.mean) == (2, 1.5)
+
+    columns = Moments.of([[1.0, 4.0], [3.0, 6.0]]).update([[np.nan, 8.0]])
+    assert columns.count.tolist() == [2, 3]
+    np.testing.assert_allclose(columns.mean, [2.0, 6.0])
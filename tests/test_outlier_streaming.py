@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+
+from Scripts.outlier_streaming import ColumnScan, OutlierCollector, format_overflow, parse_numeric
+from Scripts.row_hashing import FingerprintSet
+from Scripts.sketches import KLLSketch
+
+
+def test_collector_keeps_all_outliers_in_file_order():
+    collector = OutlierCollector(lower=0, upper=10)
+    collector.add(np.array([50, 5, -3]), positions=np.array([0, 1, 2]))
+    collector.add(np.array([7, 12]), positions=np.array([3, 4]))
+
+    assert collector.values() == [50, -3, 12]
+    assert collector.overflow == 0
+
+
+def test_collector_cap_keeps_most_extreme_and_counts_overflow():
+    collector = OutlierCollector(lower=0, upper=10, max_outliers=2)
+    collector.add(np.array([11, 500, -1]), positions=np.array([0, 1, 2]))
+    collector.add(np.array([-90, 12]), positions=np.array([3, 4]))
+
+    assert collector.values() == [500, -90]
+    assert collector.total == 5
+    assert collector.overflow == 3
+
+
+def test_unique_collector_counts_repeated_values():
+    collector = OutlierCollector(lower=0, upper=10, max_outliers=1, unique=True)
+    collector.add(np.array([100, 100, 20, 100]))
+
+    assert collector.values() == [100]
+    assert collector.overflow == 1
+    assert format_overflow("100", collector.overflow) == "100 (+1 more)"
+
+
+def test_merged_collectors_match_a_single_pass():
+    values = np.array([50, 5, -3, 12, -40, 11, 99])
+    whole = OutlierCollector(lower=0, upper=10, max_outliers=3)
+    whole.add(values, positions=np.arange(7))
+
+    head = OutlierCollector(lower=0, upper=10, max_outliers=3)
+    head.add(values[:4], positions=np.arange(4))
+    tail = OutlierCollector(lower=0, upper=10, max_outliers=3)
+    tail.add(values[4:], positions=np.arange(3))
+    head.merge(tail, position_offset=4)
+
+    assert head.values() == whole.values() == [50, -40, 99]
+    assert head.overflow == whole.overflow == 3
+
+
+def test_merged_unique_collectors_add_up_repeats():
+    head = OutlierCollector(lower=0, upper=10, unique=True)
+    head.add(np.array([100, 20]))
+    tail = OutlierCollector(lower=0, upper=10, unique=True)
+    tail.add(np.array([100, 100]))
+    head.merge(tail)
+
+    assert head.values() == [20, 100]
+    assert head.total == 4
+
+
+def test_merged_column_scans_match_a_single_scan():
+    raw = pd.Series(["3", "1", "4", None, "5", "9", "2", "6"])
+
+    def scan(part):
+        column = ColumnScan(sketch=KLLSketch(), distinct=FingerprintSet())
+        column.update(part, parse_numeric(part))
+        return column
+
+    whole = scan(raw)
+    merged = scan(raw.iloc[:3]).merge(scan(raw.iloc[3:]))
+
+    for field in ("rows", "non_null", "numeric", "integer_tokens"):
+        assert getattr(merged, field) == getattr(whole, field)
+    assert merged.moments.count == whole.moments.count == 7
+    assert (merged.moments.minimum, merged.moments.maximum) == (1.0, 9.0)
+    assert np.isclose(merged.moments.std, whole.moments.std)
+    assert len(merged.distinct) == len(whole.distinct) == 7
+    assert merged.quartiles() == whole.quartiles()
@@ -27,3 +27,59 @@ def test_detect_outliers():
 def test_detect_outliers_empty():
     s = pd.Series([])
     assert detect_outliers(s) == []
+
+
+def test_detect_outliers_with_sketch_quartiles():
+    s = pd.Series([10, 11, 12, 13, 100])
+    assert detect_outliers(s, sketch_error=0.01) == [100]
+
+
+def _write_outlier_tables(raw_dir):
+    raw_dir.mkdir(parents=True, exist_ok=True)
+    pd.DataFrame(
+        {
+            "user_id": range(8),
+            "age": [30, 31, 29, 30, 95, 31, 30, 2],
+            "score": [1.5, 1.6, 1.4, 1.5, 1.5, 1.6, 9.9, 1.4],
+        }
+    ).to_csv(raw_dir / "a.csv", index=False)
+    pd.DataFrame({"age": [40, 41, 40, 39], "score": [2.0, 2.1, 2.2, 2.0]}).to_csv(raw_dir / "b.csv", index=False)
+
+
+def test_streaming_main_matches_in_memory(tmp_path):
+    from Scripts.outliers import main
+
+    raw_dir = tmp_path / "raw"
+    _write_outlier_tables(raw_dir)
+
+    main(raw_path=str(raw_dir), processed_path=str(tmp_path / "mem"))
+    main(raw_path=str(raw_dir), processed_path=str(tmp_path / "stream"), chunksize=3)
+
+    expected = (tmp_path / "mem" / "Outliers.csv").read_bytes()
+    assert (tmp_path / "stream" / "Outliers.csv").read_bytes() == expected
+    assert b"[95, 2]" in expected
+
+
+def test_streaming_byte_range_workers_match_sequential(tmp_path):
+    from Scripts.outliers import main
+
+    raw_dir = tmp_path / "raw"
+    _write_outlier_tables(raw_dir)
+
+    main(raw_path=str(raw_dir), processed_path=str(tmp_path / "seq"), chunksize=2)
+    main(raw_path=str(raw_dir), processed_path=str(tmp_path / "par"), chunksize=2, workers=3)
+
+    assert (tmp_path / "par" / "Outliers.csv").read_bytes() == (tmp_path / "seq" / "Outliers.csv").read_bytes()
+
+
+def test_max_outliers_caps_list(tmp_path):
+    from Scripts.outliers import main
+
+    raw_dir = tmp_path / "raw"
+    _write_outlier_tables(raw_dir)
+
+    result = main(raw_path=str(raw_dir), processed_path=str(tmp_path / "out"), max_outliers=1)
+
+    row = result[(result["Table Name"] == "a.csv") & (result["Numeric Column"] == "age")].iloc[0]
+    assert row["Outliers"] == [95]
+    assert row["Outliers Not Listed"] == 1
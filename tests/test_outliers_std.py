@@ -82,3 +82,124 @@ def test_outliers_std_basic(tmp_path: Path):
     # Date updated populated
     assert isinstance(row_t1_value["Date updated"], str) and len(row_t1_value["Date updated"]) > 0
     assert isinstance(row_t2_value["Date updated"], str) and len(row_t2_value["Date updated"]) > 0
+
+
+def test_outliers_std_parallel_matches_sequential(tmp_path: Path):
+    raw_dir = tmp_path / "raw"
+    raw_dir.mkdir()
+    pd.DataFrame({"value": [10, 11, 9, 10, 100], "only_here": [1, 2, 3, 4, 5]}).to_csv(
+        raw_dir / "table_one.csv", index=False
+    )
+    pd.DataFrame({"value": [10, 10, 11, 9, 10], "other": [2.0, 2.5, 3.5, 4.5, 5.5]}).to_csv(
+        raw_dir / "table_two.csv", index=False
+    )
+
+    sequential = analyze_tables(raw_dir=raw_dir, processed_dir=tmp_path / "seq")
+    parallel = analyze_tables(raw_dir=raw_dir, processed_dir=tmp_path / "par", workers=2)
+
+    pd.testing.assert_frame_equal(parallel, sequential)
+    assert set(parallel["Numeric Column"]) == {"value"}
+
+
+def test_outliers_std_column_workers_match_sequential(tmp_path: Path):
+    raw_dir = tmp_path / "raw"
+    raw_dir.mkdir()
+    pd.DataFrame({f"m{i:02d}": [1, 2, 2, 3, 50 + i] for i in range(9)}).to_csv(raw_dir / "wide.csv", index=False)
+
+    sequential = analyze_tables(raw_dir=raw_dir, processed_dir=tmp_path / "seq")
+    sharded = analyze_tables(raw_dir=raw_dir, processed_dir=tmp_path / "col", column_workers=4)
+
+    pd.testing.assert_frame_equal(sharded, sequential)
+    assert sharded["Numeric Column"].tolist() == [f"m{i:02d}" for i in range(9)]
+
+
+def _write_std_tables(raw_dir: Path) -> None:
+    raw_dir.mkdir(parents=True, exist_ok=True)
+    pd.DataFrame(
+        {
+            "id": range(1, 13),
+            "value": [10, 11, 9, 10, 100, 12, 10, 11, -80, 10, 9, 250],
+            "other": [1.5, 2.0, 3.0, 4.0, 5.0, 2.5, 3.5, 4.5, 1.0, 2.0, 3.0, 4.0],
+            "text": list("abcdefghijkl"),
+        }
+    ).to_csv(raw_dir / "table_one.csv", index=False)
+    pd.DataFrame(
+        {"id": range(20, 26), "value": [10, 10, 11, 9, 10, 10], "other": [2.0, 2.5, None, 4.5, 5.5, 3.0]}
+    ).to_csv(raw_dir / "table_two.csv", index=False)
+
+
+def test_outliers_std_streaming_matches_in_memory(tmp_path: Path):
+    raw_dir = tmp_path / "raw"
+    _write_std_tables(raw_dir)
+
+    analyze_tables(raw_dir=raw_dir, processed_dir=tmp_path / "mem")
+    analyze_tables(raw_dir=raw_dir, processed_dir=tmp_path / "stream", chunksize=5)
+
+    assert (tmp_path / "stream" / "Outliers_STD.csv").read_bytes() == (tmp_path / "mem" / "Outliers_STD.csv").read_bytes()
+
+
+def test_outliers_std_streaming_byte_range_workers(tmp_path: Path):
+    raw_dir = tmp_path / "raw"
+    _write_std_tables(raw_dir)
+
+    sequential = analyze_tables(raw_dir=raw_dir, processed_dir=tmp_path / "seq", chunksize=2, max_outliers=1)
+    ranged = analyze_tables(raw_dir=raw_dir, processed_dir=tmp_path / "par", chunksize=2, max_outliers=1, workers=3)
+
+    pd.testing.assert_frame_equal(ranged.drop(columns="Date updated"), sequential.drop(columns="Date updated"))
+
+
+def test_outliers_std_max_outliers_reports_overflow(tmp_path: Path):
+    raw_dir = tmp_path / "raw"
+    _write_std_tables(raw_dir)
+
+    in_memory = analyze_tables(raw_dir=raw_dir, processed_dir=tmp_path / "mem", max_outliers=1)
+    streaming = analyze_tables(raw_dir=raw_dir, processed_dir=tmp_path / "stream", max_outliers=1, chunksize=4)
+
+    for result in (in_memory, streaming):
+        row = result[(result["Table Name"] == "table_one") & (result["Numeric Column"] == "value")].iloc[0]
+        assert row["list of outliers"] == "250 (+2 more)"
+
+
+def test_numeric_detection_rejects_text_early(monkeypatch):
+    from Scripts import outliers_STD
+
+    n = 3000
+    df = pd.DataFrame(
+        {
+            "text": [f"word {i}" for i in range(n)],
+            "amount": ["1,234", "56", None] * (n // 3),
+            "mostly": ["x"] * 100 + ["7"] * (n - 100),
+            "count": range(n),
+        }
+    )
+    parsed = []
+    real = outliers_STD._coerce_numeric_series
+    monkeypatch.setattr(outliers_STD, "_coerce_numeric_series", lambda s: parsed.append(len(s)) or real(s))
+
+    assert outliers_STD._numeric_columns_in_df(df) == {"amount", "mostly", "count"}
+    # "text" is rejected after its first block; "amount" and "mostly" are parsed in full
+    assert sorted(parsed) == [1000, 1000, 1000, 2000, 2000]
+    assert real(df["amount"]).head(3).tolist()[:2] == [1234.0, 56.0]
+
+
+def test_numeric_detection_matches_a_full_parse():
+    from Scripts import outliers_STD
+
+    # 94% numeric overall, although its first 1000 values are 60% text
+    df = pd.DataFrame({"late_numbers": ["x"] * 600 + ["1"] * 400 + ["2"] * 9000})
+    assert outliers_STD._numeric_columns_in_df(df) == {"late_numbers"}
+    assert outliers_STD._numeric_columns_in_df(df, min_numeric_ratio=0.95) == set()
+
+
+def test_outliers_std_streaming_skips_all_null_chunks_and_ranges(tmp_path: Path):
+    raw_dir = tmp_path / "raw"
+    raw_dir.mkdir()
+    # The nulls fill whole chunks of two rows, and the second byte range
+    pd.DataFrame({"amount": [1, 2, None, None, 3, 100] + [None] * 30, "note": ["x" * 20] * 36}).to_csv(
+        raw_dir / "sparse.csv", index=False
+    )
+
+    in_memory = analyze_tables(raw_dir=raw_dir, processed_dir=tmp_path / "mem")
+    for workers in (None, 2):
+        streaming = analyze_tables(raw_dir=raw_dir, processed_dir=tmp_path / "stream", chunksize=2, workers=workers)
+        pd.testing.assert_frame_equal(streaming.drop(columns="Date updated"), in_memory.drop(columns="Date updated"))
@@ -0,0 +1,37 @@
+import pandas as pd
+import pytest
+
+from Scripts.parallel import map_column_shards, map_ordered, resolve_workers
+
+
+def _column_sums(df, columns):
+    return [(col, int(df[col].sum())) for col in columns]
+
+
+def _square(x):
+    return x * x
+
+
+def test_resolve_workers():
+    assert resolve_workers(None) == 1
+    assert resolve_workers(3) == 3
+    assert resolve_workers(0) >= 1
+
+
+def test_map_ordered_keeps_input_order():
+    assert map_ordered(_square, [3, 1, 2], workers=2) == [9, 1, 4]
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_map_column_shards_keeps_column_order(executor):
+    df = pd.DataFrame({f"c{i}": [i, i] for i in range(10)})
+    columns = [f"c{i}" for i in range(10)]
+
+    result = map_column_shards(_column_sums, df, columns, workers=3, executor=executor)
+
+    assert result == [(f"c{i}", 2 * i) for i in range(10)]
+
+
+def test_map_column_shards_rejects_unknown_executor():
+    with pytest.raises(ValueError):
+        map_column_shards(_column_sums, pd.DataFrame(), [], executor="gpu")
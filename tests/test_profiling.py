@@ -0,0 +1,69 @@
+from pathlib import Path
+
+import pandas as pd
+
+import Scripts.profiling as profiling
+from Scripts.profiling import ProfileSession, run_reports
+
+
+def _write_tables(raw_dir: Path) -> None:
+    raw_dir.mkdir(parents=True, exist_ok=True)
+    pd.DataFrame(
+        {"id": [1, 2, 3, 4, 5], "value": [10, 11, 9, 10, 100], "text": list("abcde")}
+    ).to_csv(raw_dir / "table_one.csv", index=False)
+    pd.DataFrame(
+        {"id": [10, 11, 12, 13, 14], "value": [10, 10, 11, 9, 10], "text": list("vwxyz")}
+    ).to_csv(raw_dir / "table_two.csv", index=False)
+
+
+def test_session_lists_sorted_csv_files(tmp_path: Path):
+    raw_dir = tmp_path / "raw"
+    _write_tables(raw_dir)
+    (raw_dir / "notes.txt").write_text("not a table")
+
+    session = ProfileSession(raw_dir)
+    assert [p.name for p in session.csv_files()] == ["table_one.csv", "table_two.csv"]
+
+
+def test_run_reports_parses_each_file_once(tmp_path: Path, monkeypatch):
+    raw_dir = tmp_path / "data" / "raw"
+    processed_dir = tmp_path / "data" / "processed"
+    _write_tables(raw_dir)
+
+    reads = []
+    real_read_csv = pd.read_csv
+
+    def counting_read_csv(path, *args, **kwargs):
+        reads.append(Path(path).name)
+        return real_read_csv(path, *args, **kwargs)
+
+    monkeypatch.setattr(profiling.pd, "read_csv", counting_read_csv)
+
+    session = ProfileSession(raw_dir)
+    results = run_reports(session, processed_dir)
+
+    assert sorted(reads) == ["table_one.csv", "table_two.csv"]
+    # The last report released every frame once it had read it
+    assert session._frames == {} and session._projections == {}
+    assert session.keep_frames
+    assert set(results) == {"column_row_count", "outliers", "outliers_std", "summary_statistics"}
+    assert (processed_dir / "Column-RowCount-duplicate.csv").exists()
+    assert (processed_dir / "Outliers.csv").exists()
+    assert (processed_dir / "Outliers_STD.csv").exists()
+    assert (processed_dir / "Summary_Statistics.csv").exists()
+
+
+def test_session_without_keep_frames_holds_no_table(tmp_path: Path, monkeypatch):
+    raw_dir = tmp_path / "raw"
+    _write_tables(raw_dir)
+    reads = []
+    real_read_csv = pd.read_csv
+    monkeypatch.setattr(profiling.pd, "read_csv", lambda path, *a, **kw: reads.append(path) or real_read_csv(path, *a, **kw))
+
+    session = ProfileSession(raw_dir, keep_frames=False)
+    for _ in range(2):
+        session.read(raw_dir / "table_one.csv")
+        session.read(raw_dir / "table_two.csv", ["value"])
+
+    assert len(reads) == 4
+    assert session._frames == {} and session._projections == {}
@@ -0,0 +1,135 @@
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from Scripts.column_row_count import analyze_tables
+from Scripts.profiling import ProfileSession
+from Scripts.readers import iter_chunks, numeric_columns, read_table, table_columns, table_metadata
+from Scripts.summary_statistics import calculate_summary_statistics
+
+
+def _frame():
+    return pd.DataFrame(
+        {
+            "id": [1, 2, 3, 3],
+            "amount": [10.5, np.nan, 7.0, 7.0],
+            "label": ["a", "b", None, None],
+        }
+    )
+
+
+def test_csv_reader_projection_and_chunks(tmp_path):
+    path = tmp_path / "t.csv"
+    _frame().to_csv(path, index=False)
+
+    assert table_columns(path) == ["id", "amount", "label"]
+    assert read_table(path, ["amount"]).columns.tolist() == ["amount"]
+    # CSV carries no schema and no statistics; rows are counted by a scan
+    assert numeric_columns(path) is None
+    assert table_metadata(path).row_count == 4
+    assert table_metadata(path).null_count is None
+
+    chunks = list(iter_chunks(path, 3))
+    assert [len(c) for c in chunks] == [3, 1]
+    assert chunks[0]["id"].tolist() == ["1", "2", "3"]
+
+
+def test_unsupported_format_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        read_table(tmp_path / "t.xlsx")
+
+
+def test_missing_pyarrow_raises_clear_import_error(tmp_path, monkeypatch):
+    monkeypatch.setitem(sys.modules, "pyarrow", None)
+    with pytest.raises(ImportError, match="pyarrow"):
+        read_table(tmp_path / "t.parquet")
+
+
+def test_session_lists_all_supported_tables(tmp_path):
+    for name in ["b.csv", "a.parquet", "c.arrow", "notes.txt"]:
+        (tmp_path / name).write_text("x\n1\n")
+
+    session = ProfileSession(tmp_path)
+    assert [p.name for p in session.table_files()] == ["a.parquet", "b.csv", "c.arrow"]
+    assert [p.name for p in session.csv_files()] == ["b.csv"]
+
+
+@pytest.mark.parametrize("suffix", [".parquet", ".arrow"])
+def test_columnar_metadata_projection_and_chunks(tmp_path, suffix):
+    pytest.importorskip("pyarrow")
+    path = tmp_path / f"t{suffix}"
+    df = _frame()
+    if suffix == ".parquet":
+        df.to_parquet(path, index=False)
+    else:
+        df.to_feather(path)
+
+    meta = table_metadata(path)
+    assert (meta.column_count, meta.row_count, meta.null_count) == (3, 4, 3)
+    assert numeric_columns(path) == ["id", "amount"]
+    assert numeric_columns(path, include_text=True) == ["id", "amount", "label"]
+    assert read_table(path, ["amount"]).columns.tolist() == ["amount"]
+
+    chunks = list(iter_chunks(path, 3))
+    assert [len(c) for c in chunks] == [3, 1]
+    assert chunks[0]["id"].tolist() == ["1", "2", "3"]
+    assert pd.isna(chunks[0]["amount"].iloc[1])
+
+
+def test_reports_treat_parquet_like_csv(tmp_path):
+    pytest.importorskip("pyarrow")
+    csv_dir = tmp_path / "csv"
+    parquet_dir = tmp_path / "parquet"
+    csv_dir.mkdir()
+    parquet_dir.mkdir()
+    _frame().to_csv(csv_dir / "t.csv", index=False)
+    pd.read_csv(csv_dir / "t.csv").to_parquet(parquet_dir / "t.parquet", index=False)
+
+    counts_csv = analyze_tables(raw_path=str(csv_dir), processed_path=str(tmp_path / "out1"))
+    counts_parquet = analyze_tables(raw_path=str(parquet_dir), processed_path=str(tmp_path / "out2"))
+    pd.testing.assert_frame_equal(
+        counts_parquet.drop(columns="Date updated"), counts_csv.drop(columns="Date updated")
+    )
+
+    summary_csv = calculate_summary_statistics(str(csv_dir))
+    summary_parquet = calculate_summary_statistics(str(parquet_dir))
+    pd.testing.assert_frame_equal(
+        summary_parquet.drop(columns="Date Updated"), summary_csv.drop(columns="Date Updated")
+    )
+
+
+def test_null_count_of_decoded_parquet_includes_nan(tmp_path):
+    pa = pytest.importorskip("pyarrow")
+    import pyarrow.parquet as pq
+
+    raw_dir = tmp_path / "raw"
+    raw_dir.mkdir()
+    # The footer statistics count the null but not the NaN
+    pq.write_table(pa.table({"x": pa.array([1.0, float("nan"), None, 2.0])}), raw_dir / "t.parquet")
+    assert table_metadata(raw_dir / "t.parquet").null_count == 1
+
+    result = analyze_tables(raw_path=str(raw_dir), processed_path=str(tmp_path / "out"))
+    assert result.loc[0, "Null count"] == 2
+
+
+def test_inventory_mode_reads_only_headers_and_footers(tmp_path, monkeypatch):
+    pytest.importorskip("pyarrow")
+    raw_dir = tmp_path / "raw"
+    raw_dir.mkdir()
+    _frame().to_csv(raw_dir / "a.csv", index=False)
+    _frame().to_parquet(raw_dir / "b.parquet", index=False)
+
+    def no_decoding(*args, **kwargs):
+        raise AssertionError("inventory mode must not decode table values")
+
+    monkeypatch.setattr("Scripts.column_row_count.read_table", no_decoding)
+    result = analyze_tables(raw_path=str(raw_dir), processed_path=str(tmp_path / "out"), inventory_only=True)
+
+    csv_row, parquet_row = result.iloc[0], result.iloc[1]
+    assert csv_row["Column Count"] == parquet_row["Column Count"] == 3
+    assert csv_row["Row count"] == parquet_row["Row count"] == 4
+    assert pd.isna(csv_row["Null count"])
+    assert parquet_row["Null count"] == 3
+    assert result["Duplicate rows count"].isna().all()
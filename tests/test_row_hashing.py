@@ -0,0 +1,99 @@
+import numpy as np
+import pandas as pd
+
+from Scripts.row_hashing import FingerprintSet, duplicate_mask, has_duplicate_values, row_fingerprints
+
+
+def test_fingerprint_set_marks_duplicates_across_batches():
+    seen = FingerprintSet()
+
+    first = seen.add(np.array([5, 3, 5], dtype=np.uint64))
+    second = seen.add(np.array([7, 3, 7, 1], dtype=np.uint64))
+
+    assert first.tolist() == [False, False, True]
+    assert second.tolist() == [False, True, True, False]
+    assert len(seen) == 4
+
+
+def test_fingerprint_set_keeps_few_runs_over_many_batches():
+    rng = np.random.default_rng(0)
+    batches = [rng.integers(0, 5_000, size=100, dtype=np.uint64) for _ in range(200)]
+    seen, merged = FingerprintSet(), FingerprintSet()
+    other = FingerprintSet()
+
+    masks = [seen.add(batch) for batch in batches]
+    for batch in batches[:100]:
+        merged.add(batch)
+    for batch in batches[100:]:
+        other.add(batch)
+    merged.merge(other)
+
+    everything = np.concatenate(batches)
+    expected = pd.Series(everything).duplicated().to_numpy()
+    assert np.concatenate(masks).tolist() == expected.tolist()
+    assert len(seen) == len(merged) == len(np.unique(everything))
+    assert len(seen._runs) <= 2 * np.log2(len(batches))
+
+
+def test_row_fingerprints_ignore_index():
+    df = pd.DataFrame({"a": [1, 1], "b": ["x", "x"]}, index=[10, 20])
+    fp = row_fingerprints(df)
+    assert fp.dtype == np.uint64
+    assert fp[0] == fp[1]
+
+
+def test_duplicate_mask_matches_pandas():
+    df = pd.DataFrame(
+        {
+            "a": [1, 2, 1, np.nan, np.nan, 2],
+            "b": ["x", "y", "x", None, None, "z"],
+        }
+    )
+    expected = df.duplicated(keep="first").to_numpy()
+
+    for bits in (64, 128):
+        for verify in (False, True):
+            mask = duplicate_mask(df, bits=bits, verify=verify, batch_rows=2)
+            assert mask.tolist() == expected.tolist()
+
+
+def test_duplicate_mask_treats_signed_zeros_as_equal(tmp_path):
+    path = tmp_path / "zeros.csv"
+    path.write_text("a,b\n0.0,x\n-0.0,x\n")
+    df = pd.read_csv(path)
+
+    assert df.duplicated().sum() == 1
+    for bits in (64, 128):
+        assert duplicate_mask(df, bits=bits).tolist() == [False, True]
+    # The caller's frame keeps its values
+    assert np.signbit(df["a"].iloc[1])
+
+
+def test_duplicate_mask_verification_recovers_from_collisions(monkeypatch):
+    df = pd.DataFrame({"a": [1, 2, 1, 3, 2]})
+    # Force every row onto the same fingerprint
+    monkeypatch.setattr(
+        "Scripts.row_hashing.row_fingerprints",
+        lambda frame, bits=64: np.zeros(len(frame), dtype=np.uint64),
+    )
+
+    assert duplicate_mask(df).tolist() == [False, True, True, True, True]
+    assert duplicate_mask(df, verify=True).tolist() == df.duplicated().tolist()
+
+
+def test_128_bit_fingerprint_set():
+    df = pd.DataFrame({"a": [1, 2, 1]})
+    fp = row_fingerprints(df, bits=128)
+    assert fp.dtype.itemsize == 16
+
+    seen = FingerprintSet(bits=128)
+    assert seen.add(fp).tolist() == [False, False, True]
+    assert seen.add(fp[:1]).tolist() == [True]
+    assert len(seen) == 2
+
+
+def test_has_duplicate_values_across_blocks():
+    assert not has_duplicate_values(pd.Series(range(100)), first_block=3)
+    assert has_duplicate_values(pd.Series(list(range(50)) + [7]), first_block=3)
+    assert has_duplicate_values(pd.Series([1.0, np.nan, np.nan]), first_block=1)
+    assert not has_duplicate_values(pd.Series([], dtype=float))
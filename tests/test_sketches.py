@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from Scripts.sketches import HyperLogLog, KLLSketch, approx_quantiles, distinct_count, k_for_error
+
+
+def test_small_input_is_exact():
+    values = [10, 11, 12, 13, 100, np.nan]
+    sketch = KLLSketch().update(values)
+
+    assert sketch.is_exact
+    assert sketch.n == 5
+    np.testing.assert_allclose(sketch.quantiles([0.25, 0.5, 0.75]), np.nanquantile(values, [0.25, 0.5, 0.75]))
+
+
+def test_rank_error_is_bounded_and_memory_stays_small():
+    rng = np.random.default_rng(42)
+    values = rng.lognormal(size=200_000)
+    error = 0.01
+
+    sketch = KLLSketch.for_error(error)
+    for chunk in np.array_split(values, 20):
+        sketch.update(chunk)
+
+    ordered = np.sort(values)
+    for q, estimate in zip([0.25, 0.5, 0.75], sketch.quantiles([0.25, 0.5, 0.75])):
+        rank = np.searchsorted(ordered, estimate) / len(values)
+        assert abs(rank - q) <= error
+    assert sum(level.size for level in sketch._levels) < 20 * sketch.k
+
+
+def test_merged_sketches_cover_all_values():
+    rng = np.random.default_rng(7)
+    parts = [rng.normal(size=50_000) for _ in range(4)]
+
+    merged = KLLSketch.for_error(0.01)
+    for part in parts:
+        merged.merge(KLLSketch.for_error(0.01).update(part))
+
+    assert merged.n == 200_000
+    assert abs(merged.quantile(0.5)) < 0.05
+
+
+def test_empty_sketch_and_invalid_error():
+    assert np.isnan(approx_quantiles([], [0.5], 0.01)[0])
+    with pytest.raises(ValueError):
+        k_for_error(0)
+
+
+def test_hyperloglog_estimate_within_error():
+    values = pd.Series(np.arange(200_000))
+    sketch = HyperLogLog.of(values, precision=12)
+
+    assert abs(sketch.estimate() - 200_000) / 200_000 < 4 * sketch.relative_error
+
+
+def test_hyperloglog_merge_matches_single_pass():
+    values = pd.Series(np.arange(30_000) % 12_000)
+    whole = HyperLogLog.of(values, precision=10)
+    merged = HyperLogLog.of(values[:10_000], precision=10).merge(HyperLogLog.of(values[10_000:], precision=10))
+
+    assert merged.estimate() == whole.estimate()
+    with pytest.raises(ValueError):
+        merged.merge(HyperLogLog(11))
+
+
+def test_hyperloglog_ignores_nulls_and_validates_precision():
+    assert round(HyperLogLog.of(pd.Series([1.0, np.nan, 1.0, 2.0])).estimate()) == 2
+    with pytest.raises(ValueError):
+        HyperLogLog(3)
+
+
+def test_distinct_count_falls_back_to_exact_near_threshold():
+    values = pd.Series(np.arange(1_000))
+    sketch = HyperLogLog.of(values, precision=6)
+
+    # Far from the threshold the estimate is used, close to it the exact count
+    assert distinct_count(values, 10, sketch) == sketch.estimate()
+    assert distinct_count(values, 1_000, sketch) == 1_000
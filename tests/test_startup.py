@@ -0,0 +1,66 @@
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+REPORTS = ["column_row_count", "outliers", "outliers_STD", "summary_statistics"]
+# What importing all four reports may add to a cold import of pandas alone
+# (measured: about 0.1s, the report modules themselves)
+IMPORT_MARGIN_SECONDS = 0.25
+
+
+def _python(code: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, "-c", code], cwd=REPO_ROOT, capture_output=True, text=True, timeout=60, check=True
+    )
+
+
+def test_importing_reports_has_no_side_effects():
+    imports = "; ".join(f"import Scripts.{name}" for name in REPORTS)
+    result = _python(f"{imports}; import sys; print('pytest' in sys.modules)")
+
+    # No banner, no screen clearing, and no test runner pulled in
+    assert result.stdout == "False\n"
+
+
+def test_package_import_is_lazy():
+    result = _python("import sys, Scripts; print('pandas' in sys.modules); Scripts.ProfileSession; print('pandas' in sys.modules)")
+    assert result.stdout.split() == ["False", "True"]
+
+
+def _best_time(code: str, runs: int = 3) -> float:
+    times = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        _python(code)
+        times.append(time.perf_counter() - started)
+    return min(times)
+
+
+def test_cold_import_within_budget():
+    imports = "; ".join(f"import Scripts.{name}" for name in REPORTS)
+    _python("import pandas")  # warm the OS file cache, not the interpreter
+    baseline = _best_time("import pandas")
+    assert _best_time(imports) < baseline + IMPORT_MARGIN_SECONDS
+
+
+def test_cli_help_skips_heavy_imports():
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "Scripts", "--help"],
+        cwd=REPO_ROOT, capture_output=True, text=True, timeout=60, check=True,
+    )
+    assert "usage:" in result.stdout
+    assert "pandas" not in result.stderr
+
+
+@pytest.mark.parametrize("interactive", [False, True])
+def test_banner_only_in_interactive_terminals(monkeypatch, capsys, interactive):
+    from Scripts import console
+
+    monkeypatch.setattr(console, "is_interactive", lambda stream=None: interactive)
+    console.start()
+    out = capsys.readouterr().out
+    assert (console.BANNER in out) is interactive
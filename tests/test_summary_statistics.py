@@ -66,3 +66,80 @@ def test_std_and_variation_coefficient_rounding(tmp_path):
 
 
 
+def test_parallel_mode_matches_sequential(tmp_path):
+    raw_dir = tmp_path / "raw"
+    raw_dir.mkdir()
+    for name in ["b_table", "a_table", "c_table"]:
+        pd.DataFrame({"id": [1, 2, 3, 4], "value": [20, 20, 30, 30]}).to_csv(raw_dir / f"{name}.csv", index=False)
+
+    sequential = calculate_summary_statistics(str(raw_dir))
+    parallel = calculate_summary_statistics(str(raw_dir), workers=2)
+
+    pd.testing.assert_frame_equal(parallel, sequential)
+    assert parallel["Table Name"].tolist() == ["a_table", "b_table", "c_table"]
+
+
+def test_column_workers_match_sequential(tmp_path):
+    raw_dir = tmp_path / "raw"
+    raw_dir.mkdir()
+    wide = pd.DataFrame({f"col_{i:02d}": [i, i, i + 1, i + 3] for i in range(12)})
+    wide.to_csv(raw_dir / "wide.csv", index=False)
+
+    sequential = calculate_summary_statistics(str(raw_dir))
+    threaded = calculate_summary_statistics(str(raw_dir), column_workers=3)
+    processes = calculate_summary_statistics(str(raw_dir), column_workers=3, column_executor="process")
+
+    pd.testing.assert_frame_equal(threaded, sequential)
+    pd.testing.assert_frame_equal(processes, sequential)
+    assert threaded["Numeric Column(s)"].tolist() == list(wide.columns)
+
+
+def test_vectorized_statistics_match_per_column_pandas(tmp_path):
+    raw_dir = tmp_path / "raw"
+    raw_dir.mkdir()
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        "count": rng.integers(0, 5, 50),
+        "amount": np.where(rng.random(50) < 0.2, np.nan, rng.normal(100, 15, 50)),
+        "ratio": rng.random(50).round(3),
+        "single": [7.0] + [np.nan] * 49,
+        "empty": [np.nan] * 50,
+    })
+    df.to_csv(raw_dir / "mixed.csv", index=False)
+
+    result_df = calculate_summary_statistics(str(raw_dir)).set_index("Numeric Column(s)")
+
+    parsed = pd.read_csv(raw_dir / "mixed.csv")
+    for col in df.columns:
+        col_data = parsed[col].dropna()
+        row = result_df.loc[col]
+        for stat, expected in [
+            ("Minimum", col_data.min()),
+            ("Maximum", col_data.max()),
+            ("Median", col_data.median()),
+            ("Average", round(col_data.mean(), 1)),
+            ("Standard Deviation", round(col_data.std(), 1)),
+        ]:
+            if pd.isna(expected):
+                assert pd.isna(row[stat]), (col, stat)
+            else:
+                assert row[stat] == expected, (col, stat)
+
+
+def test_hll_precision_adds_distinct_estimates(tmp_path):
+    raw_dir = tmp_path / "raw"
+    raw_dir.mkdir()
+    pd.DataFrame({
+        "serial": range(200),
+        "bucket": [i % 7 for i in range(200)],
+        "amount": [float(i % 50) for i in range(200)],
+    }).to_csv(raw_dir / "t.csv", index=False)
+
+    exact = calculate_summary_statistics(str(raw_dir))
+    sketched = calculate_summary_statistics(str(raw_dir), hll_precision=12)
+
+    assert "Distinct Count (est.)" not in exact.columns
+    pd.testing.assert_frame_equal(sketched.drop(columns="Distinct Count (est.)"), exact)
+    # "serial" is unique, hence treated as an ID either way
+    assert sketched["Numeric Column(s)"].tolist() == ["bucket", "amount"]
+    assert sketched["Distinct Count (est.)"].tolist() == [7, 50]